@@ -0,0 +1,80 @@
+"""
+Tokens saved per page by the boilerplate filter of the website scraper
+(src/tools/base/content_extractor.py), measured on the saved fixture pages.
+
+"Sent" columns are what an analysis prompt actually receives: the markdown truncated
+to `--max-length` characters, as `review_company_website` & the blog analysis do.
+
+    python -m benchmarks.content_benchmark
+    python -m benchmarks.content_benchmark --max-length 25000 --fixtures my_pages/
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_budget import count_tokens
+from src.tools.base.markdown_scraper_tool import SCRAPER_CONFIG, convert_html_to_markdown, truncate_markdown
+from benchmarks.parser_benchmark import FIXTURES_DIR, load_fixtures
+
+
+def convert(html, strip_boilerplate):
+    original = SCRAPER_CONFIG["strip_boilerplate"]
+    SCRAPER_CONFIG["strip_boilerplate"] = strip_boilerplate
+    try:
+        start = time.perf_counter()
+        markdown = convert_html_to_markdown(html, max_chars=0)
+        return markdown, time.perf_counter() - start
+    finally:
+        SCRAPER_CONFIG["strip_boilerplate"] = original
+
+
+def run_benchmark(fixtures, max_length=30000, model="gpt-3.5-turbo"):
+    results = []
+    for name, html in fixtures.items():
+        raw, raw_time = convert(html, strip_boilerplate=False)
+        stripped, stripped_time = convert(html, strip_boilerplate=True)
+        sent_raw = count_tokens(truncate_markdown(raw, max_length), model)
+        sent_stripped = count_tokens(truncate_markdown(stripped, max_length), model)
+        results.append({
+            "fixture": name,
+            "page_tokens": count_tokens(raw, model),
+            "page_tokens_stripped": count_tokens(stripped, model),
+            "sent_tokens": sent_raw,
+            "sent_tokens_stripped": sent_stripped,
+            "tokens_saved": sent_raw - sent_stripped,
+            "extra_ms": round((stripped_time - raw_time) * 1000, 1),
+        })
+    return results
+
+
+def format_report(results, max_length):
+    lines = [f"{'fixture':<20}{'page tok':>10}{'stripped':>10}{f'sent <= {max_length}':>16}{'stripped':>10}{'saved':>8}{'extra ms':>10}"]
+    for r in results:
+        lines.append(
+            f"{r['fixture']:<20}{r['page_tokens']:>10}{r['page_tokens_stripped']:>10}{r['sent_tokens']:>16}"
+            f"{r['sent_tokens_stripped']:>10}{r['tokens_saved']:>8}{r['extra_ms']:>10}"
+        )
+    if results:
+        saved = sum(r["tokens_saved"] for r in results)
+        sent = sum(r["sent_tokens"] for r in results)
+        lines.append(
+            f"Tokens saved per page: {saved / len(results):.0f} on average "
+            f"({saved / sent * 100 if sent else 0:.1f}% of the tokens sent)"
+        )
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tokens saved per page by the scraper's boilerplate filter")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Folder of saved .html pages (default: benchmarks/fixtures)")
+    parser.add_argument("--max-length", type=int, default=30000, help="Characters of markdown sent to the LLM (default: 30000)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmark(load_fixtures(args.fixtures), args.max_length)
+    print(format_report(results, args.max_length))
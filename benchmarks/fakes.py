@@ -0,0 +1,448 @@
+"""
+Deterministic local stand-ins for every external service used by the outreach graph
+(OpenAI/Gemini, Serper, RapidAPI LinkedIn, websites, Google Docs/Drive, Gmail, YouTube,
+case study embeddings and the CRM lead loaders).
+
+Each fake sleeps for a configurable latency and can inject failures. Responses only
+depend on the call arguments and the seed, so two runs with the same settings do
+the same work whatever the scheduling order.
+"""
+import re
+import sys
+import time
+import zlib
+import random
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from src.instrumentation import traced, record, record_llm_usage
+from src.token_budget import count_tokens
+from src.tools.leads_loader.lead_loader_base import LeadLoaderBase
+
+# Mean latency (seconds) of every fake service, scaled by `latency_scale`
+DEFAULT_LATENCIES = {
+    "llm": 1.5,
+    "google_search": 0.4,
+    "news": 0.5,
+    "linkedin": 0.8,
+    "website": 0.6,
+    "google_api": 0.3,
+    "youtube": 0.4,
+    "embeddings": 0.3,
+}
+
+# Attempts per LLM call before an injected failure surfaces (mirrors LLM_POOL_CONFIG["max_retries"])
+LLM_MAX_RETRIES = 2
+
+INDUSTRIES = ["Healthcare", "Retail", "Manufacturing", "Defense", "AI", "Industrial automation", "Computer Vision", "Telco"]
+
+
+class InjectedFailure(Exception):
+    """Failure raised by a fake service."""
+
+
+class FakeServices:
+    """
+    Fake implementations of the external calls, see `install()` to swap them in.
+
+    @param latency_scale: Multiplier applied to `latencies` (0 = no waiting).
+    @param failure_rate: Probability (0-1) that a single call fails.
+    @param jitter: Relative random variation of the latencies (0.25 = +/-25%).
+    @param seed: Seed of the deterministic responses, latencies and failures.
+    @param response_words: Length of the generated LLM answers.
+    """
+
+    def __init__(self, latency_scale=1.0, failure_rate=0.0, jitter=0.25, seed=0, latencies=None, response_words=250):
+        self.latency_scale = latency_scale
+        self.failure_rate = failure_rate
+        self.jitter = jitter
+        self.seed = seed
+        self.latencies = {**DEFAULT_LATENCIES, **(latencies or {})}
+        self.response_words = response_words
+        self.calls = {service: 0 for service in self.latencies}
+        self.failures = {service: 0 for service in self.latencies}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Latency & failure injection
+    # ------------------------------------------------------------------
+
+    def _rng(self, service, *key):
+        return random.Random(f"{self.seed}:{service}:{key}")
+
+    def _plan(self, service, key, attempt=0):
+        """Latency and failure outcome of a call, derived from its arguments."""
+        rng = self._rng(service, key, attempt)
+        latency = self.latencies[service] * self.latency_scale * (1 + rng.uniform(-self.jitter, self.jitter))
+        failed = rng.random() < self.failure_rate
+        with self._lock:
+            self.calls[service] += 1
+            if failed:
+                self.failures[service] += 1
+        return max(latency, 0.0), failed
+
+    def _wait(self, service, key, attempt=0):
+        latency, failed = self._plan(service, key, attempt)
+        time.sleep(latency)
+        return failed
+
+    async def _await(self, service, key, attempt=0):
+        latency, failed = self._plan(service, key, attempt)
+        await asyncio.sleep(latency)
+        return failed
+
+    # ------------------------------------------------------------------
+    # LLM
+    # ------------------------------------------------------------------
+
+    @traced("invoke_llm", kind="llm")
+    def invoke_llm(self, system_prompt, user_message, model="gpt-3.5-turbo", llm_provider="openai", response_format=None, max_tokens=12000, use_cache=True):
+        key = (system_prompt[:200], str(user_message)[:2000])
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            if not self._wait("llm", key, attempt):
+                return self._llm_response(system_prompt, user_message, model, response_format)
+        raise InjectedFailure("LLM call failed after retries")
+
+    @traced("invoke_llm", kind="llm")
+    async def ainvoke_llm(self, system_prompt, user_message, model="gpt-3.5-turbo", llm_provider="openai", response_format=None, max_tokens=12000, use_cache=True):
+        key = (system_prompt[:200], str(user_message)[:2000])
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            if not await self._await("llm", key, attempt):
+                return self._llm_response(system_prompt, user_message, model, response_format)
+        raise InjectedFailure("LLM call failed after retries")
+
+    def _llm_response(self, system_prompt, user_message, model, response_format):
+        rng = self._rng("llm_response", system_prompt[:200], str(user_message)[:2000])
+        if "before any in-depth research" in system_prompt:
+            # Pre-qualification screening: like the real prompt, tiny companies are rejected
+            employees = re.search(r"'employee_count': (\d+)", str(user_message))
+            output = "2.0" if employees and int(employees.group(1)) < 10 else f"{rng.uniform(4.0, 9.5):.1f}"
+        elif "numeric score" in system_prompt:
+            output = f"{rng.uniform(4.0, 9.5):.1f}"
+        elif "LinkedIn URL" in system_prompt:
+            # extract_linkedin_url: pick the first personal profile of the search results
+            match = re.search(r"https://[\w.]*linkedin\.com/in/[\w-]+/?", str(user_message))
+            output = match.group(0) if match else ""
+        elif response_format is not None:
+            output = {
+                name: (f"https://example.com/{name}" if name in ("blog_url", "youtube", "twitter", "facebook") else self._text(rng, 60))
+                for name in response_format.model_fields
+            }
+        else:
+            output = self._text(rng, self.response_words)
+
+        record_llm_usage(
+            model,
+            count_tokens(system_prompt, model) + count_tokens(str(user_message), model),
+            count_tokens(str(output), model)
+        )
+        return output
+
+    @staticmethod
+    def _text(rng, words):
+        vocabulary = ["company", "growth", "platform", "automation", "customers", "data", "team", "market", "product", "analysis", "strategy", "solution"]
+        return " ".join(rng.choice(vocabulary) for _ in range(words)) + "."
+
+    # ------------------------------------------------------------------
+    # Search, LinkedIn & websites
+    # ------------------------------------------------------------------
+
+    @traced("google_search")
+    def google_search(self, query, page=1):
+        if self._wait("google_search", (query, page)):
+            return None  # like the real function when Serper fails
+        return self._search_results(query if page == 1 else f"{query} page {page}")
+
+    @traced("google_search_many")
+    def google_search_many(self, queries, batch_size=100):
+        # One round-trip per batch, a failed batch returns no results
+        results = []
+        for start in range(0, len(queries), batch_size):
+            batch = queries[start:start + batch_size]
+            if self._wait("google_search", tuple(batch)):
+                results.extend([] for _ in batch)
+            else:
+                results.extend(self._search_results(query) for query in batch)
+        return results
+
+    def _search_results(self, query):
+        rng = self._rng("google_search_results", query)
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")[:40]
+        results = []
+        for i in range(10):
+            kind = "in" if i % 2 == 0 else "company"
+            # Only the top result matches the query, the others are unrelated pages
+            name = slug if i == 0 else f"{rng.choice(['chris', 'pat', 'robin', 'lee'])}-{rng.choice(['smith', 'garcia', 'chen', 'kumar'])}"
+            name = f"{name}-{rng.randint(1000, 9999)}"
+            results.append({
+                "title": f"{name.replace('-', ' ').title()} | LinkedIn",
+                "link": f"https://www.linkedin.com/{kind}/{name}",
+                "snippet": self._text(rng, 25),
+                "position": i + 1
+            })
+        record(bytes_fetched=len(str(results)))
+        return results
+
+    @traced("google_search.news")
+    def get_recent_news(self, company):
+        if self._wait("news", company):
+            # Same failure mode as the real tool: an error string, not an exception
+            return "Error fetching news: 503"
+        rng = self._rng("news_results", company)
+        news = "".join(
+            f"Title: {company} news {i}\nSnippet: {self._text(rng, 30)}\nDate: {i + 1} days ago\nURL: https://news.example.com/{i}\n\n"
+            for i in range(10)
+        )
+        record(bytes_fetched=len(news))
+        return news
+
+    @traced("scrape_linkedin")
+    def scrape_linkedin(self, linkedin_url, is_company=False):
+        if self._wait("linkedin", (linkedin_url, is_company)):
+            # Same failure mode as the real tool on a non-200 response
+            print("Request failed with status code: 503")
+            return None
+        rng = self._rng("linkedin_profile", linkedin_url, is_company)
+        slug = linkedin_url.rstrip("/").split("/")[-1] or "acme"
+        # Company pages are named by their slug, every person works at their own company
+        company_slug = slug if is_company else f"company{zlib.crc32(slug.encode()) % 100000}"
+        company = f"{company_slug.title()} Corp"
+        if is_company:
+            data = {
+                "company_name": company,
+                "description": self._text(rng, 80),
+                "year_founded": rng.randint(1990, 2022),
+                "industries": [rng.choice(INDUSTRIES)],
+                "specialties": self._text(rng, 10),
+                "employee_count": rng.choice([5, 40, 250, 1200, 8000]),
+                "follower_count": rng.randint(100, 100000),
+                "locations": [{"city": "Philadelphia", "country": "US"}]
+            }
+        else:
+            data = {
+                "full_name": slug.replace("-", " ").title(),
+                "headline": "Head of Marketing",
+                "about": self._text(rng, 60),
+                "location": "Philadelphia, US",
+                "company": company,
+                "company_website": f"https://{company_slug}.example.com",
+                "company_linkedin_url": f"https://www.linkedin.com/company/{company_slug}",
+                "skills": ["Marketing", "Sales"],
+                "experiences": [{"company": company, "title": "Head of Marketing", "is_current": True}]
+            }
+        record(bytes_fetched=len(str(data)))
+        return {"data": data}
+
+    def scrape_linkedin_many(self, linkedin_urls, is_company=False, max_workers=None):
+        # Fetched concurrently: the batch takes as long as its slowest profile
+        items = [item if isinstance(item, tuple) else (item, is_company) for item in linkedin_urls]
+        with ThreadPoolExecutor(max_workers=max(1, len(items))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self.scrape_linkedin, url, flag) for url, flag in items]
+            return [future.result() if url else None for (url, _), future in zip(items, futures)]
+
+    @traced("scrape_website_to_markdown")
+    def scrape_website_to_markdown(self, url, max_length=50000):
+        if self._wait("website", url):
+            raise InjectedFailure("Failed to fetch the URL. Status code: 503")
+        rng = self._rng("website", url)
+        content = f"# {url}\n\n" + "\n\n".join(self._text(rng, 120) for _ in range(8))
+        record(bytes_fetched=len(content) * 3)  # HTML is a few times larger than its markdown
+        return content[:max_length]
+
+    @traced("crawl_website_to_markdown")
+    def crawl_website_to_markdown(self, url, max_length=50000, max_pages=None):
+        # Homepage first, then the linked pages concurrently (a failed page is skipped)
+        sections = [self.scrape_website_to_markdown(url, max_length)]
+        links = [f"{url.rstrip('/')}/{page}" for page in ("about", "products", "solutions", "blog", "careers")]
+        links = links[:(max_pages or 5) - 1]
+
+        def fetch(link):
+            try:
+                return self.scrape_website_to_markdown(link, max_length)
+            except InjectedFailure:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, len(links))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, fetch, link) for link in links]
+            pages = [future.result() for future in futures]
+        sections += [page for page in pages if page]
+        return "\n\n".join(sections)[:max_length]
+
+    @traced("collect_recent_blog_posts")
+    def collect_recent_blog_posts(self, website, blog_url=None, max_length=25000):
+        # Feed lookup, then the most recent posts concurrently (a failed post is skipped)
+        blog_url = blog_url or (f"{website.rstrip('/')}/blog" if website else "")
+        if not blog_url:
+            return ""
+        self.scrape_website_to_markdown(f"{blog_url}/feed", 5000)
+        posts = [f"{blog_url}/post-{number}" for number in range(1, 6)]
+
+        def summarize(post):
+            try:
+                return self.scrape_website_to_markdown(post, 1500)
+            except InjectedFailure:
+                return None
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, summarize, post) for post in posts]
+            summaries = [future.result() for future in futures]
+        return "\n\n".join(summary for summary in summaries if summary)[:max_length]
+
+    # ------------------------------------------------------------------
+    # Google APIs & RAG
+    # ------------------------------------------------------------------
+
+    @traced("youtube.get_youtube_stats", kind="google_api")
+    def get_youtube_stats(self, channel_url):
+        if self._wait("youtube", channel_url):
+            raise InjectedFailure("YouTube API error")
+        rng = self._rng("youtube", channel_url)
+        return [{"title": f"Video {i}", "views": rng.randint(100, 50000), "likes": rng.randint(0, 2000), "comments": rng.randint(0, 200)} for i in range(5)]
+
+    def fetch_similar_case_study(self, description):
+        if self._wait("embeddings", description[:500]):
+            raise InjectedFailure("Embeddings API error")
+        return "Case study: " + self._text(self._rng("case_study", description[:500]), 150)
+
+    def docs_manager_class(self):
+        services = self
+
+        class FakeGoogleDocsManager:
+            """Stand-in for GoogleDocsManager (Docs & Drive)."""
+
+            @traced("google_docs.add_document", kind="google_api")
+            def add_document(self, content, doc_title, folder_name, make_shareable=False, folder_shareable=False, markdown=False):
+                if services._wait("google_api", (doc_title, folder_name)):
+                    # The real manager logs API errors and returns None
+                    print("An error occurred: injected Google Docs failure")
+                    return None
+                doc_id = zlib.crc32(f'{folder_name}/{doc_title}'.encode())
+                return {
+                    "document_url": f"https://docs.google.com/document/d/{doc_id}",
+                    "shareable_url": f"https://docs.google.com/document/d/{doc_id}/view" if make_shareable else None,
+                    "folder_url": f"https://drive.google.com/drive/folders/{zlib.crc32(folder_name.encode())}"
+                }
+
+            @traced("google_docs.add_documents", kind="google_api")
+            def add_documents(self, documents, folder_name, make_shareable=False, folder_shareable=False):
+                # Uploaded concurrently: the batch takes about one round-trip
+                with ThreadPoolExecutor(max_workers=max(1, len(documents))) as executor:
+                    futures = [
+                        executor.submit(
+                            contextvars.copy_context().run, self.add_document,
+                            document["content"], document["title"], folder_name, make_shareable, folder_shareable,
+                            document.get("markdown", False),
+                        )
+                        for document in documents
+                    ]
+                    return [future.result() for future in futures]
+
+            @traced("google_docs.get_document", kind="google_api")
+            def get_document(self, doc_url):
+                services._wait("google_api", doc_url)
+                return ""
+
+        return FakeGoogleDocsManager
+
+    def gmail_class(self):
+        services = self
+
+        class FakeGmailTools:
+            """Stand-in for GmailTools, nothing is sent."""
+
+            @traced("gmail.create_draft_email", kind="google_api")
+            def create_draft_email(self, recipient, subject, email_content):
+                if services._wait("google_api", ("draft", recipient, subject)):
+                    return None
+                return {"id": "draft"}
+
+            @traced("gmail.send_email", kind="google_api")
+            def send_email(self, recipient, subject, email_content):
+                if services._wait("google_api", ("send", recipient, subject)):
+                    return None
+                return {"id": "message"}
+
+        return FakeGmailTools
+
+    # ------------------------------------------------------------------
+    # Installation
+    # ------------------------------------------------------------------
+
+    def replacements(self):
+        """Names of the real functions/classes mapped to their fakes."""
+        return {
+            "invoke_llm": self.invoke_llm,
+            "ainvoke_llm": self.ainvoke_llm,
+            "google_search": self.google_search,
+            "google_search_many": self.google_search_many,
+            "get_recent_news": self.get_recent_news,
+            "scrape_linkedin": self.scrape_linkedin,
+            "scrape_linkedin_many": self.scrape_linkedin_many,
+            "scrape_website_to_markdown": self.scrape_website_to_markdown,
+            "crawl_website_to_markdown": self.crawl_website_to_markdown,
+            "collect_recent_blog_posts": self.collect_recent_blog_posts,
+            "get_youtube_stats": self.get_youtube_stats,
+            "fetch_similar_case_study": self.fetch_similar_case_study,
+            "GoogleDocsManager": self.docs_manager_class(),
+            "GmailTools": self.gmail_class(),
+        }
+
+    @contextmanager
+    def install(self):
+        """
+        Swap the fakes into every loaded `src` module holding a reference to the real
+        function or class (including their defining modules, so function level imports
+        pick them up too). Everything is restored on exit.
+        """
+        import src.nodes  # noqa: F401 - make sure every tool module is loaded
+
+        replacements = self.replacements()
+        originals = []
+        for module_name, module in list(sys.modules.items()):
+            if module is None or not (module_name == "src" or module_name.startswith("src.")):
+                continue
+            for name, fake in replacements.items():
+                if hasattr(module, name):
+                    originals.append((module, name, getattr(module, name)))
+                    setattr(module, name, fake)
+        try:
+            yield self
+        finally:
+            for module, name, original in reversed(originals):
+                setattr(module, name, original)
+
+    def stats(self):
+        return {"calls": dict(self.calls), "failures": dict(self.failures)}
+
+
+class SyntheticLeadLoader(LeadLoaderBase):
+    """In-memory CRM with `number_leads` generated leads; updates are kept in `updates`."""
+
+    def __init__(self, number_leads=10, seed=0):
+        rng = random.Random(f"{seed}:leads")
+        self.records = [
+            {
+                "id": f"rec{i:05d}",
+                "First Name": rng.choice(["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey"]),
+                "Last Name": f"Lead{i}",
+                "Email": f"lead{i}@company{i}.com",
+                "Phone": "",
+                "Address": "",
+                "Industry": rng.choice(INDUSTRIES),
+                "Status": "NEW"
+            }
+            for i in range(number_leads)
+        ]
+        self.updates = {}
+
+    def fetch_records(self, lead_ids=None, status_filter="NEW"):
+        if lead_ids:
+            return [record for record in self.records if record["id"] in lead_ids]
+        return [record for record in self.records if status_filter is None or record["Status"] == status_filter]
+
+    def update_record(self, lead_id, updates):
+        self.updates[lead_id] = updates
+        return {"id": lead_id, "fields": updates}
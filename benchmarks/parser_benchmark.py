@@ -0,0 +1,112 @@
+"""
+HTML parser benchmark of the website scraper: time to turn saved pages into markdown
+with every installed parser backend, converting the whole page or stopping at the
+length budget the graph actually uses.
+
+    python -m benchmarks.parser_benchmark
+    python -m benchmarks.parser_benchmark --max-length 25000 --repeat 10
+    python -m benchmarks.parser_benchmark --save https://example.com example_home
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.base.markdown_scraper_tool import DEFAULT_HEADERS, convert_html_to_markdown
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Parser backend -> module that must be importable to use it
+PARSERS = {"html.parser": None, "lxml": "lxml", "selectolax": "selectolax.lexbor"}
+
+
+def available_parsers():
+    parsers = []
+    for name, module in PARSERS.items():
+        try:
+            if module:
+                __import__(module)
+            parsers.append(name)
+        except ImportError:
+            print(f"Skipping {name} (not installed)")
+    return parsers
+
+
+def load_fixtures(folder):
+    fixtures = {}
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith(".html"):
+            with open(os.path.join(folder, filename), encoding="utf-8") as f:
+                fixtures[filename[:-len(".html")]] = f.read()
+    return fixtures
+
+
+def save_fixture(url, name, folder):
+    """Save a live page as a fixture, to benchmark on real-world markup."""
+    import requests
+
+    response = requests.get(url, headers=DEFAULT_HEADERS, timeout=30)
+    response.raise_for_status()
+    path = os.path.join(folder, f"{name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(response.text)
+    print(f"Saved {len(response.text)} characters to {path}")
+
+
+def time_conversion(html, parser, max_chars, repeat):
+    """Median conversion time in seconds & length of the produced markdown."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        markdown = convert_html_to_markdown(html, max_chars=max_chars, parser=parser)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(markdown)
+
+
+def run_benchmark(fixtures, parsers, max_length=30000, repeat=5):
+    results = []
+    for name, html in fixtures.items():
+        for parser in parsers:
+            full_time, full_chars = time_conversion(html, parser, 0, repeat)
+            capped_time, capped_chars = time_conversion(html, parser, max_length, repeat)
+            results.append({
+                "fixture": name,
+                "html_chars": len(html),
+                "parser": parser,
+                "full_ms": round(full_time * 1000, 1),
+                "full_chars": full_chars,
+                "capped_ms": round(capped_time * 1000, 1),
+                "capped_chars": capped_chars,
+            })
+    return results
+
+
+def format_report(results, max_length):
+    lines = [f"{'fixture':<20}{'html KB':>9}  {'parser':<13}{'full ms':>9}{'chars':>9}{f'<= {max_length} ms':>14}{'chars':>9}"]
+    for r in results:
+        lines.append(
+            f"{r['fixture']:<20}{r['html_chars'] / 1024:>9.0f}  {r['parser']:<13}{r['full_ms']:>9}{r['full_chars']:>9}"
+            f"{r['capped_ms']:>14}{r['capped_chars']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parser backends of the website scraper on saved pages")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Folder of saved .html pages (default: benchmarks/fixtures)")
+    parser.add_argument("--max-length", type=int, default=30000, help="Markdown length budget of the capped conversion (default: 30000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per fixture & parser (default: 5)")
+    parser.add_argument("--save", nargs=2, metavar=("URL", "NAME"), help="Save a live page as a fixture and exit")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.save:
+        save_fixture(args.save[0], args.save[1], args.fixtures)
+        sys.exit(0)
+    results = run_benchmark(load_fixtures(args.fixtures), available_parsers(), args.max_length, args.repeat)
+    print(format_report(results, args.max_length))
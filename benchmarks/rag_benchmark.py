@@ -0,0 +1,139 @@
+"""
+Offline case study retrieval benchmark: indexes a folder of case studies with the
+local embedding backend (no network, no API key) in a temporary database, then
+times queries and checks that each one finds the case study it was written from.
+
+Without `--folder`, synthetic case studies are generated.
+
+    python -m benchmarks.rag_benchmark
+    python -m benchmarks.rag_benchmark --case-studies 500 --queries 200 --k 3
+    python -m benchmarks.rag_benchmark --folder data/case_studies
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools import rag_tool
+
+INDUSTRIES = ["manufacturing", "healthcare", "retail", "logistics", "energy", "finance", "telecom", "automotive"]
+WORKLOADS = ["computer vision", "fraud detection", "demand forecasting", "predictive maintenance",
+             "speech recognition", "recommendation", "document search", "anomaly detection"]
+PRODUCTS = ["PowerEdge XE9680 servers", "PowerScale storage", "APEX cloud", "Precision workstations",
+            "edge gateways", "ObjectScale", "PowerFlex", "NativeEdge"]
+FILLER = ("The team reduced costs and improved time to value. The deployment scaled across sites "
+          "with the support of the partner ecosystem and a phased rollout plan.").split()
+
+
+def generate_case_studies(folder, count, seed=0):
+    """Write `count` synthetic case studies; return one query per case study (file name -> query)."""
+    rng = random.Random(seed)
+    queries = {}
+    for number in range(count):
+        industry, workload, product = rng.choice(INDUSTRIES), rng.choice(WORKLOADS), rng.choice(PRODUCTS)
+        customer = f"Customer{number:04d}"
+        body = " ".join(rng.choice(FILLER) for _ in range(150))
+        text = (
+            f"{customer} case study\n\n{customer}, a {industry} company, runs {workload} models on {product}.\n\n"
+            f"{body}\n\nResults: {workload} in production for {industry} operations at {customer}."
+        )
+        name = f"case_study_{number:04d}.txt"
+        with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+            f.write(text)
+        # No customer name in the query: it would be a unique token, making retrieval trivial
+        queries[name] = f"{industry} startup building {workload} on {product}"
+    return queries
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def time_queries(queries, k):
+    """Latency (ms) of each query, and share of queries whose case study is in the top `k`."""
+    timings, found = [], 0
+    for name, query in queries:
+        start = time.perf_counter()
+        docs = rag_tool.search_case_studies(query, k)
+        timings.append((time.perf_counter() - start) * 1000)
+        found += any(os.path.basename(doc.metadata.get("source", "")) == name for doc in docs)
+    return timings, found / max(1, len(queries))
+
+
+def run_benchmark(folder=None, case_studies=200, queries=100, k=1):
+    original_config = dict(rag_tool.RAG_CONFIG)
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            return _run(workdir, folder, case_studies, queries, k)
+        finally:
+            rag_tool.configure_rag(**original_config)
+
+
+def _run(workdir, folder, case_studies, queries, k):
+    if folder:
+        query_list = []
+    else:
+        folder = os.path.join(workdir, "case_studies")
+        os.makedirs(folder)
+        generated = generate_case_studies(folder, case_studies)
+        query_list = random.Random(1).sample(sorted(generated.items()), min(queries, len(generated)))
+    rag_tool.configure_rag(
+        database_path=os.path.join(workdir, "database"), case_studies_dir=folder, embedding_backend="local",
+        query_cache_path=os.path.join(workdir, "query_embeddings.sqlite"),
+    )
+    results = {}
+    start = time.perf_counter()
+    rag_tool.get_vector_store()
+    results["index_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    rag_tool.configure_rag()  # reopen: nothing changed, nothing is embedded again
+    rag_tool.get_vector_store()
+    results["reopen_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    rag_tool.get_keyword_index()
+    results["bm25_build_s"] = time.perf_counter() - start
+
+    if not query_list:
+        # Real case studies: query each one with its own opening lines
+        docs = rag_tool.get_keyword_index()[1]
+        query_list = [(os.path.basename(doc.metadata.get("source", "")), doc.page_content[:300]) for doc in docs[:queries]]
+    for mode, hybrid in (("vector", False), ("hybrid", True)):
+        rag_tool.configure_rag(hybrid=hybrid)
+        rag_tool.get_keyword_index()
+        time_queries(query_list[:5], k)  # warm up
+        results[mode] = time_queries(query_list, k)
+    results["hybrid_cached"] = time_queries(query_list, k)  # query embeddings now cached
+    return results
+
+
+def format_report(results, k):
+    lines = [
+        f"Index build: {results['index_s']:.2f}s, reopen (unchanged): {results['reopen_s']:.2f}s, "
+        f"BM25 build: {results['bm25_build_s'] * 1000:.0f}ms",
+        f"{'search':<16}{'p50 ms':>9}{'p95 ms':>9}{f'hit@{k}':>9}",
+    ]
+    for mode in ("vector", "hybrid", "hybrid_cached"):
+        timings, hit_rate = results[mode]
+        lines.append(f"{mode:<16}{statistics.median(timings):>9.2f}{percentile(timings, 0.95):>9.2f}{hit_rate:>9.0%}")
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline case study retrieval benchmark (local embeddings + BM25)")
+    parser.add_argument("--folder", help="Folder of case studies (default: generated ones)")
+    parser.add_argument("--case-studies", type=int, default=200, help="Generated case studies (default: 200)")
+    parser.add_argument("--queries", type=int, default=100, help="Queries timed (default: 100)")
+    parser.add_argument("--k", type=int, default=1, help="Case studies returned per query (default: 1)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmark(args.folder, args.case_studies, args.queries, args.k)
+    print(format_report(results, args.k))
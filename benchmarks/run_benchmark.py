@@ -0,0 +1,207 @@
+"""
+Offline throughput benchmark of the full outreach graph.
+
+Every external service is replaced by the deterministic fakes of `benchmarks/fakes.py`,
+so runs cost nothing and can be compared with each other to track regressions.
+
+    python -m benchmarks.run_benchmark --leads 50 --concurrency 8
+    python -m benchmarks.run_benchmark --leads 10 --sequential --latency-scale 0.2
+    python -m benchmarks.run_benchmark --leads 50 --failure-rate 0.02 --output bench.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import nodes
+from src.graph import OutReachAutomation
+from src.state import LeadData, new_lead_state
+from src.instrumentation import get_spans, reset_instrumentation, summarize_spans
+from benchmarks.fakes import FakeServices, SyntheticLeadLoader
+
+
+def peak_rss_mb():
+    """Peak resident set size of the process in MB, None if it can't be measured."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 2 ** 20, 1)
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def lead_latencies(spans):
+    """Wall time of every lead, from the start of its first node to the end of its last one."""
+    bounds = {}
+    for s in spans:
+        if s["kind"] != "node" or not s["lead_id"]:
+            continue
+        start, end = s["started_at"], s["started_at"] + s["wall_time"]
+        first, last = bounds.get(s["lead_id"], (start, end))
+        bounds[s["lead_id"]] = (min(first, start), max(last, end))
+    return {lead_id: end - start for lead_id, (start, end) in bounds.items()}
+
+
+def run_benchmark(
+    leads=20,
+    concurrency=4,
+    sequential=False,
+    use_async=False,
+    latency_scale=0.1,
+    failure_rate=0.0,
+    seed=0,
+    prequalify=False,
+    verbose=False,
+    loader=None
+):
+    """
+    Run the outreach graph over `leads` synthetic leads against the fake services.
+
+    @param sequential: Use the original one-lead-at-a-time graph instead of batch mode.
+    @param use_async: Run the graph with `ainvoke` (async I/O path).
+    @param loader: CRM to run against (default: a `SyntheticLeadLoader` of `leads` leads), its updates can be inspected afterwards.
+    @return: Dictionary of throughput, latency, memory & call metrics.
+    """
+    services = FakeServices(latency_scale=latency_scale, failure_rate=failure_rate, seed=seed)
+    loader = loader or SyntheticLeadLoader(leads, seed=seed)
+    flags = {
+        "INDUSTRY_RESEARCH_MODE": False,
+        "STOP_AFTER_FIRST_QUALIFIED": False,
+        "PREQUALIFY_LEADS": prequalify,
+    }
+    original_flags = {name: getattr(nodes, name) for name in flags}
+
+    # Run in a scratch folder, nodes write local reports & the processed companies log
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="outreach_benchmark_")
+    os.chdir(workdir)
+    reset_instrumentation()
+    error = None
+    try:
+        for name, value in flags.items():
+            setattr(nodes, name, value)
+        with services.install():
+            automation = OutReachAutomation(loader, batch_mode=not sequential, max_concurrency=concurrency)
+            if sequential:
+                inputs = {**new_lead_state(LeadData(id="", name="", address="", email="", phone="", profile="")), "number_leads": 0}
+                config = {"recursion_limit": 25 * (leads + 1)}
+            else:
+                inputs = {"leads_ids": [], "leads_data": [], "number_leads": 0}
+                config = None
+
+            output = io.StringIO()
+            start = time.perf_counter()
+            try:
+                with redirect_stdout(sys.stdout if verbose else output):
+                    if use_async:
+                        asyncio.run(automation.arun(inputs, config))
+                    else:
+                        automation.run(inputs, config)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - start
+    finally:
+        for name, value in original_flags.items():
+            setattr(nodes, name, value)
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    spans = get_spans()
+    latencies = list(lead_latencies(spans).values())
+    completed = len(loader.updates)
+    summary = summarize_spans(spans)
+    return {
+        "settings": {
+            "leads": leads,
+            "concurrency": None if sequential else concurrency,
+            "mode": ("sequential" if sequential else "batch") + (" async" if use_async else ""),
+            "latency_scale": latency_scale,
+            "failure_rate": failure_rate,
+            "seed": seed,
+            "prequalify": prequalify,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "leads_completed": completed,
+        "leads_per_minute": round(completed / elapsed * 60, 2) if elapsed else None,
+        "lead_latency_p50": round(percentile(latencies, 0.5), 3) if latencies else None,
+        "lead_latency_p95": round(percentile(latencies, 0.95), 3) if latencies else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "llm_calls": summary["per_call"].get("invoke_llm", {}).get("count", 0),
+        "tokens": summary["totals"]["prompt_tokens"] + summary["totals"]["completion_tokens"],
+        "estimated_cost_usd": summary["totals"]["cost_usd"],
+        "service_calls": services.stats(),
+        "error": error,
+    }
+
+
+def format_report(result):
+    settings = result["settings"]
+    lines = [
+        f"Mode: {settings['mode']}, leads: {settings['leads']}, concurrency: {settings['concurrency']}, "
+        f"latency scale: {settings['latency_scale']}, failure rate: {settings['failure_rate']}",
+        f"Completed leads:  {result['leads_completed']}/{settings['leads']} in {result['elapsed_seconds']}s",
+        f"Throughput:       {result['leads_per_minute']} leads/min",
+        f"Lead latency:     p50 {result['lead_latency_p50']}s, p95 {result['lead_latency_p95']}s",
+        f"Peak RSS:         {result['peak_rss_mb']} MB",
+        f"LLM calls:        {result['llm_calls']} ({result['tokens']} tokens, ~${result['estimated_cost_usd']})",
+    ]
+    if result["error"]:
+        lines.append(f"Run failed:       {result['error']}")
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the outreach graph with fake external services")
+    parser.add_argument("--leads", type=int, default=20, help="Number of synthetic leads (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Leads researched at the same time in batch mode (default: 4)")
+    parser.add_argument("--sequential", action="store_true", help="Use the one-lead-at-a-time graph instead of batch mode")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the graph on the async path")
+    parser.add_argument("--latency-scale", type=float, default=0.1, help="Multiplier of the fake service latencies, 1.0 ≈ real APIs (default: 0.1)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability that a single service call fails (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic data, latencies & failures (default: 0)")
+    parser.add_argument("--prequalify", action="store_true", help="Enable the pre-qualification gate")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the graph output")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = run_benchmark(
+        leads=args.leads,
+        concurrency=args.concurrency,
+        sequential=args.sequential,
+        use_async=args.use_async,
+        latency_scale=args.latency_scale,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+        prequalify=args.prequalify,
+        verbose=args.verbose
+    )
+    print(format_report(result))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results saved to {args.output}")
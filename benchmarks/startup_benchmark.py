@@ -0,0 +1,91 @@
+"""
+Startup time benchmark: how long the entry points take before doing any work.
+Each command runs in a fresh interpreter; the run fails (exit code 1) when a
+command's median time exceeds its budget, so import-time regressions get caught.
+
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --repeat 10 --top 15
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Command name -> (arguments, budget in seconds for the median run)
+COMMANDS = {
+    "main.py --help": (["main.py", "--help"], 1.0),
+    "manage_company_log.py help": (["manage_company_log.py", "help"], 0.5),
+    "import src.nodes": (["-c", "import src.nodes"], 3.0),
+    "build graph (no Google/Chroma calls)": ([
+        "-c",
+        "from src.graph import OutReachAutomation\n"
+        "from src.tools.leads_loader.lead_loader_base import LeadLoaderBase\n"
+        "class Loader(LeadLoaderBase):\n"
+        "    def fetch_records(self, status_filter='NEW'): return []\n"
+        "    def update_record(self, lead_id, status): pass\n"
+        "OutReachAutomation(Loader())"
+    ], 3.0),
+}
+
+
+def time_command(arguments, repeat):
+    """Wall time of `repeat` fresh runs of `python <arguments>`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-W", "ignore", *arguments],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        timings.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            raise RuntimeError(f"`python {' '.join(arguments)}` failed:\n{completed.stderr[-2000:]}")
+    return timings
+
+
+def slowest_imports(arguments, top):
+    """Modules with the highest cumulative import time (python -X importtime)."""
+    completed = subprocess.run(
+        [sys.executable, "-W", "ignore", "-X", "importtime", *arguments],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative) / 1e6, module.rstrip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Startup time benchmark of the entry points")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (default: 5)")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports of `import src.nodes`")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    over_budget = []
+    print(f"{'command':<40}{'median s':>10}{'min s':>10}{'budget s':>10}")
+    for name, (arguments, budget) in COMMANDS.items():
+        timings = time_command(arguments, args.repeat)
+        median = statistics.median(timings)
+        flag = "  OVER BUDGET" if median > budget else ""
+        print(f"{name:<40}{median:>10.3f}{min(timings):>10.3f}{budget:>10.1f}{flag}")
+        if flag:
+            over_budget.append(name)
+
+    if args.top:
+        print(f"\nSlowest imports of `import src.nodes`:")
+        for seconds, module in slowest_imports(COMMANDS["import src.nodes"][0], args.top):
+            print(f"{seconds:>8.3f}s {module}")
+
+    if over_budget:
+        print(f"\nOver budget: {', '.join(over_budget)}")
+        sys.exit(1)
@@ -1,14 +1,59 @@
 import os
+import uuid
+import argparse
 from dotenv import load_dotenv
-from src.graph import OutReachAutomation
-from src.state import *
-from src.tools.leads_loader.airtable import AirtableLeadLoader
-from src.tools.leads_loader.google_sheets import GoogleSheetLeadLoader
+from datetime import datetime
 
 # Load environment variables from a .env file
 load_dotenv()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lead research and outreach automation")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Research every lead in its own independent run instead of one after the other"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of leads researched at the same time in batch mode (default: 4)"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its last checkpoint (use the same --batch setting as the original run)"
+    )
+    parser.add_argument(
+        "--checkpoint-db",
+        help="SQLite file where run checkpoints are stored (default: checkpoints.sqlite)"
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Disable checkpointing (the run can't be resumed)"
+    )
+    parser.add_argument(
+        "--summary-dir",
+        default="run_summaries",
+        help="Folder where the JSON run summary (latency, tokens, cost per lead & node) is written (default: run_summaries)"
+    )
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+
+    # The graph pulls in LangGraph, LangChain & the tools: import it only once the
+    # arguments are parsed so `--help` and argument errors return immediately
+    from src.graph import OutReachAutomation, CHECKPOINT_DB, get_sqlite_checkpointer
+    from src.instrumentation import write_run_summary, format_run_table
+    from src.tools.base.linkedin_tools import get_linkedin_url_stats
+    from src.tools.base.http_cache import get_http_cache_stats
+    from src.state import *
+    from src.tools.leads_loader.airtable import AirtableLeadLoader
+    from src.tools.leads_loader.google_sheets import GoogleSheetLeadLoader
+    
     # Use Airtable for accessing your leads list
     lead_loader = AirtableLeadLoader(
         access_token=os.getenv("AIRTABLE_ACCESS_TOKEN"),
@@ -25,8 +70,15 @@ if __name__ == "__main__":
     existing_clients_sheet_id = os.getenv("EXISTING_CLIENTS_SHEET_ID")  # Add this to your .env file
     
     # Instantiate the OutReachAutomation class with existing clients sheet
-    automation = OutReachAutomation(lead_loader, existing_clients_sheet_id)
-    app = automation.app
+    # Checkpoint every finished node so an interrupted run can be resumed
+    checkpointer = None if args.no_checkpoint else get_sqlite_checkpointer(args.checkpoint_db or CHECKPOINT_DB)
+    automation = OutReachAutomation(
+        lead_loader,
+        existing_clients_sheet_id,
+        batch_mode=args.batch,
+        max_concurrency=args.concurrency,
+        checkpointer=checkpointer
+    )
     
     # initial graph inputs:
     # Lead ids to be processed, leave empty to fetch all new leads
@@ -51,17 +103,39 @@ if __name__ == "__main__":
     "custom_outreach_report_link": "",
     "personalized_email": "",
     "interview_script": "",
-    "number_leads": 0
+    "number_leads": 0,
+    "drive_folder_name": ""
         }
 
-    # Run the outreach automation with the provided lead name and email
-    # Ensure inputs are wrapped in GraphState if required by the app
-    state = GraphState(**inputs)
-    
-    # Increase recursion limit since we're processing multiple industries
-    import sys
-    sys.setrecursionlimit(2000)  # or higher, but not lower than 1000
+    run_id = None
+    if checkpointer is not None:
+        run_id = args.resume or uuid.uuid4().hex[:12]
+        print(f"Run id: {run_id} (resume with: python main.py --resume {run_id})")
+
+    if args.resume:
+        # Continue from the last checkpoint, finished leads & nodes are not re-executed
+        if checkpointer is None:
+            raise SystemExit("--resume can't be used with --no-checkpoint")
+        output = automation.resume(run_id)
+    elif args.batch:
+        # Each lead runs in its own subgraph, no recursion ceiling to worry about
+        output = automation.run({"leads_ids": [], "leads_data": [], "number_leads": 0}, run_id=run_id)
+    else:
+        # Run the outreach automation with the provided lead name and email
+        # Ensure inputs are wrapped in GraphState if required by the app
+        state = GraphState(**inputs)
+        
+        # Increase recursion limit since we're processing multiple industries
+        import sys
+        sys.setrecursionlimit(2000)  # or higher, but not lower than 1000
+
+        output = automation.run(state, run_id=run_id)
+    print(output)
 
-    output = app.invoke(state)
-      # instead of app.invoke(state)
-    print(output)
\ No newline at end of file
+    # Where did the time and money go: per-lead/per-node table + machine-readable summary
+    summary_path = os.path.join(args.summary_dir, f"{run_id or datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    summary = write_run_summary(summary_path)
+    print(format_run_table(summary))
+    print(f"LinkedIn URL lookups: {get_linkedin_url_stats()}")
+    print(f"Website cache: {get_http_cache_stats()}")
+    print(f"Run summary saved to {summary_path}")
\ No newline at end of file
@@ -135,6 +135,48 @@ def get_linkedin_links(company_name):
     
     print(f"Company '{company_name}' not found in log")
 
+def load_discovery_cursors(filename="industry_discovery_cursors.json"):
+    """Load the per-industry discovery cursors from JSON file"""
+    try:
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                return json.load(f).get('cursors', {})
+    except Exception as e:
+        print(f"Error loading cursors file: {e}")
+    return {}
+
+def view_cursors():
+    """Display where the discovery of every industry stopped"""
+    cursors = load_discovery_cursors()
+    if not cursors:
+        print("No industry discovery cursors saved yet.")
+        return
+    
+    print(f"\n=== Industry Discovery Cursors ===")
+    for industry, cursor in cursors.items():
+        print(f"  • {industry}: query {cursor['query'] + 1}, page {cursor['page']}, result {cursor['offset']} "
+              f"(updated {cursor.get('updated_at', 'N/A')[:10]})")
+
+def reset_cursors(industry=None, filename="industry_discovery_cursors.json"):
+    """Restart the discovery of one industry (or all of them) from the first result page"""
+    cursors = load_discovery_cursors(filename)
+    if industry:
+        cursors = {name: cursor for name, cursor in cursors.items() if name.lower() != industry.lower()}
+    else:
+        cursors = {}
+    with open(filename, 'w') as f:
+        json.dump({'last_updated': datetime.now().isoformat(), 'cursors': cursors}, f, indent=2)
+    
+    # The industry can't stay marked as exhausted either
+    companies = load_processed_companies()
+    remaining = [
+        c for c in companies
+        if not (c['name'].startswith("INDUSTRY_EXHAUSTED_") and (not industry or c['name'].lower() == f"industry_exhausted_{industry.lower()}"))
+    ]
+    if len(remaining) != len(companies):
+        save_processed_companies(remaining)
+    print(f"Discovery cursor reset for {industry or 'all industries'}.")
+
 def show_help():
     """Show help information"""
     print("""
@@ -148,6 +190,8 @@ Commands:
   export [filename] - Export the log to a JSON file
   search <name>     - Search for a specific company
   linkedin <name>   - Get LinkedIn links for a specific company
+  cursors           - Show where the discovery of every industry stopped
+  reset-cursors [industry] - Restart the discovery of an industry (or all) from the first results
   help              - Show this help message
 
 Examples:
@@ -183,6 +227,10 @@ def main():
             return
         company_name = sys.argv[2]
         get_linkedin_links(company_name)
+    elif command == "cursors":
+        view_cursors()
+    elif command == "reset-cursors":
+        reset_cursors(sys.argv[2] if len(sys.argv) > 2 else None)
     elif command == "help":
         show_help()
     else:
@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+CACHE_DIR = ".cache"
+
+
+def make_cache_key(*parts):
+    """
+    Build a stable content-addressed key from any JSON-serializable parts.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """
+    Small persistent key/value cache backed by a SQLite file.
+    Values are stored as JSON, entries expire after `ttl_seconds` and the
+    least recently used entries are evicted once `max_entries` is exceeded
+    or the stored values take more than `max_bytes`.
+    """
+
+    def __init__(self, path, ttl_seconds=None, max_entries=None, max_bytes=None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL, last_accessed REAL NOT NULL, "
+            "size INTEGER NOT NULL DEFAULT 0)"
+        )
+        # Cache files created before values were sized
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(cache)")]
+        if "size" not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_accessed ON cache (last_accessed)")
+        self._conn.commit()
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return default
+            self._conn.execute("UPDATE cache SET last_accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store `value` under `key`. `ttl_seconds` overrides the cache default."""
+        now = time.time()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = now + ttl if ttl else None
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, expires_at, last_accessed, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, now, expires_at, now, len(payload.encode("utf-8")))
+            )
+            self.writes += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def _evict(self, now):
+        # Drop expired entries first, then the least recently used ones
+        cursor = self._conn.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        self.evictions += max(cursor.rowcount, 0)
+        if self.max_entries:
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY last_accessed ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+        if self.max_bytes:
+            overflow = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0] - self.max_bytes
+            if overflow > 0:
+                evicted = []
+                for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY last_accessed ASC"):
+                    evicted.append((key,))
+                    overflow -= size
+                    if overflow <= 0:
+                        break
+                self._conn.executemany("DELETE FROM cache WHERE key = ?", evicted)
+                self.evictions += len(evicted)
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+_shared_caches = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_shared_cache(path, ttl_seconds=None, max_entries=None, max_bytes=None):
+    """
+    Return the process-wide `SQLiteCache` stored at `path`, created on first use,
+    so every caller shares one connection and one set of hit/miss counters.
+    """
+    cache = _shared_caches.get(path)
+    if cache is None:
+        with _shared_caches_lock:
+            cache = _shared_caches.get(path)
+            if cache is None:
+                cache = SQLiteCache(path, ttl_seconds=ttl_seconds, max_entries=max_entries, max_bytes=max_bytes)
+                _shared_caches[path] = cache
+    return cache
+
+
+def env_flag(name, default=False):
+    """Read a boolean flag (1/true/yes, 0/false/no) from the environment."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+# ---------------------------------------------------------------------------
+# LLM response cache (opt-in)
+# ---------------------------------------------------------------------------
+
+# Enable with LLM_CACHE_ENABLED=1 in your .env or by calling configure_llm_cache(enabled=True)
+LLM_CACHE_CONFIG = {
+    "enabled": None,  # None = read LLM_CACHE_ENABLED from the environment
+    "path": os.path.join(CACHE_DIR, "llm_cache.sqlite"),
+    "ttl_seconds": 7 * 24 * 3600,
+    "max_entries": 5000,
+}
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def configure_llm_cache(**settings):
+    """
+    Configure the LLM response cache.
+
+    @param settings: Any of enabled, path, ttl_seconds, max_entries.
+    """
+    global _llm_cache
+    unknown = set(settings) - set(LLM_CACHE_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown LLM cache settings: {', '.join(sorted(unknown))}")
+    with _llm_cache_lock:
+        LLM_CACHE_CONFIG.update(settings)
+        _llm_cache = None
+
+
+def is_llm_cache_enabled():
+    enabled = LLM_CACHE_CONFIG["enabled"]
+    if enabled is None:
+        enabled = env_flag("LLM_CACHE_ENABLED")
+    return enabled
+
+
+def get_llm_cache():
+    """Return the shared LLM response cache, or None when caching is disabled."""
+    global _llm_cache
+    if not is_llm_cache_enabled():
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = SQLiteCache(
+                    LLM_CACHE_CONFIG["path"],
+                    ttl_seconds=LLM_CACHE_CONFIG["ttl_seconds"],
+                    max_entries=LLM_CACHE_CONFIG["max_entries"],
+                )
+    return _llm_cache
+
+
+def get_llm_cache_stats():
+    cache = get_llm_cache()
+    return cache.stats() if cache else {"enabled": False}
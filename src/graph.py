@@ -1,50 +1,105 @@
+import sqlite3
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 from .nodes import OutReachAutomationNodes
-from .state import GraphState
+from .instrumentation import traced_node
+from .llm_clients import aclose_llm_clients
+from .state import GraphState, BatchGraphState
 from .tools.leads_loader.lead_loader_base import LeadLoaderBase
 
+CHECKPOINT_DB = "checkpoints.sqlite"
+
+# State models stored in checkpoints, allowed back when a run is resumed
+CHECKPOINT_TYPES = [("src.state", name) for name in ("LeadData", "CompanyData", "Report", "SocialMediaLinks")]
+
+
+def get_sqlite_checkpointer(path=CHECKPOINT_DB):
+    """
+    Local SQLite checkpointer: every finished node is saved under the run id,
+    so an interrupted run can be resumed without re-executing finished work.
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    serde = JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES)
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False), serde=serde)
+
 
 class OutReachAutomation:
-    def __init__(self, loader: LeadLoaderBase, existing_clients_sheet_id=None):
+    def __init__(self, loader: LeadLoaderBase, existing_clients_sheet_id=None, batch_mode=False, max_concurrency=4, checkpointer=None):
+        """
+        @param batch_mode: If True, every lead is researched in its own independent run,
+                           `max_concurrency` of them at a time, instead of one after the other.
+        @param checkpointer: Optional LangGraph checkpointer (see `get_sqlite_checkpointer`).
+                             Runs are then identified by a run id and can be resumed.
+        """
+        self.batch_mode = batch_mode
+        self.max_concurrency = max_concurrency
+        self.checkpointer = checkpointer
         # Initialize the automation workflow by building the graph
         self.app = self.build_graph(loader, existing_clients_sheet_id)
 
+    def run(self, inputs, config=None, run_id=None):
+        """Run the workflow. `run_id` is required when a checkpointer is used."""
+        return self.app.invoke(inputs, self._run_config(config, run_id))
+
+    async def arun(self, inputs, config=None, run_id=None):
+        """
+        Run the workflow on the async path: I/O bound branches (blog, social media,
+        news analysis, email & interview script) overlap their network waits.
+        Checkpointing on this path needs an async checkpointer (e.g. AsyncSqliteSaver).
+        The LLM connections opened by this event loop are closed at the end of the run.
+        """
+        try:
+            return await self.app.ainvoke(inputs, self._run_config(config, run_id))
+        finally:
+            await aclose_llm_clients()
+
+    def resume(self, run_id, config=None):
+        """
+        Resume an interrupted run from its last checkpoint. Finished leads and
+        finished nodes within a lead are not executed again. In batch mode, the
+        branches that ran alongside the failed node of a lead run again.
+        """
+        if self.checkpointer is None:
+            raise ValueError("Resuming a run requires a checkpointer")
+        return self.app.invoke(None, self._run_config(config, run_id))
+
+    async def aresume(self, run_id, config=None):
+        if self.checkpointer is None:
+            raise ValueError("Resuming a run requires a checkpointer")
+        try:
+            return await self.app.ainvoke(None, self._run_config(config, run_id))
+        finally:
+            await aclose_llm_clients()
+
+    def _run_config(self, config=None, run_id=None):
+        config = dict(config or {})
+        if self.batch_mode:
+            # Number of leads researched at the same time
+            config.setdefault("max_concurrency", self.max_concurrency)
+        if run_id is not None:
+            config["configurable"] = {**config.get("configurable", {}), "thread_id": run_id}
+        return config
+
     def build_graph(self, loader, existing_clients_sheet_id=None):
         """
         Constructs the state graph for the outreach automation workflow.
         """
-        # Create the main graph with a predefined state
-        graph = StateGraph(GraphState)
-        
         # Initialize the nodes with the provided lead loader and existing clients sheet
         nodes = OutReachAutomationNodes(loader, existing_clients_sheet_id)
+        if self.batch_mode:
+            return self.build_batch_graph(nodes)
+
+        # Create the main graph with a predefined state
+        graph = StateGraph(GraphState)
 
         # **Step 1: Adding nodes to the graph**
         # Fetch new leads from the CRM
-        graph.add_node("get_new_leads", nodes.get_new_leads)
-        graph.add_node("check_for_remaining_leads", nodes.check_for_remaining_leads)
+        graph.add_node("get_new_leads", self._node(nodes.get_new_leads))
+        graph.add_node("check_for_remaining_leads", self._node(nodes.check_for_remaining_leads))
 
-        # Research phase: gather data and insights about the lead
-        graph.add_node("fetch_linkedin_profile_data", nodes.fetch_linkedin_profile_data)
-        graph.add_node("review_company_website", nodes.review_company_website)
-        graph.add_node("collect_company_information", nodes.collect_company_information)
-        graph.add_node("analyze_blog_content", nodes.analyze_blog_content)
-        graph.add_node("analyze_social_media_content", nodes.analyze_social_media_content)
-        graph.add_node("analyze_recent_news", nodes.analyze_recent_news)
-        graph.add_node("generate_full_lead_research_report", nodes.generate_full_lead_research_report)
-        graph.add_node("generate_digital_presence_report", nodes.generate_digital_presence_report)
-        graph.add_node("score_lead", nodes.score_lead)
-
-        # Outreach preparation phase
-        graph.add_node("create_outreach_materials", nodes.create_outreach_materials)
-        graph.add_node("generate_custom_outreach_report", nodes.generate_custom_outreach_report)
-        graph.add_node("generate_personalized_email", nodes.generate_personalized_email)
-        graph.add_node("generate_interview_script", nodes.generate_interview_script)
-
-        # Reporting and finalization
-        graph.add_node("save_reports_to_google_docs", nodes.save_reports_to_google_docs)
-        graph.add_node("await_reports_creation", nodes.await_reports_creation)
-        graph.add_node("update_CRM", nodes.update_CRM)
+        # Research, scoring, outreach & reporting nodes for the current lead
+        self._add_lead_steps(graph, nodes)
 
         # **Step 2: Setting up edges between nodes**
 
@@ -64,8 +119,80 @@ class OutReachAutomation:
             }
         )
 
-        # Research phase transitions
-        graph.add_edge("fetch_linkedin_profile_data", "review_company_website")
+        # Loop back to check for remaining leads
+        graph.add_edge("update_CRM", "check_for_remaining_leads")
+        return graph.compile(checkpointer=self.checkpointer)
+
+    def build_batch_graph(self, nodes):
+        """
+        Constructs the batch workflow: new leads are fetched once, then each lead is
+        dispatched to its own lead research subgraph (LangGraph `Send` API).
+        """
+        # Per-lead subgraph: research a single lead from LinkedIn data to CRM update
+        # (it checkpoints through the parent graph's checkpointer when one is set)
+        lead_graph = StateGraph(GraphState)
+        self._add_lead_steps(lead_graph, nodes)
+        lead_graph.set_entry_point("fetch_linkedin_profile_data")
+        lead_graph.add_edge("update_CRM", END)
+        lead_app = lead_graph.compile()
+
+        # The concurrency limit applies to leads, not to the branches inside a lead run
+        lead_config = {"max_concurrency": None}
+
+        def process_lead(state: GraphState):
+            return {"processed_leads": [self._lead_summary(lead_app.invoke(state, lead_config))]}
+
+        async def aprocess_lead(state: GraphState):
+            return {"processed_leads": [self._lead_summary(await lead_app.ainvoke(state, lead_config))]}
+
+        graph = StateGraph(BatchGraphState)
+        graph.add_node("get_new_leads", self._node(nodes.get_new_leads))
+        graph.add_node("process_lead", self._node(process_lead, aprocess_lead))
+
+        graph.set_entry_point("get_new_leads")
+        # Fan out one `process_lead` run per lead
+        graph.add_conditional_edges("get_new_leads", nodes.dispatch_leads, ["process_lead", END])
+        graph.add_edge("process_lead", END)
+        return graph.compile(checkpointer=self.checkpointer)
+
+    def _add_lead_steps(self, graph, nodes):
+        """
+        Adds the nodes and edges that research a single lead, from fetching its
+        LinkedIn data (`fetch_linkedin_profile_data`) up to `update_CRM`.
+        """
+        # Research phase: gather data and insights about the lead
+        graph.add_node("fetch_linkedin_profile_data", self._node(nodes.fetch_linkedin_profile_data))
+        graph.add_node("prequalify_lead", self._node(nodes.prequalify_lead))
+        graph.add_node("review_company_website", self._node(nodes.review_company_website))
+        graph.add_node("collect_company_information", self._node(nodes.collect_company_information))
+        graph.add_node("analyze_blog_content", self._node(nodes.analyze_blog_content, nodes.aanalyze_blog_content))
+        graph.add_node("analyze_social_media_content", self._node(nodes.analyze_social_media_content, nodes.aanalyze_social_media_content))
+        graph.add_node("analyze_recent_news", self._node(nodes.analyze_recent_news, nodes.aanalyze_recent_news))
+        graph.add_node("generate_full_lead_research_report", self._node(nodes.generate_full_lead_research_report))
+        graph.add_node("generate_digital_presence_report", self._node(nodes.generate_digital_presence_report))
+        graph.add_node("score_lead", self._node(nodes.score_lead))
+
+        # Outreach preparation phase
+        graph.add_node("create_outreach_materials", self._node(nodes.create_outreach_materials))
+        graph.add_node("generate_custom_outreach_report", self._node(nodes.generate_custom_outreach_report))
+        graph.add_node("generate_personalized_email", self._node(nodes.generate_personalized_email, nodes.agenerate_personalized_email))
+        graph.add_node("generate_interview_script", self._node(nodes.generate_interview_script, nodes.agenerate_interview_script))
+
+        # Reporting and finalization
+        graph.add_node("save_reports_to_google_docs", self._node(nodes.save_reports_to_google_docs))
+        graph.add_node("await_reports_creation", self._node(nodes.await_reports_creation))
+        graph.add_node("update_CRM", self._node(nodes.update_CRM))
+
+        # Research phase transitions, clearly unqualified leads skip the research
+        graph.add_edge("fetch_linkedin_profile_data", "prequalify_lead")
+        graph.add_conditional_edges(
+            "prequalify_lead",
+            nodes.check_if_prequalified,
+            {
+                "research": "review_company_website",
+                "skip research": "update_CRM"
+            }
+        )
         graph.add_edge("review_company_website", "collect_company_information")
 
         # Collect company information and branch into various analyses
@@ -86,7 +213,7 @@ class OutReachAutomation:
             nodes.check_if_qualified,
             {
                 "qualified": "generate_custom_outreach_report",  # Proceed if lead is qualified
-                "not qualified": "save_reports_to_google_docs"  # Save reports and exit if lead is unqualified 
+                "not qualified": "save_reports_to_google_docs"  # Save reports and exit if lead is unqualified
             }
         )
 
@@ -103,6 +230,26 @@ class OutReachAutomation:
         # Save reports and update the CRM
         graph.add_edge("save_reports_to_google_docs", "update_CRM")
 
-        # Loop back to check for remaining leads
-        graph.add_edge("update_CRM", "check_for_remaining_leads")
-        return graph.compile()
\ No newline at end of file
+    @staticmethod
+    def _lead_summary(lead_state):
+        """Compact result of a finished lead run, kept in the batch state."""
+        lead = lead_state["current_lead"]
+        return {
+            "lead_id": lead.id,
+            "name": lead.name,
+            "company": lead_state["company_data"].name,
+            "lead_score": lead_state.get("lead_score", ""),
+            "reports_folder_link": lead_state.get("reports_folder_link", ""),
+            "custom_outreach_report_link": lead_state.get("custom_outreach_report_link", "")
+        }
+
+    @staticmethod
+    def _node(func, afunc=None, name=None):
+        """
+        Node wrapped in a timing span (see `src.instrumentation`). With `afunc`, the node
+        runs `func` on `invoke` and the native coroutine `afunc` on `ainvoke`.
+        """
+        name = name or func.__name__
+        if afunc is None:
+            return traced_node(func, name)
+        return RunnableLambda(traced_node(func, name), afunc=traced_node(afunc, name), name=name)
\ No newline at end of file
@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import inspect
+import functools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Estimated USD price per 1K tokens: (prompt, completion)
+MODEL_PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4": (0.03, 0.06),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gemini-1.5-pro": (0.00125, 0.005),
+    "gemini-1.5-flash": (0.000075, 0.0003),
+}
+
+# Metrics summed up in summaries
+SPAN_METRICS = ["prompt_tokens", "completion_tokens", "cost_usd", "bytes_fetched", "cache_hits"]
+
+INSTRUMENTATION_CONFIG = {
+    "max_spans": 50_000,  # spans kept in memory for the run summary, the oldest are dropped first
+}
+
+_spans = deque(maxlen=INSTRUMENTATION_CONFIG["max_spans"])
+_dropped_spans = 0
+_spans_lock = threading.Lock()
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def configure_instrumentation(**settings):
+    """
+    Update the instrumentation settings.
+
+    @param settings: Any of max_spans.
+    """
+    global _spans, _dropped_spans
+    unknown = set(settings) - set(INSTRUMENTATION_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown instrumentation settings: {', '.join(sorted(unknown))}")
+    with _spans_lock:
+        INSTRUMENTATION_CONFIG.update(settings)
+        _dropped_spans += max(0, len(_spans) - INSTRUMENTATION_CONFIG["max_spans"])
+        _spans = deque(_spans, maxlen=INSTRUMENTATION_CONFIG["max_spans"])
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """Estimated dollar cost of an LLM call, 0 for models without a known price."""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+@contextmanager
+def span(name, kind="tool", lead_id=None):
+    """
+    Time a unit of work. Spans opened inside another span (e.g. an LLM call inside
+    a node) inherit its lead and node, so costs can be attributed per lead/node.
+    Spans opened inside another non-node span are flagged `nested`, their time is
+    already part of the enclosing span.
+    """
+    parent = _current_span.get()
+    current = {
+        "name": name,
+        "kind": kind,
+        "lead_id": lead_id or (parent["lead_id"] if parent else None),
+        "node": name if kind == "node" else (parent["node"] if parent else None),
+        "nested": parent is not None and parent["kind"] != "node",
+        "started_at": time.time(),
+        "wall_time": 0.0,
+        "error": None,
+    }
+    current.update({metric: 0 for metric in SPAN_METRICS})
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current["wall_time"] = time.perf_counter() - start
+        _current_span.reset(token)
+        _keep(current)
+
+
+def _keep(finished_span):
+    global _dropped_spans
+    with _spans_lock:
+        if len(_spans) == _spans.maxlen:
+            _dropped_spans += 1
+        _spans.append(finished_span)
+
+
+def record(**metrics):
+    """Add metrics (tokens, bytes_fetched, cache_hits...) to the current span."""
+    current = _current_span.get()
+    if current is None:
+        return
+    for metric, value in metrics.items():
+        current[metric] = current.get(metric, 0) + value
+
+
+def record_llm_usage(model, prompt_tokens, completion_tokens):
+    record(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cost_usd=estimate_cost(model, prompt_tokens, completion_tokens)
+    )
+
+
+def traced(name=None, kind="tool"):
+    """Decorator wrapping every call of a sync or async function in a span."""
+    def decorator(func):
+        span_name = name or func.__name__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _lead_id_from_state(state):
+    lead = state.get("current_lead") if isinstance(state, dict) else None
+    return getattr(lead, "id", None) or None
+
+
+def traced_node(func, name=None):
+    """Wrap a graph node (sync or async) in a `node` span tagged with the current lead."""
+    node_name = name or func.__name__
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, *args, **kwargs):
+            with span(node_name, "node", lead_id=_lead_id_from_state(state)):
+                return await func(state, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, *args, **kwargs):
+        with span(node_name, "node", lead_id=_lead_id_from_state(state)):
+            return func(state, *args, **kwargs)
+    return wrapper
+
+
+def get_spans():
+    with _spans_lock:
+        return list(_spans)
+
+
+def get_dropped_span_count():
+    """Spans dropped since the last reset because more than `max_spans` were recorded."""
+    with _spans_lock:
+        return _dropped_spans
+
+
+def reset_instrumentation():
+    global _dropped_spans
+    with _spans_lock:
+        _spans.clear()
+        _dropped_spans = 0
+
+
+def _aggregate(spans, include_nested=False):
+    """Sum the metrics of `spans`; wall time skips nested spans unless `include_nested`."""
+    totals = {"count": len(spans), "wall_time": 0.0}
+    totals.update({metric: 0 for metric in SPAN_METRICS})
+    for s in spans:
+        if include_nested or not s.get("nested"):
+            totals["wall_time"] += s["wall_time"]
+        for metric in SPAN_METRICS:
+            totals[metric] += s.get(metric, 0)
+    totals["wall_time"] = round(totals["wall_time"], 3)
+    totals["cost_usd"] = round(totals["cost_usd"], 6)
+    totals["errors"] = sum(1 for s in spans if s["error"])
+    return totals
+
+
+def _group(spans, key, include_nested=False):
+    groups = {}
+    for s in spans:
+        groups.setdefault(key(s), []).append(s)
+    return {name: _aggregate(group, include_nested) for name, group in groups.items()}
+
+
+def summarize_spans(spans=None):
+    """
+    Machine-readable summary of the recorded spans: totals, per span name, per node
+    and per lead. Token, cost & byte metrics come from the leaf (non-node) spans,
+    node wall times from the node spans. Total wall time only counts spans not nested
+    in another call, so work done inside a traced call isn't counted twice; per call
+    it is the time of every call of that name. Only the last `max_spans` spans are
+    kept, `dropped_spans` tells how many older ones the summary misses.
+    """
+    spans = get_spans() if spans is None else spans
+    node_spans = [s for s in spans if s["kind"] == "node"]
+    work_spans = [s for s in spans if s["kind"] != "node"]
+
+    per_node = _group(node_spans, lambda s: s["name"])
+    for node, metrics in _group(work_spans, lambda s: s["node"] or "-").items():
+        target = per_node.setdefault(node, {"count": 0, "wall_time": 0.0, "errors": 0})
+        for metric in SPAN_METRICS:
+            target[metric] = metrics[metric]
+
+    per_lead = {}
+    for lead_id, metrics in _group(node_spans, lambda s: s["lead_id"] or "-").items():
+        per_lead[lead_id] = {"node_wall_time": metrics["wall_time"], "nodes": metrics["count"]}
+    for lead_id, metrics in _group(work_spans, lambda s: s["lead_id"] or "-").items():
+        lead = per_lead.setdefault(lead_id, {"node_wall_time": 0.0, "nodes": 0})
+        for metric in SPAN_METRICS:
+            lead[metric] = metrics[metric]
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "dropped_spans": get_dropped_span_count(),
+        "totals": _aggregate(work_spans),
+        "per_call": _group(work_spans, lambda s: s["name"], include_nested=True),
+        "per_node": per_node,
+        "per_lead": per_lead,
+    }
+
+
+def write_run_summary(path, spans=None):
+    """Write the run summary as JSON and return it."""
+    summary = summarize_spans(spans)
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def format_run_table(summary=None):
+    """Per-lead/per-node table of wall time, tokens, cost, bytes & cache hits."""
+    summary = summary or summarize_spans()
+    header = f"{'lead / node':<45}{'calls':>7}{'wall s':>10}{'tokens':>10}{'cost $':>10}{'KB':>10}{'cache':>7}"
+    lines = [header, "-" * len(header)]
+
+    lead_nodes = {}
+    for s in get_spans():
+        if s["kind"] == "node" or s["node"] is None:
+            continue
+        lead_nodes.setdefault(s["lead_id"] or "-", {}).setdefault(s["node"], []).append(s)
+    node_times = {}
+    for s in get_spans():
+        if s["kind"] == "node":
+            key = (s["lead_id"] or "-", s["name"])
+            node_times[key] = node_times.get(key, 0.0) + s["wall_time"]
+
+    def row(label, calls, wall_time, metrics):
+        tokens = metrics.get("prompt_tokens", 0) + metrics.get("completion_tokens", 0)
+        return (
+            f"{label[:44]:<45}{calls:>7}{wall_time:>10.2f}{tokens:>10}"
+            f"{metrics.get('cost_usd', 0):>10.4f}{metrics.get('bytes_fetched', 0) / 1024:>10.1f}{metrics.get('cache_hits', 0):>7}"
+        )
+
+    for lead_id, lead in summary["per_lead"].items():
+        lines.append(row(f"lead {lead_id}", lead["nodes"], lead["node_wall_time"], lead))
+        for node, spans in sorted(lead_nodes.get(lead_id, {}).items()):
+            metrics = _aggregate(spans)
+            lines.append(row(f"  {node}", metrics["count"], node_times.get((lead_id, node), metrics["wall_time"]), metrics))
+    totals = summary["totals"]
+    lines.append("-" * len(header))
+    lines.append(row("total (calls)", totals["count"], totals["wall_time"], totals))
+    if summary.get("dropped_spans"):
+        lines.append(f"{summary['dropped_spans']} older spans were dropped (over INSTRUMENTATION_CONFIG['max_spans'])")
+    return "\n".join(lines)
@@ -1,16 +1,20 @@
 from colorama import Fore, Style
-from .tools.base.markdown_scraper_tool import scrape_website_to_markdown
-from .tools.base.search_tools import get_recent_news, google_search
+from .tools.base.website_crawler import crawl_website_to_markdown
+from .tools.base.blog_discovery import collect_recent_blog_posts
+from .tools.base.search_tools import get_recent_news, google_search, google_search_many
 from .tools.base.gmail_tools import GmailTools
 from .tools.google_docs_tools import GoogleDocsManager
-from .tools.lead_research import research_lead_on_linkedin
-from .tools.company_research import research_lead_company, generate_company_profile
+from .tools.lead_research import research_lead_on_linkedin, prefetch_linkedin_searches
+from .tools.company_research import research_lead_company, structure_company_profile, generate_company_profile
+from .tools.base.linkedin_tools import scrape_linkedin_many
 from .tools.youtube_tools import get_youtube_stats
 from .tools.rag_tool import fetch_similar_case_study
 from .prompts import *
-from .state import LeadData, CompanyData, Report, GraphInputState, GraphState
+from langgraph.types import Send
+from langgraph.graph import END
+from .state import LeadData, CompanyData, Report, GraphInputState, GraphState, BatchGraphState, new_lead_state
 from .structured_outputs import WebsiteData, EmailResponse
-from .utils import invoke_llm, get_report, get_current_date, save_reports_locally
+from .utils import invoke_llm, ainvoke_llm, get_report, get_current_date, save_reports_locally
 
 # Enable or disable sending emails directly using GMAIL
 # Should be confident about the quality of the email
@@ -25,6 +29,29 @@ SAVE_TO_GOOGLE_DOCS = True
 INDUSTRY_RESEARCH_MODE = True  # Set to True to find new companies by industry
 STOP_AFTER_FIRST_QUALIFIED = True  # Stop after first qualified company
 
+# Cheap pre-qualification right after the LinkedIn data is fetched: leads scoring
+# below the threshold skip website/blog/news research and go straight to the CRM update
+PREQUALIFY_LEADS = False
+PREQUALIFICATION_THRESHOLD = 3.0
+# Companies with fewer employees than this are penalized by the local heuristics
+PREQUALIFICATION_MIN_EMPLOYEES = 10
+# Work skipped per pre-disqualified lead (website, company profile, lead report, blog,
+# youtube, news, digital presence, global report & scoring calls / website, blog & news fetches)
+RESEARCH_LLM_CALLS_PER_LEAD = 9
+RESEARCH_FETCHES_PER_LEAD = 3
+
+# Query variants used to discover companies of an industry, each one is paged through
+# up to DISCOVERY_MAX_PAGES result pages before moving on to the next variant
+INDUSTRY_DISCOVERY_QUERIES = [
+    '"{industry}" companies {exclude_terms} site:linkedin.com/company/',
+    '"{industry}" startup {exclude_terms} site:linkedin.com/company/',
+    '"{industry}" solutions provider {exclude_terms} site:linkedin.com/company/',
+    '"{industry}" software company {exclude_terms} site:linkedin.com/company/',
+]
+DISCOVERY_MAX_PAGES = 5
+# Where the position reached in every industry's results is saved between runs
+DISCOVERY_CURSORS_FILE = "industry_discovery_cursors.json"
+
 # In src/nodes.py or wherever appropriate
 INDUSTRIES_TO_RESEARCH = [
     "Healthcare",
@@ -38,8 +65,11 @@ INDUSTRIES_TO_RESEARCH = [
 ]
 
 # Import random at the top of the file
+import re
 import random
 import time
+import asyncio
+import threading
 import os
 import json
 from datetime import datetime
@@ -50,11 +80,30 @@ random.seed(time.time())
 class OutReachAutomationNodes:
     def __init__(self, loader, existing_clients_sheet_id=None):
         self.lead_loader = loader
+        # Google clients are shared (see tools/base/google_services.py) and built on first use
         self.docs_manager = GoogleDocsManager()
-        self.drive_folder_name = ""
+        self.gmail = GmailTools()
         
         # Initialize processed companies logging
+        # (guarded by a lock since leads can be processed concurrently in batch mode)
         self.processed_companies_file = "processed_companies.json"
+        self._processed_companies_lock = threading.RLock()
+        
+        # Position reached in each industry's discovery searches (see `_next_industry_company`)
+        self.discovery_cursors_file = DISCOVERY_CURSORS_FILE
+        self._discovery_cursors_lock = threading.Lock()
+        self.discovery_cursors = self._load_discovery_cursors()
+        
+        # Counters for the pre-qualification gate
+        self.prequalification_stats = {
+            "checked": 0,
+            "skipped": 0,
+            "skipped_by_heuristics": 0,
+            "skipped_by_llm": 0,
+            "llm_calls_saved": 0,
+            "fetches_saved": 0
+        }
+        self._prequalification_lock = threading.Lock()
         self.processed_companies = self._load_processed_companies()
         
         # Load existing clients from Google Sheets if sheet ID provided
@@ -109,7 +158,10 @@ class OutReachAutomationNodes:
             print(f"Warning: Could not save processed companies log: {e}")
 
     def _add_processed_company(self, company_name, industry=None, linkedin_url=None):
-        """Add a company to the processed companies log"""
+        """
+        Add a company to the processed companies log.
+        Returns True if the company was added, False if it was already logged.
+        """
         company_info = {
             'name': company_name,
             'industry': industry,
@@ -117,16 +169,35 @@ class OutReachAutomationNodes:
             'processed_date': datetime.now().isoformat()
         }
         
-        # Check if company already exists (case-insensitive)
-        normalized_name = company_name.lower().strip()
-        existing_names = [c['name'].lower().strip() for c in self.processed_companies]
-        
-        if normalized_name not in existing_names:
+        with self._processed_companies_lock:
+            # Check if company already exists (case-insensitive)
+            if self._is_company_processed(company_name):
+                print(f"Company {company_name} already in processed log")
+                return False
             self.processed_companies.append(company_info)
             self._save_processed_companies()
-            print(f"Added {company_name} to processed companies log")
-        else:
-            print(f"Company {company_name} already in processed log")
+        print(f"Added {company_name} to processed companies log")
+        return True
+
+    def _load_discovery_cursors(self):
+        """Load the per-industry discovery cursors from JSON file"""
+        try:
+            if os.path.exists(self.discovery_cursors_file):
+                with open(self.discovery_cursors_file, 'r') as f:
+                    return json.load(f).get('cursors', {})
+        except Exception as e:
+            print(f"Warning: Could not load industry discovery cursors: {e}")
+        return {}
+
+    def _save_discovery_cursor(self, industry, cursor):
+        """Persist the discovery cursor of an industry"""
+        with self._discovery_cursors_lock:
+            self.discovery_cursors[industry] = {**cursor, 'updated_at': datetime.now().isoformat()}
+            try:
+                with open(self.discovery_cursors_file, 'w') as f:
+                    json.dump({'last_updated': datetime.now().isoformat(), 'cursors': self.discovery_cursors}, f, indent=2)
+            except Exception as e:
+                print(f"Warning: Could not save industry discovery cursors: {e}")
 
     def _is_company_processed(self, company_name):
         """Check if a company has already been processed"""
@@ -210,6 +281,10 @@ class OutReachAutomationNodes:
         ]
         
         print(Fore.YELLOW + f"----- Fetched {len(leads)} leads -----\n" + Style.RESET_ALL)
+        
+        # Run the LinkedIn searches of all leads in batched Serper requests up front,
+        # each lead's research then reads its results from the search cache
+        prefetch_linkedin_searches(leads)
         return {"leads_data": leads, "number_leads": len(leads)}
     
     def _get_industry_research_leads(self, state: GraphInputState):
@@ -259,15 +334,27 @@ class OutReachAutomationNodes:
         print(Fore.YELLOW + f"----- Created {len(leads)} industry research tasks -----\n" + Style.RESET_ALL)
         return {"leads_data": leads, "number_leads": len(leads)}
     
+    @staticmethod
+    def dispatch_leads(state: BatchGraphState):
+        """Fan out every fetched lead to its own independent lead research run."""
+        leads = state["leads_data"]
+        if not leads:
+            print(Fore.GREEN + "----- Finished, No leads to process -----\n" + Style.RESET_ALL)
+            return END
+        print(Fore.YELLOW + f"----- Dispatching {len(leads)} leads -----\n" + Style.RESET_ALL)
+        return [Send("process_lead", new_lead_state(lead)) for lead in leads]
+
     @staticmethod
     def check_for_remaining_leads(state: GraphState):
         """Checks for remaining leads and updates lead_data in the state."""
         print(Fore.YELLOW + "----- Checking for remaining leads -----\n" + Style.RESET_ALL)
         
+        # Return the remaining leads as well, so checkpoints never replay a finished lead
+        leads_data = list(state["leads_data"])
         current_lead = None
-        if state["leads_data"]:
-            current_lead = state["leads_data"].pop()
-        return {"current_lead": current_lead}
+        if leads_data:
+            current_lead = leads_data.pop()
+        return {"current_lead": current_lead, "leads_data": leads_data}
 
     @staticmethod
     def check_if_there_more_leads(state: GraphState):
@@ -309,14 +396,14 @@ class OutReachAutomationNodes:
         company_data.name = str(company_name) if company_name is not None else ""
         company_data.website = str(company_website) if company_website is not None else ""
         company_data.profile = str(company_profile) if company_profile is not None else ""
+        company_data.linkedin_data = company_profile if isinstance(company_profile, dict) else {}
             
-        # Update folder name for saving reports in Drive
-        self.drive_folder_name = f"{lead_data.name}_{company_data.name}"
-        
         return {
             "current_lead": lead_data,
             "company_data": company_data,
-            "reports": []
+            "reports": [],
+            # Folder name for saving reports in Drive
+            "drive_folder_name": f"{lead_data.name}_{company_data.name}"
         }
     
     def _fetch_industry_company_data(self, state: GraphState):
@@ -326,121 +413,81 @@ class OutReachAutomationNodes:
         industry = lead_data.profile  # We stored industry here
         company_data = state.get("company_data", CompanyData())
         
-        # Search for companies in this industry, excluding existing clients
-        # Limit exclusion to top 30 clients to avoid overly long queries
-        exclude_terms = " ".join([f'-"{client}"' for client in self.existing_clients[:10]])
-        search_query = f'"{industry}" companies {exclude_terms} site:linkedin.com/company/'
-        print(f"Searching: {search_query}")
-        
-        search_results = google_search(search_query)
-        print(f"Google search query: {search_query}")
-        print(f"Number of search results: {len(search_results)}")
-        for i, result in enumerate(search_results[:5]):
-            print(f"Result {i}: {result}")
-        
-        # More robust company name comparison
-        def normalize(name):
-            return name.lower().replace("inc.", "").replace("ltd.", "").replace("corp.", "").strip()
-
-        target_company = None
-        for result in search_results[:30]:
-            link = result.get('link', '')
-            title = result.get('title', '')
-            company_name = title.split(' | ')[0].strip()
-            if '/company/' in link:
-                # Check against existing clients
-                if any(normalize(client) == normalize(company_name) for client in self.existing_clients):
-                    print(f"Skipping existing client: {company_name}")
-                    continue
-                
-                # Check against previously processed companies
-                if self._is_company_processed(company_name):
-                    print(f"Skipping previously processed company: {company_name}")
-                    continue
-                
-                # Found a new company!
-                target_company = {
-                    'name': company_name,
-                    'linkedin_url': link,
-                    'snippet': result.get('snippet', '')
-                }
-                print(f"Found new unprocessed company: {company_name}")
-                break
+        # Search for companies in this industry, excluding existing clients,
+        # resuming from where the previous runs stopped
+        search_failed = False
+        try:
+            target_company = self._next_industry_company(industry)
+        except ConnectionError as e:
+            print(f"Industry search failed, will retry from the same place next run: {e}")
+            target_company, search_failed = None, True
         
         if target_company:
             print(f"Found new company: {target_company['name']}")
             
-            # Add company to processed log immediately to avoid reprocessing
-            self._add_processed_company(
-                company_name=target_company['name'],
-                industry=industry,
-                linkedin_url=target_company['linkedin_url']
-            )
-            
-            # Research the company
-            company_profile = research_lead_company(target_company['linkedin_url'])
-            
-            # Now find decision makers at this company
+            # Find decision makers at this company and its official website,
+            # both searches go out in a single Serper round-trip
             dm_query = f'site:linkedin.com/in/ "{target_company["name"]}" ("CEO" OR "CTO" OR "CMO" OR "VP Marketing" OR "Head of Marketing")'
-            dm_results = google_search(dm_query)
+            website_query = f'"{target_company["name"]}" official website'
+            dm_results, website_results = google_search_many([dm_query, website_query])
             
             # Extract first decision maker
-            if dm_results:
-                # Use the simpler extraction method instead of invoking LLM
-                dm_linkedin_url = ""
-                for result in dm_results:
-                    if 'linkedin.com/in/' in result.get('link', ''):
-                        dm_linkedin_url = result['link']
-                        break
-                
-                if dm_linkedin_url:
-                    # Scrape decision maker profile
-                    from .tools.base.linkedin_tools import scrape_linkedin
-                    dm_data = scrape_linkedin(dm_linkedin_url)
-                    
-                    if dm_data and "data" in dm_data:
-                        profile_data = dm_data["data"]
-                        lead_data.name = profile_data.get('full_name', 'Decision Maker')
-                        # Try to get public email from LinkedIn profile
-                        public_email = profile_data.get('email')
-                        if public_email and isinstance(public_email, str) and '@' in public_email:
-                            lead_data.email = public_email
-                            print(f"Found public email for decision maker: {public_email}")
-                            # Send email if feature is enabled
-                            if SEND_EMAIL_TO_LINKEDIN_PERSON:
-                                from .tools.base.gmail_tools import GmailTools
-                                gmail = GmailTools()
-                                # Generate a simple subject and message, or use your existing email generation logic
-                                subject = f"Hello {lead_data.name}"
-                                email_content = f"Hi {lead_data.name},\n\nI came across your profile and wanted to connect regarding potential collaboration.\n\nBest regards,\n[Your Name]"
-                                gmail.create_draft_email(
+            # Use the simpler extraction method instead of invoking LLM
+            dm_linkedin_url = ""
+            for result in dm_results:
+                if 'linkedin.com/in/' in result.get('link', ''):
+                    dm_linkedin_url = result['link']
+                    break
+            
+            # Research the company and scrape the decision maker profile concurrently
+            company_page, dm_data = scrape_linkedin_many([
+                (target_company['linkedin_url'], True),
+                (dm_linkedin_url, False)
+            ])
+            company_profile = structure_company_profile(company_page)
+            
+            if dm_linkedin_url:
+                if dm_data and "data" in dm_data:
+                    profile_data = dm_data["data"]
+                    lead_data.name = profile_data.get('full_name', 'Decision Maker')
+                    # Try to get public email from LinkedIn profile
+                    public_email = profile_data.get('email')
+                    if public_email and isinstance(public_email, str) and '@' in public_email:
+                        lead_data.email = public_email
+                        print(f"Found public email for decision maker: {public_email}")
+                        # Send email if feature is enabled
+                        if SEND_EMAIL_TO_LINKEDIN_PERSON:
+                            gmail = self.gmail
+                            # Generate a simple subject and message, or use your existing email generation logic
+                            subject = f"Hello {lead_data.name}"
+                            email_content = f"Hi {lead_data.name},\n\nI came across your profile and wanted to connect regarding potential collaboration.\n\nBest regards,\n[Your Name]"
+                            gmail.create_draft_email(
+                                recipient=public_email,
+                                subject=subject,
+                                email_content=email_content
+                            )
+                            if SEND_EMAIL_DIRECTLY:
+                                gmail.send_email(
                                     recipient=public_email,
                                     subject=subject,
                                     email_content=email_content
                                 )
-                                if SEND_EMAIL_DIRECTLY:
-                                    gmail.send_email(
-                                        recipient=public_email,
-                                        subject=subject,
-                                        email_content=email_content
-                                    )
-                                    print(f"Email sent directly to {public_email}")
-                        else:
-                            # Fallback to default email if no public email found
-                            company_name_clean = target_company['name'].lower().replace(' ', '').replace(',', '').replace('.', '').replace('&', 'and')
-                            lead_data.email = "jadorant@villanova.edu"  # Change this to your actual email
-                        lead_data.profile = f"{profile_data.get('headline', '')}. {profile_data.get('about', '')}"
-                    # Store decision maker LinkedIn URL
-                    company_data.decision_maker_linkedin = dm_linkedin_url
+                                print(f"Email sent directly to {public_email}")
+                    else:
+                        # Fallback to default email if no public email found
+                        company_name_clean = target_company['name'].lower().replace(' ', '').replace(',', '').replace('.', '').replace('&', 'and')
+                        lead_data.email = "jadorant@villanova.edu"  # Change this to your actual email
+                    lead_data.profile = f"{profile_data.get('headline', '')}. {profile_data.get('about', '')}"
+                # Store decision maker LinkedIn URL
+                company_data.decision_maker_linkedin = dm_linkedin_url
             
             # Update company data
             company_data.name = target_company['name']
             company_data.profile = str(company_profile) if company_profile else target_company['snippet']
+            company_data.linkedin_data = company_profile if isinstance(company_profile, dict) else {}
             company_data.linkedin_url = target_company['linkedin_url']
             
             # Try to find company website
-            website_query = f'"{target_company["name"]}" official website'
-            website_results = google_search(website_query)
             if website_results:
                 # Look for non-LinkedIn, non-social media links
                 for result in website_results:
@@ -449,27 +496,203 @@ class OutReachAutomationNodes:
                         company_data.website = link
                         break
         else:
-            print(f"No new companies found in {industry} industry")
-            # Add a marker to avoid repeatedly searching this industry
-            self._add_processed_company(
-                company_name=f"INDUSTRY_EXHAUSTED_{industry}",
-                industry=industry,
-                linkedin_url=None
-            )
+            if not search_failed:
+                print(f"No new companies found in {industry} industry")
+                # Add a marker to avoid repeatedly searching this industry
+                self._add_processed_company(
+                    company_name=f"INDUSTRY_EXHAUSTED_{industry}",
+                    industry=industry,
+                    linkedin_url=None
+                )
             # Create placeholder data
             lead_data.name = f"Research Lead - {industry}"
             company_data.name = f"New {industry} Company"
             company_data.profile = f"Potential company in the {industry} industry"
         
-        # Update folder name for saving reports in Drive
-        self.drive_folder_name = f"{industry}_{company_data.name}"
-        
         return {
             "current_lead": lead_data,
             "company_data": company_data,
-            "reports": []
+            "reports": [],
+            # Folder name for saving reports in Drive
+            "drive_folder_name": f"{industry}_{company_data.name}"
         }
     
+    def _next_industry_company(self, industry):
+        """
+        Page through the industry's discovery queries until a new company is found.
+        The cursor (query variant, result page & position in the page) is saved after
+        every step, so later runs resume there and result pages that were fully
+        consumed are never requested again.
+        
+        @return: The new company (name, linkedin_url, snippet), or None once every query is exhausted.
+        Raises ConnectionError when a search fails: the cursor is left where it was, a failed
+        request must not count as an empty result page.
+        """
+        # Limit exclusion to the top 10 clients to avoid overly long queries
+        exclude_terms = " ".join([f'-"{client}"' for client in self.existing_clients[:10]])
+        
+        # More robust company name comparison
+        def normalize(name):
+            return name.lower().replace("inc.", "").replace("ltd.", "").replace("corp.", "").strip()
+        
+        cursor = dict(self.discovery_cursors.get(industry) or {"query": 0, "page": 1, "offset": 0})
+        while cursor["query"] < len(INDUSTRY_DISCOVERY_QUERIES):
+            search_query = INDUSTRY_DISCOVERY_QUERIES[cursor["query"]].format(industry=industry, exclude_terms=exclude_terms)
+            print(f"Searching: {search_query} (page {cursor['page']}, from result {cursor['offset']})")
+            search_results = google_search(search_query, page=cursor["page"])
+            if search_results is None:
+                raise ConnectionError(f"Search failed for: {search_query}")
+            print(f"Number of search results: {len(search_results)}")
+            
+            for position in range(cursor["offset"], len(search_results)):
+                result = search_results[position]
+                link = result.get('link', '')
+                title = result.get('title', '')
+                company_name = title.split(' | ')[0].strip()
+                if '/company/' not in link:
+                    continue
+                # Check against existing clients
+                if any(normalize(client) == normalize(company_name) for client in self.existing_clients):
+                    print(f"Skipping existing client: {company_name}")
+                    continue
+                
+                # Check against previously processed companies and add the company
+                # to the processed log immediately to avoid reprocessing
+                if not self._add_processed_company(company_name, industry=industry, linkedin_url=link):
+                    print(f"Skipping previously processed company: {company_name}")
+                    continue
+                
+                # Found a new company! The next run starts right after it
+                print(f"Found new unprocessed company: {company_name}")
+                self._save_discovery_cursor(industry, {**cursor, "offset": position + 1})
+                return {
+                    'name': company_name,
+                    'linkedin_url': link,
+                    'snippet': result.get('snippet', '')
+                }
+            
+            # Page fully consumed: move to the next page, or to the next query variant
+            # when there are no more results (or the page limit is reached)
+            if search_results and cursor["page"] < DISCOVERY_MAX_PAGES:
+                cursor = {"query": cursor["query"], "page": cursor["page"] + 1, "offset": 0}
+            else:
+                cursor = {"query": cursor["query"] + 1, "page": 1, "offset": 0}
+            self._save_discovery_cursor(industry, cursor)
+        return None
+    
+    def prequalify_lead(self, state: GraphState):
+        """
+        Cheap early scoring from the LinkedIn company profile: local heuristics first,
+        then a short LLM prompt. Clearly unqualified leads skip the research phase.
+        """
+        if not PREQUALIFY_LEADS:
+            return {"lead_score": ""}
+        print(Fore.YELLOW + "----- Pre-qualifying lead -----\n" + Style.RESET_ALL)
+        
+        lead_data = state["current_lead"]
+        company_data = state["company_data"]
+        
+        # Local heuristics are free, only ask the LLM when they don't rule the lead out
+        score = self._heuristic_prequalification_score(company_data.linkedin_data)
+        skipped_by = "heuristics"
+        if score is None or score >= PREQUALIFICATION_THRESHOLD:
+            inputs = f"""
+            # **Lead Profile:**
+
+            {lead_data.profile}
+
+            # **Company LinkedIn Profile:**
+
+            {company_data.linkedin_data or company_data.profile}
+            """
+            llm_score = invoke_llm(
+                system_prompt=PREQUALIFY_LEAD_PROMPT,
+                user_message=inputs,
+                model="gpt-3.5-turbo",
+                llm_provider="openai",
+                max_tokens=2000
+            )
+            score = self._parse_score(llm_score, default=PREQUALIFICATION_THRESHOLD)
+            skipped_by = "llm"
+        
+        is_prequalified = score >= PREQUALIFICATION_THRESHOLD
+        with self._prequalification_lock:
+            stats = self.prequalification_stats
+            stats["checked"] += 1
+            if not is_prequalified:
+                stats["skipped"] += 1
+                stats[f"skipped_by_{skipped_by}"] += 1
+                stats["llm_calls_saved"] += RESEARCH_LLM_CALLS_PER_LEAD
+                stats["fetches_saved"] += RESEARCH_FETCHES_PER_LEAD
+        
+        print(f"Pre-qualification score for {company_data.name}: {score:.1f} (threshold {PREQUALIFICATION_THRESHOLD})")
+        if is_prequalified:
+            # Clear any score left by a previous lead, the full scoring happens after research
+            return {"lead_score": ""}
+        
+        print(Fore.RED + f"Lead is clearly not qualified, skipping research ({skipped_by})\n" + Style.RESET_ALL)
+        print(f"Pre-qualification stats: {self.prequalification_stats}")
+        # No reports are generated for this lead: don't let the CRM update pick up
+        # the links of the previous lead (sequential mode shares one state)
+        return {"lead_score": f"{score:.1f}", "reports_folder_link": "", "custom_outreach_report_link": ""}
+    
+    @staticmethod
+    def check_if_prequalified(state: GraphState):
+        """Route leads rejected by `prequalify_lead` (they already have a lead score) to the CRM update."""
+        if PREQUALIFY_LEADS and state.get("lead_score"):
+            return "skip research"
+        return "research"
+    
+    @staticmethod
+    def _heuristic_prequalification_score(linkedin_data):
+        """
+        Score a company from 0 to 10 from its LinkedIn profile (employee count, industries),
+        or return None when there is no LinkedIn data to judge from.
+        """
+        if not linkedin_data:
+            return None
+        
+        score = 5.0
+        employee_count = OutReachAutomationNodes._parse_employee_count(linkedin_data.get("employee_count"))
+        if employee_count is not None:
+            if employee_count < PREQUALIFICATION_MIN_EMPLOYEES:
+                score -= 3
+            elif employee_count >= 50:
+                score += 1
+        
+        # Companies in (or close to) one of our target industries are more promising
+        industries = linkedin_data.get("industries") or []
+        if isinstance(industries, str):
+            industries = [industries]
+        company_text = " ".join(
+            [str(industry) for industry in industries]
+            + [str(linkedin_data.get("specialties", "")), str(linkedin_data.get("description", ""))]
+        ).lower()
+        if any(industry.lower() in company_text for industry in INDUSTRIES_TO_RESEARCH):
+            score += 2
+        if not linkedin_data.get("description"):
+            score -= 1
+        return max(0.0, min(10.0, score))
+    
+    @staticmethod
+    def _parse_employee_count(employee_count):
+        """Parse LinkedIn employee counts such as 120, "120" or "51-200" (lower bound)."""
+        if isinstance(employee_count, (int, float)):
+            return int(employee_count)
+        match = re.search(r"\d[\d,]*", str(employee_count or ""))
+        return int(match.group().replace(",", "")) if match else None
+    
+    @staticmethod
+    def _parse_score(raw_score, default=0.0):
+        """Extract the first number from an LLM score answer."""
+        match = re.search(r"\d+(?:\.\d+)?", str(raw_score))
+        return float(match.group()) if match else default
+    
+    def get_prequalification_stats(self):
+        """Return how many leads the pre-qualification gate checked and skipped, and the work saved."""
+        with self._prequalification_lock:
+            return dict(self.prequalification_stats)
+    
     def review_company_website(self, state: GraphState):
         print(Fore.YELLOW + "----- Scraping company website -----\n" + Style.RESET_ALL)
         lead_data = state.get("current_lead")
@@ -478,8 +701,8 @@ class OutReachAutomationNodes:
         company_website = company_data.website
         if company_website:
             try:
-                # Scrape company website with improved error handling
-                content = scrape_website_to_markdown(company_website, max_length=30000)
+                # Homepage + about/products/solutions/blog/careers pages, fetched concurrently
+                content = crawl_website_to_markdown(company_website, max_length=30000)
                 print(f"Scraped content length: {len(content)} characters")
                 
                 try:
@@ -492,60 +715,23 @@ class OutReachAutomationNodes:
                         max_tokens=10000  # Reduced token limit
                     )
                 except Exception as e:
-                    print(f"Structured output failed, using text response: {e}")
-                    # Fallback to text response without structured output
-                    try:
-                        website_info_text = invoke_llm(
-                            system_prompt=WEBSITE_ANALYSIS_PROMPT.format(main_url=company_website), 
-                            user_message=content,
-                            model="gpt-3.5-turbo",
-                            llm_provider="openai",
-                            max_tokens=8000  # Further reduced for fallback
-                        )
-                    except Exception as fallback_error:
-                        print(f"Fallback also failed: {fallback_error}")
-                        # Create minimal website info
-                        website_info_text = f"Unable to analyze website content for {company_website}. Error: {fallback_error}"
-                    
-                    # Create a mock WebsiteData from text response
-                    website_info = {
-                        "summary": website_info_text[:500] if isinstance(website_info_text, str) else "",
-                        "blog_url": "",
-                        "facebook": "",
-                        "twitter": "",
-                        "youtube": ""
-                    }
+                    print(f"Structured website analysis failed, using scraped content as summary: {e}")
+                    # No second LLM round-trip: the company profile step summarizes the raw content
+                    website_info = WebsiteData(summary=content[:4000]).model_dump()
             except Exception as scraping_error:
                 print(f"Website scraping failed: {scraping_error}")
-                website_info = {
-                    "summary": f"Unable to scrape website {company_website}. Error: {scraping_error}",
-                    "blog_url": "",
-                    "facebook": "",
-                    "twitter": "",
-                    "youtube": ""
-                }
+                website_info = WebsiteData(
+                    summary=f"Unable to scrape website {company_website}. Error: {scraping_error}"
+                ).model_dump()
             # Extract all relevant links, ensuring they are strings (not None)
             def safe_str(val):
                 return str(val) if val is not None else ""
-            if isinstance(website_info, dict):
-                company_data.social_media_links.blog = safe_str(website_info.get("blog_url"))
-                company_data.social_media_links.facebook = safe_str(website_info.get("facebook"))
-                company_data.social_media_links.twitter = safe_str(website_info.get("twitter"))
-                company_data.social_media_links.youtube = safe_str(website_info.get("youtube"))
-            else:
-                company_data.social_media_links.blog = safe_str(getattr(website_info, "blog_url", None))
-                company_data.social_media_links.facebook = safe_str(getattr(website_info, "facebook", None))
-                company_data.social_media_links.twitter = safe_str(getattr(website_info, "twitter", None))
-                company_data.social_media_links.youtube = safe_str(getattr(website_info, "youtube", None))
+            company_data.social_media_links.blog = safe_str(website_info.get("blog_url"))
+            company_data.social_media_links.facebook = safe_str(website_info.get("facebook"))
+            company_data.social_media_links.twitter = safe_str(website_info.get("twitter"))
+            company_data.social_media_links.youtube = safe_str(website_info.get("youtube"))
             # Update company profile with website summary
-            # Safely extract summary from website_info, handling dict, BaseModel, or str
-            summary = ""
-            if isinstance(website_info, dict):
-                summary = website_info.get("summary", "")
-            elif hasattr(website_info, "summary"):
-                summary = getattr(website_info, "summary", "")
-            elif isinstance(website_info, str):
-                summary = website_info
+            summary = safe_str(website_info.get("summary"))
             company_data.profile = str(generate_company_profile(company_data.profile, summary))
                  
         inputs = f"""
@@ -595,86 +781,133 @@ class OutReachAutomationNodes:
     
     def analyze_blog_content(self, state: GraphState):
         print(Fore.YELLOW + "----- Analyzing company main blog -----\n" + Style.RESET_ALL)  
-        blog_analysis_report = ""
         
-        # Check if company has a blog
+        # The blog & its most recent posts are found from the website's feeds & sitemaps,
+        # the blog URL spotted by the website analysis (if any) is only a hint
         company_data = state["company_data"]
         blog_url = company_data.social_media_links.blog
-        if blog_url:
-            try:
-                blog_content = scrape_website_to_markdown(blog_url, max_length=25000)
-                print(f"Blog content length: {len(blog_content)} characters")
-                
-                from .prompts import BLOG_ANALYSIS_PROMPT  # Fix: import the missing prompt
-                prompt = BLOG_ANALYSIS_PROMPT.format(company_name=company_data.name)
-                
-                try:
-                    blog_analysis_report = invoke_llm(
-                        system_prompt=prompt, 
-                        user_message=blog_content,
-                        model="gpt-3.5-turbo",
-                        llm_provider="openai",
-                        max_tokens=8000
-                    )
-                except Exception as e:
-                    print(f"Blog analysis failed: {e}")
-                    blog_analysis_report = f"Unable to analyze blog content for {company_data.name}. Error: {e}"
-                
-                blog_analysis_report = Report(
-                    title="Blog Analysis Report",
-                    content=str(blog_analysis_report),
-                    is_markdown=True
-                )
-                
-                return {"reports": [blog_analysis_report]}
-            except Exception as scraping_error:
-                print(f"Blog scraping failed: {scraping_error}")
-                blog_analysis_report = Report(
-                    title="Blog Analysis Report",
-                    content=f"Unable to scrape blog content for {company_data.name}. Error: {scraping_error}",
-                    is_markdown=True
-                )
-                return {"reports": [blog_analysis_report]}
+        if not blog_url and not company_data.website:
+            return {"reports": []}
+        
+        try:
+            blog_content = collect_recent_blog_posts(company_data.website, blog_url, max_length=25000)
+        except Exception as scraping_error:
+            return self._blog_scraping_failed(company_data, scraping_error)
+        if not blog_content:
+            return {"reports": []}
+        print(f"Blog content length: {len(blog_content)} characters")
+        
+        try:
+            blog_analysis_report = invoke_llm(**self._blog_analysis_request(company_data, blog_content))
+        except Exception as e:
+            print(f"Blog analysis failed: {e}")
+            blog_analysis_report = f"Unable to analyze blog content for {company_data.name}. Error: {e}"
+        return self._blog_analysis_report(blog_analysis_report)
+    
+    async def aanalyze_blog_content(self, state: GraphState):
+        print(Fore.YELLOW + "----- Analyzing company main blog -----\n" + Style.RESET_ALL)  
+        
+        # The blog & its most recent posts are found from the website's feeds & sitemaps,
+        # the blog URL spotted by the website analysis (if any) is only a hint
+        company_data = state["company_data"]
+        blog_url = company_data.social_media_links.blog
+        if not blog_url and not company_data.website:
+            return {"reports": []}
+        
+        try:
+            blog_content = await asyncio.to_thread(collect_recent_blog_posts, company_data.website, blog_url, max_length=25000)
+        except Exception as scraping_error:
+            return self._blog_scraping_failed(company_data, scraping_error)
+        if not blog_content:
+            return {"reports": []}
+        print(f"Blog content length: {len(blog_content)} characters")
+        
+        try:
+            blog_analysis_report = await ainvoke_llm(**self._blog_analysis_request(company_data, blog_content))
+        except Exception as e:
+            print(f"Blog analysis failed: {e}")
+            blog_analysis_report = f"Unable to analyze blog content for {company_data.name}. Error: {e}"
+        return self._blog_analysis_report(blog_analysis_report)
+    
+    @staticmethod
+    def _blog_analysis_request(company_data, blog_content):
+        return {
+            "system_prompt": BLOG_ANALYSIS_PROMPT.format(company_name=company_data.name),
+            "user_message": blog_content,
+            "model": "gpt-3.5-turbo",
+            "llm_provider": "openai",
+            "max_tokens": 8000
+        }
+    
+    @staticmethod
+    def _blog_analysis_report(blog_analysis):
+        blog_analysis_report = Report(
+            title="Blog Analysis Report",
+            content=str(blog_analysis),
+            is_markdown=True
+        )
+        return {"reports": [blog_analysis_report]}
+    
+    @staticmethod
+    def _blog_scraping_failed(company_data, scraping_error):
+        print(f"Blog scraping failed: {scraping_error}")
+        blog_analysis_report = Report(
+            title="Blog Analysis Report",
+            content=f"Unable to scrape blog content for {company_data.name}. Error: {scraping_error}",
+            is_markdown=True
+        )
+        return {"reports": [blog_analysis_report]}
+    
     def analyze_social_media_content(self, state: GraphState):
         print(Fore.YELLOW + "----- Analyzing company social media accounts -----\n" + Style.RESET_ALL)
         
         # Load states
         company_data = state["company_data"]
         
-        # Get social media urls
-        facebook_url = company_data.social_media_links.facebook
-        twitter_url = company_data.social_media_links.twitter
+        # Check If company has Youtube channel
+        youtube_insight = None
         youtube_url = company_data.social_media_links.youtube
+        if youtube_url:
+            youtube_data = get_youtube_stats(youtube_url)
+            youtube_insight = invoke_llm(**self._youtube_analysis_request(company_data, youtube_data))
+        
+        # TODO Add Facebook & Twitter analysis part
+        return self._social_media_reports(company_data, youtube_insight)
+    
+    async def aanalyze_social_media_content(self, state: GraphState):
+        print(Fore.YELLOW + "----- Analyzing company social media accounts -----\n" + Style.RESET_ALL)
+        
+        # Load states
+        company_data = state["company_data"]
         
         # Check If company has Youtube channel
-        youtube_analysis_report = None
+        youtube_insight = None
+        youtube_url = company_data.social_media_links.youtube
         if youtube_url:
-            youtube_data = get_youtube_stats(youtube_url)
-            prompt = YOUTUBE_ANALYSIS_PROMPT.format(company_name=company_data.name)
-            youtube_insight = invoke_llm(
-                system_prompt=prompt, 
-                user_message=youtube_data,
-                model="gpt-3.5-turbo",
-                llm_provider="openai"
-            )
-            youtube_analysis_report = Report(
+            youtube_data = await asyncio.to_thread(get_youtube_stats, youtube_url)
+            youtube_insight = await ainvoke_llm(**self._youtube_analysis_request(company_data, youtube_data))
+        
+        # TODO Add Facebook & Twitter analysis part
+        return self._social_media_reports(company_data, youtube_insight)
+    
+    @staticmethod
+    def _youtube_analysis_request(company_data, youtube_data):
+        return {
+            "system_prompt": YOUTUBE_ANALYSIS_PROMPT.format(company_name=company_data.name),
+            "user_message": youtube_data,
+            "model": "gpt-3.5-turbo",
+            "llm_provider": "openai"
+        }
+    
+    @staticmethod
+    def _social_media_reports(company_data, youtube_insight):
+        reports = []
+        if youtube_insight is not None:
+            reports.append(Report(
                 title="Youtube Analysis Report",
                 content=str(youtube_insight),
                 is_markdown=True
-            )
-        if facebook_url:
-            # TODO Add Facebook analysis part
-            pass
-        
-        # Check If company has Twitter account
-        if twitter_url:
-            # TODO Add Twitter analysis part
-            pass
-        
-        reports = []
-        if youtube_analysis_report is not None:
-            reports.append(youtube_analysis_report)
-
+            ))
         return {
             "company_data": company_data,
             "reports": reports
@@ -688,28 +921,44 @@ class OutReachAutomationNodes:
         
         # Fetch recent news using serper API
         recent_news = get_recent_news(company=company_data.name)
-        number_months = 6
-        current_date = get_current_date()
-        news_analysis_prompt = NEWS_ANALYSIS_PROMPT.format(
-            company_name=company_data.name, 
-            number_months=number_months, 
-            date=current_date
-        )
+        news_insight = invoke_llm(**self._news_analysis_request(company_data, recent_news))
+        return self._news_analysis_report(news_insight)
+    
+    async def aanalyze_recent_news(self, state: GraphState):
+        print(Fore.YELLOW + "----- Analyzing recent news about company -----\n" + Style.RESET_ALL)
         
+        # Load states
+        company_data = state["company_data"]
+        
+        # Fetch recent news using serper API
+        recent_news = await asyncio.to_thread(get_recent_news, company=company_data.name)
+        news_insight = await ainvoke_llm(**self._news_analysis_request(company_data, recent_news))
+        return self._news_analysis_report(news_insight)
+    
+    @staticmethod
+    def _news_analysis_request(company_data, recent_news):
         # Craft news analysis prompt
-        news_insight = invoke_llm(
-            system_prompt=news_analysis_prompt, 
-            user_message=recent_news,
-            model="gpt-3.5-turbo",
-            llm_provider="openai"
+        news_analysis_prompt = NEWS_ANALYSIS_PROMPT.format(
+            company_name=company_data.name, 
+            number_months=6, 
+            date=get_current_date()
         )
-        
+        return {
+            "system_prompt": news_analysis_prompt,
+            "user_message": recent_news,
+            "model": "gpt-3.5-turbo",
+            "llm_provider": "openai"
+        }
+    
+    @staticmethod
+    def _news_analysis_report(news_insight):
         news_analysis_report = Report(
             title="News Analysis Report",
             content=str(news_insight),
             is_markdown=True
         )
         return {"reports": [news_analysis_report]}
+    
     def generate_digital_presence_report(self, state: GraphState):
         print(Fore.YELLOW + "----- Generate Digital presence analysis report -----\n" + Style.RESET_ALL)
         
@@ -984,7 +1233,7 @@ class OutReachAutomationNodes:
             new_doc = self.docs_manager.add_document(
                 content=revised_outreach_report,
                 doc_title="Outreach Report",
-                folder_name=self.drive_folder_name,
+                folder_name=state["drive_folder_name"],
                 make_shareable=True,
                 folder_shareable=True, # Set to false if only personal or true if with a team
                 markdown=True
@@ -1027,6 +1276,19 @@ class OutReachAutomationNodes:
         """
         print(Fore.YELLOW + "----- Generating personalized email -----\n" + Style.RESET_ALL)
         
+        print(f"DEBUG: About to generate email with LLM...")
+        output = invoke_llm(**self._personalized_email_request(state))
+        return self._deliver_personalized_email(state, output)
+    
+    async def agenerate_personalized_email(self, state: GraphState):
+        print(Fore.YELLOW + "----- Generating personalized email -----\n" + Style.RESET_ALL)
+        
+        print(f"DEBUG: About to generate email with LLM...")
+        output = await ainvoke_llm(**self._personalized_email_request(state))
+        return await asyncio.to_thread(self._deliver_personalized_email, state, output)
+    
+    @staticmethod
+    def _personalized_email_request(state: GraphState):
         # Debug: Print current lead info
         current_lead = state.get("current_lead")
         print(f"DEBUG: Current lead: {current_lead}")
@@ -1045,16 +1307,16 @@ class OutReachAutomationNodes:
 
         {state["custom_outreach_report_link"]}
         """
-        
-        print(f"DEBUG: About to generate email with LLM...")
-        output = invoke_llm(
-            system_prompt=PERSONALIZE_EMAIL_PROMPT,
-            user_message=lead_data,
-            model="gpt-3.5-turbo",
-            llm_provider="openai",
-            response_format=EmailResponse
-        )
-        
+        return {
+            "system_prompt": PERSONALIZE_EMAIL_PROMPT,
+            "user_message": lead_data,
+            "model": "gpt-3.5-turbo",
+            "llm_provider": "openai",
+            "response_format": EmailResponse
+        }
+    
+    def _deliver_personalized_email(self, state: GraphState, output):
+        """Draft (and optionally send) the generated email, then keep it with the reports."""
         print(f"DEBUG: LLM output: {output}")
         
         # Get relevant fields
@@ -1065,6 +1327,7 @@ class OutReachAutomationNodes:
         print(f"DEBUG: Email content length: {len(personalized_email) if personalized_email else 0}")
         
         # Get lead email
+        current_lead = state.get("current_lead")
         email = getattr(current_lead, "email", None) if hasattr(current_lead, "email") else None
         
         print(f"DEBUG: Recipient email: {email}")
@@ -1086,7 +1349,7 @@ class OutReachAutomationNodes:
             return {"reports": [personalized_email_doc]}
         
         # Create draft email
-        gmail = GmailTools()
+        gmail = self.gmail
         print(f"DEBUG: Creating draft email...")
         gmail.create_draft_email(
             recipient=email,
@@ -1123,13 +1386,37 @@ class OutReachAutomationNodes:
         global_research_report = get_report(reports, "Global Lead Analysis Report")
         
         # Generating SPIN questions
-        spin_questions = invoke_llm(
-            system_prompt=GENERATE_SPIN_QUESTIONS_PROMPT,
-            user_message=global_research_report,
-            model="gpt-3.5-turbo",
-            llm_provider="openai"
-        )
+        spin_questions = invoke_llm(**self._spin_questions_request(global_research_report))
         
+        # Generating interview script
+        interview_script = invoke_llm(**self._interview_script_request(global_research_report, spin_questions))
+        return self._interview_script_report(interview_script)
+    
+    async def agenerate_interview_script(self, state: GraphState):
+        print(Fore.YELLOW + "----- Generating interview script -----\n" + Style.RESET_ALL)
+        
+        # Load reports
+        reports = state["reports"]
+        global_research_report = get_report(reports, "Global Lead Analysis Report")
+        
+        # Generating SPIN questions
+        spin_questions = await ainvoke_llm(**self._spin_questions_request(global_research_report))
+        
+        # Generating interview script
+        interview_script = await ainvoke_llm(**self._interview_script_request(global_research_report, spin_questions))
+        return self._interview_script_report(interview_script)
+    
+    @staticmethod
+    def _spin_questions_request(global_research_report):
+        return {
+            "system_prompt": GENERATE_SPIN_QUESTIONS_PROMPT,
+            "user_message": global_research_report,
+            "model": "gpt-3.5-turbo",
+            "llm_provider": "openai"
+        }
+    
+    @staticmethod
+    def _interview_script_request(global_research_report, spin_questions):
         inputs = f"""
         # **Lead & company Information:**
 
@@ -1139,22 +1426,21 @@ class OutReachAutomationNodes:
 
         {spin_questions}
         """
-        
-        # Generating interview script
-        interview_script = invoke_llm(
-            system_prompt=WRITE_INTERVIEW_SCRIPT_PROMPT,
-            user_message=inputs,
-            model="gpt-3.5-turbo",
-            llm_provider="openai"
-        )
-        
+        return {
+            "system_prompt": WRITE_INTERVIEW_SCRIPT_PROMPT,
+            "user_message": inputs,
+            "model": "gpt-3.5-turbo",
+            "llm_provider": "openai"
+        }
+    
+    @staticmethod
+    def _interview_script_report(interview_script):
         # Ensure content is a string, fallback to empty string if None
         interview_script_doc = Report(
             title="Interview Script",
             content=interview_script if isinstance(interview_script, str) else "",
             is_markdown=True
         )
-        
         return {"reports": [interview_script_doc]}
     
     @staticmethod
@@ -1170,17 +1456,14 @@ class OutReachAutomationNodes:
         # Ensure reports are saved locally
         save_reports_locally(reports)
         
-        # Save all reports to Google docs
-        if SAVE_TO_GOOGLE_DOCS:
-            for report in reports:
-                self.docs_manager.add_document(
-                    content=report.content,
-                    doc_title=report.title,
-                    folder_name=self.drive_folder_name,
-                    markdown=report.is_markdown
-                )
+        # Save all reports to Google docs (uploaded concurrently into the cached folder)
+        if SAVE_TO_GOOGLE_DOCS and reports:
+            self.docs_manager.add_documents(
+                [{"content": report.content, "title": report.title, "markdown": report.is_markdown} for report in reports],
+                folder_name=state["drive_folder_name"]
+            )
 
-        return state
+        return {"reports": []}
 
     def update_CRM(self, state: GraphState):
         print(Fore.YELLOW + "----- Updating CRM records -----\n" + Style.RESET_ALL)
@@ -483,6 +483,23 @@ Calculate weighted average score with these weights:
 If you cannot calculate a score due to insufficient information, output: 6.0
 """
 
+## PREQUALIFY_LEAD_PROMPT
+
+#x
+PREQUALIFY_LEAD_PROMPT = """
+# **Role & Task**  
+You are quickly screening a new company, from its LinkedIn profile only, before any in-depth research is done. Decide how promising it is as a partner for AI infrastructure solutions.
+
+# **Consider**  
+- Does the company build or rely on software, data or AI products?
+- Is it an operating business (not a student project, a one-person shell, a non-profit or a recruiting agency)?
+- Does its size and industry suggest it could need compute, storage or edge infrastructure?
+
+**IMPORTANT: Output ONLY a numeric score (0.0 to 10.0) as a single number. Nothing else. No explanation, no text, just the number.**
+
+If the profile is empty or you cannot tell, output: 5.0
+"""
+
 ## GENERATE_OUTREACH_REPORT_PROMPT
 
 #x
@@ -31,6 +31,7 @@ class CompanyData(BaseModel):
     linkedin_url: str = ""
     decision_maker_linkedin: str = ""
     social_media_links: SocialMediaLinks = SocialMediaLinks()
+    linkedin_data: dict = {}  # Structured LinkedIn company profile, used for pre-qualification
     
 class GraphInputState(TypedDict):
     leads_ids: List[str]
@@ -46,4 +47,29 @@ class GraphState(TypedDict):
     custom_outreach_report_link: str
     personalized_email: str
     interview_script: str
-    number_leads: int
\ No newline at end of file
+    number_leads: int
+    drive_folder_name: str
+
+class BatchGraphState(TypedDict):
+    leads_ids: List[str]
+    leads_data: List[LeadData]
+    number_leads: int
+    # One summary per finished lead, appended by the concurrent lead runs
+    processed_leads: Annotated[list[dict], add]
+
+def new_lead_state(lead: LeadData) -> dict:
+    """Initial state for researching a single lead on its own."""
+    return {
+        "leads_ids": [],
+        "leads_data": [],
+        "current_lead": lead,
+        "lead_score": "",
+        "company_data": CompanyData(),
+        "reports": [],
+        "reports_folder_link": "",
+        "custom_outreach_report_link": "",
+        "personalized_email": "",
+        "interview_script": "",
+        "number_leads": 1,
+        "drive_folder_name": ""
+    }
\ No newline at end of file
@@ -0,0 +1,104 @@
+from bisect import bisect_right
+from functools import lru_cache
+from pydantic import BaseModel
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+# Encoding used for models tiktoken does not know about (e.g. Gemini)
+FALLBACK_ENCODING = "cl100k_base"
+# Rough estimation used when no encoder is available (1 token ≈ 4 characters)
+CHARS_PER_TOKEN = 4
+# Only snap back to a sentence end if it lies in the last 20% of the kept text
+SENTENCE_SNAP_WINDOW = 0.2
+SENTENCE_ENDINGS = ".!?"
+
+
+class TokenBudget(BaseModel):
+    content: str = ""
+    original_tokens: int = 0
+    tokens: int = 0  # tokens of the kept content, without the truncation notice
+    truncated: bool = False
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = DEFAULT_MODEL):
+    """
+    Return the (cached) tiktoken encoder for a model, or None if tiktoken can't provide one.
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """
+    Count the number of tokens in a text string.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _last_sentence_end(text: str) -> int:
+    """Index of the last sentence ending inside the snap window, or -1."""
+    min_index = int(len(text) * (1 - SENTENCE_SNAP_WINDOW))
+    return max(text.rfind(char, min_index) for char in SENTENCE_ENDINGS)
+
+
+def fit_to_token_budget(content: str, max_tokens: int = 12000, model: str = DEFAULT_MODEL) -> TokenBudget:
+    """
+    Fit content into `max_tokens` with a single encoding pass.
+    The cut is made on a token boundary, snapped back to the nearest sentence end
+    when one is close, and the token counts are reported so callers don't re-encode.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return _fit_by_characters(content, max_tokens)
+
+    tokens = encoding.encode(content, disallowed_special=())
+    original_tokens = len(tokens)
+    if original_tokens <= max_tokens:
+        return TokenBudget(content=content, original_tokens=original_tokens, tokens=original_tokens)
+
+    text, offsets = encoding.decode_with_offsets(tokens[:max_tokens])
+    kept_tokens = max_tokens
+    sentence_end = _last_sentence_end(text)
+    if sentence_end >= 0:
+        # Keep every token up to (and including) the one holding the sentence end
+        kept_tokens = bisect_right(offsets, sentence_end)
+        if kept_tokens < len(offsets):
+            text = text[:offsets[kept_tokens]]
+
+    return TokenBudget(
+        content=_with_truncation_notice(text, original_tokens, kept_tokens),
+        original_tokens=original_tokens,
+        tokens=kept_tokens,
+        truncated=True
+    )
+
+
+def _fit_by_characters(content: str, max_tokens: int) -> TokenBudget:
+    original_tokens = len(content) // CHARS_PER_TOKEN
+    if original_tokens <= max_tokens:
+        return TokenBudget(content=content, original_tokens=original_tokens, tokens=original_tokens)
+
+    text = content[:max_tokens * CHARS_PER_TOKEN]
+    sentence_end = _last_sentence_end(text)
+    if sentence_end >= 0:
+        text = text[:sentence_end + 1]
+    kept_tokens = len(text) // CHARS_PER_TOKEN
+    return TokenBudget(
+        content=_with_truncation_notice(text, original_tokens, kept_tokens),
+        original_tokens=original_tokens,
+        tokens=kept_tokens,
+        truncated=True
+    )
+
+
+def _with_truncation_notice(text: str, original_tokens: int, kept_tokens: int) -> str:
+    return text + f"\n\n[Content truncated due to length. Original had {original_tokens} tokens, truncated to {kept_tokens} tokens.]"
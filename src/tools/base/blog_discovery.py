@@ -0,0 +1,335 @@
+import re
+import time
+import contextvars
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor, wait, TimeoutError as FutureTimeoutError
+from bs4 import BeautifulSoup
+from src.instrumentation import traced
+from .markdown_scraper_tool import fetch_page, page_to_markdown, convert_html_to_markdown, truncate_markdown
+from .http_cache import cached_derivation
+from .website_crawler import extract_anchors, select_crawl_links
+
+# Limits of the blog discovery: robots.txt / sitemaps / feeds, then the most recent posts
+BLOG_DISCOVERY_CONFIG = {
+    "max_posts": 5,  # most recent posts summarized for the blog analysis
+    "max_workers": 4,  # posts fetched (and feed URLs probed) at the same time
+    "summary_chars": 1500,  # characters of each post kept in its summary
+    "max_sitemaps": 4,  # child sitemaps of a sitemap index read at most
+    "page_timeout": 10,  # connect/read timeout of a single request
+    "deadline_seconds": 20,  # wall-clock limit of the discovery & post fetches, slower posts are dropped
+}
+
+# Path segments of blog posts, and where sites usually publish their feed
+BLOG_SEGMENTS = ("blog", "blogs", "news", "insights", "articles", "posts", "stories", "resources")
+FEED_PATHS = ("/feed", "/rss.xml", "/feed.xml", "/atom.xml", "/index.xml", "/blog/feed", "/blog/rss.xml", "/blog/feed.xml")
+FEED_TYPES = ("application/rss+xml", "application/atom+xml", "application/feed+xml")
+
+SITEMAP_LINE = re.compile(r"^\s*sitemap\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+
+
+def configure_blog_discovery(**settings):
+    """
+    Update the blog discovery limits.
+
+    @param settings: Any of max_posts, max_workers, summary_chars, max_sitemaps, page_timeout, deadline_seconds.
+    """
+    unknown = set(settings) - set(BLOG_DISCOVERY_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown blog discovery settings: {', '.join(sorted(unknown))}")
+    BLOG_DISCOVERY_CONFIG.update(settings)
+
+
+def _remaining(deadline):
+    """Seconds left before `deadline` (a time.monotonic() value), None without deadline."""
+    return None if deadline is None else max(0, deadline - time.monotonic())
+
+
+def _try_fetch(url, deadline=None):
+    """Fetched page, or None when it doesn't exist / can't be fetched (before the deadline)."""
+    timeout = BLOG_DISCOVERY_CONFIG["page_timeout"]
+    remaining = _remaining(deadline)
+    if remaining is not None:
+        if remaining <= 0:
+            return None
+        timeout = min(timeout, max(remaining, 1))
+    try:
+        page, _ = fetch_page(url, timeout=timeout)
+        return page
+    except Exception:
+        return None
+
+
+def _site_root(url):
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    return urlunsplit((parts.scheme, parts.netloc, "/", "", ""))
+
+
+def _local_name(tag):
+    """XML tag without its namespace."""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element, *names):
+    for child in element:
+        if _local_name(child.tag) in names:
+            if child.text and child.text.strip():
+                return child.text.strip()
+            if child.get("href"):  # Atom <link href="..."/>
+                return child.get("href")
+    return ""
+
+
+def _parse_xml(text):
+    try:
+        return ElementTree.fromstring(text.lstrip("\ufeff \r\n\t").encode("utf-8"))
+    except ElementTree.ParseError:
+        return None
+
+
+def parse_date(value):
+    """Datetime (UTC) of a feed/sitemap date: RFC 822 (RSS) or ISO 8601 (Atom, sitemaps), else None."""
+    if not value:
+        return None
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            date = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return date if date.tzinfo else date.replace(tzinfo=timezone.utc)
+
+
+def sitemaps_from_robots(robots_txt, base_url):
+    """Sitemap URLs declared in a robots.txt."""
+    return [urljoin(base_url, url) for url in SITEMAP_LINE.findall(robots_txt)]
+
+
+def parse_sitemap(xml_text):
+    """
+    Read a sitemap or a sitemap index.
+
+    @return: (child sitemaps, pages), both lists of (url, lastmod datetime or None).
+    """
+    root = _parse_xml(xml_text)
+    if root is None:
+        return [], []
+    entries = [
+        (_child_text(element, "loc"), parse_date(_child_text(element, "lastmod")))
+        for element in root if _local_name(element.tag) in ("sitemap", "url")
+    ]
+    entries = [(url, date) for url, date in entries if url]
+    return (entries, []) if _local_name(root.tag) == "sitemapindex" else ([], entries)
+
+
+def parse_feed(xml_text):
+    """
+    Posts of an RSS or Atom feed.
+
+    @return: List of {"url", "title", "date", "content"}, content being the post's HTML when the feed carries it.
+    """
+    root = _parse_xml(xml_text)
+    if root is None:
+        return []
+    posts = []
+    for element in root.iter():
+        if _local_name(element.tag) not in ("item", "entry"):
+            continue
+        url = _child_text(element, "link", "guid", "id")
+        if not url.startswith("http"):
+            continue
+        posts.append({
+            "url": url,
+            "title": _child_text(element, "title"),
+            "date": parse_date(_child_text(element, "pubdate", "published", "updated", "date")),
+            "content": _child_text(element, "encoded", "content") or _child_text(element, "description", "summary"),
+        })
+    return posts
+
+
+def extract_feed_links(html):
+    """Feeds advertised by a page (<link rel="alternate" type="application/rss+xml" ...>)."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        link["href"] for link in soup.find_all("link", href=True)
+        if "alternate" in (link.get("rel") or []) and (link.get("type") or "").lower() in FEED_TYPES
+    ]
+
+
+def is_blog_post_url(url, blog_path=""):
+    """A page below a blog-like folder (or below `blog_path`), not the folder itself."""
+    segments = [segment for segment in urlsplit(url).path.lower().split("/") if segment]
+    if blog_path:
+        prefix = [segment for segment in blog_path.lower().split("/") if segment]
+        return len(segments) > len(prefix) and segments[:len(prefix)] == prefix
+    return any(segment in BLOG_SEGMENTS for segment in segments[:-1])
+
+
+def _most_recent(posts, limit):
+    # Undated posts keep their order, after the dated ones
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(posts, key=lambda post: post["date"] or oldest, reverse=True)[:limit]
+
+
+def _probe_feed(feed_url, deadline):
+    feed = _try_fetch(feed_url, deadline)
+    return parse_feed(feed["html"]) if feed else []
+
+
+def _posts_from_feeds(pages, root, deadline=None):
+    """
+    Posts of the first feed advertised by `pages` or found at a usual feed path.
+    Candidates are probed concurrently; the first one (in that order) with posts wins
+    and the probes still waiting are cancelled.
+    """
+    candidates = []
+    for page_url, page in pages:
+        candidates += [urljoin(page_url, href) for href in cached_derivation(page, "feeds", extract_feed_links)]
+    candidates = list(dict.fromkeys(candidates + [urljoin(root, path) for path in FEED_PATHS]))
+    executor = ThreadPoolExecutor(max_workers=max(1, min(BLOG_DISCOVERY_CONFIG["max_workers"], len(candidates))))
+    try:
+        # Keep the caller's instrumentation span (lead & node) in the worker threads
+        futures = [executor.submit(contextvars.copy_context().run, _probe_feed, url, deadline) for url in candidates]
+        for feed_url, future in zip(candidates, futures):
+            try:
+                posts = future.result(timeout=_remaining(deadline))
+            except FutureTimeoutError:
+                break
+            if posts:
+                return feed_url, posts
+        return None, []
+    finally:
+        # Don't wait for the probes of lower priority feeds
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _posts_from_sitemaps(root, blog_path, deadline=None):
+    """Blog post URLs of the site's sitemaps (declared in robots.txt, else /sitemap.xml), with their lastmod."""
+    robots = _try_fetch(urljoin(root, "/robots.txt"), deadline)
+    sitemap_urls = sitemaps_from_robots(robots["html"], root) if robots else []
+    queue = [(url, None) for url in sitemap_urls or [urljoin(root, "/sitemap.xml")]]
+    posts, read = [], 0
+    while queue and read < BLOG_DISCOVERY_CONFIG["max_sitemaps"] and _remaining(deadline) != 0:
+        sitemap_url, _ = queue.pop(0)
+        sitemap = _try_fetch(sitemap_url, deadline)
+        read += 1
+        if not sitemap:
+            continue
+        children, pages = parse_sitemap(sitemap["html"])
+        # Post/blog/news sitemaps first, then the most recently modified ones
+        children.sort(key=lambda child: (
+            not any(word in child[0].lower() for word in ("post", "blog", "news", "article")),
+            -(child[1].timestamp() if child[1] else 0),
+        ))
+        queue += children
+        posts += [{"url": url, "title": "", "date": date, "content": ""} for url, date in pages if is_blog_post_url(url, blog_path)]
+    return posts
+
+
+def _posts_from_index(blog_url, blog_page):
+    """Post links of a blog index page, in page order (no dates available)."""
+    blog_path = urlsplit(blog_url).path
+    posts = {}
+    for href, text in cached_derivation(blog_page, "anchors", extract_anchors):
+        url = urlunsplit(urlsplit(urljoin(blog_url, href))._replace(query="", fragment=""))
+        if urlsplit(url).netloc == urlsplit(blog_url).netloc and is_blog_post_url(url, blog_path):
+            posts.setdefault(url, {"url": url, "title": text, "date": None, "content": ""})
+    return list(posts.values())
+
+
+def discover_blog_posts(website, blog_url=None, deadline=None):
+    """
+    Find a company's blog posts without asking an LLM: RSS/Atom feeds (advertised by the
+    blog or home page, or at the usual paths), then the sitemaps listed in robots.txt,
+    then the links of the blog index page.
+
+    @param deadline: time.monotonic() value after which nothing more is fetched.
+    @return: (blog URL or None, posts sorted by most recent first, source: "feed", "sitemap", "index" or None)
+    """
+    root = _site_root(blog_url or website)
+    homepage = _try_fetch(website, deadline) if website else None
+    if not blog_url and homepage:
+        links = select_crawl_links(cached_derivation(homepage, "anchors", extract_anchors), website, 10)
+        blog_url = next((link for label, link in links if label == "Blog"), None)
+    blog_page = _try_fetch(blog_url, deadline) if blog_url else None
+    pages = [(url, page) for url, page in ((blog_url, blog_page), (website, homepage)) if page]
+    limit = BLOG_DISCOVERY_CONFIG["max_posts"]
+
+    feed_url, posts = _posts_from_feeds(pages, root, deadline)
+    if posts:
+        return blog_url or feed_url, _most_recent(posts, limit), "feed"
+    blog_path = urlsplit(blog_url).path.rstrip("/") if blog_url else ""
+    posts = _posts_from_sitemaps(root, blog_path, deadline)
+    if posts:
+        return blog_url, _most_recent(posts, limit), "sitemap"
+    if blog_page:
+        return blog_url, _posts_from_index(blog_url, blog_page)[:limit], "index"
+    return blog_url, [], None
+
+
+def _excerpt(markdown_content, max_chars):
+    """Beginning of a post, cut at the end of a sentence when possible."""
+    if len(markdown_content) <= max_chars:
+        return markdown_content
+    cut = markdown_content[:max_chars]
+    end = max(cut.rfind(". "), cut.rfind(".\n"), cut.rfind("! "), cut.rfind("? "))
+    return (cut[:end + 1] if end > max_chars * 0.6 else cut).rstrip() + " ..."
+
+
+def _summarize_post(post):
+    """Title, date & beginning of a post; posts whose feed carries enough content aren't fetched."""
+    chars = BLOG_DISCOVERY_CONFIG["summary_chars"]
+    content = convert_html_to_markdown(post["content"], chars * 2) if post["content"] else ""
+    if len(content) < chars:
+        page, _ = fetch_page(post["url"], timeout=BLOG_DISCOVERY_CONFIG["page_timeout"])
+        content = page_to_markdown(page, chars * 2)
+    headings = [line for line in content.split("\n") if line.startswith("#")]
+    title = post["title"] or (headings[0].lstrip("# ") if headings else post["url"])
+    if headings and headings[0].lstrip("# ").strip() == title.strip():
+        content = content.replace(headings[0], "", 1).lstrip()
+    date = f" ({post['date']:%Y-%m-%d})" if post["date"] else ""
+    return f"## {title}{date}\n{post['url']}\n\n{_excerpt(content, chars)}"
+
+
+def scrape_blog_index(blog_url, max_length):
+    """Markdown of the blog index page itself (previous behaviour, when no post is found)."""
+    page, _ = fetch_page(blog_url, timeout=BLOG_DISCOVERY_CONFIG["page_timeout"])
+    return page_to_markdown(page, max_length)
+
+
+@traced("collect_recent_blog_posts")
+def collect_recent_blog_posts(website: str, blog_url: str = None, max_length: int = 25000) -> str:
+    """
+    Compact summaries of a company's most recent blog posts (see `discover_blog_posts`),
+    fetched concurrently. Falls back to the blog index page when no post can be found.
+
+    @return: Markdown for the blog analysis prompt, "" when the company has no blog.
+    """
+    config = BLOG_DISCOVERY_CONFIG
+    # One deadline for the whole collection: discovery requests & post fetches
+    deadline = time.monotonic() + config["deadline_seconds"]
+    blog_url, posts, source = discover_blog_posts(website, blog_url, deadline)
+    if not posts:
+        return scrape_blog_index(blog_url, max_length) if blog_url else ""
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(config["max_workers"], len(posts))))
+    # Keep the caller's instrumentation span (lead & node) in the worker threads
+    futures = [executor.submit(contextvars.copy_context().run, _summarize_post, post) for post in posts]
+    wait(futures, timeout=_remaining(deadline))
+    # Posts still loading at the deadline are dropped (not waited for)
+    executor.shutdown(wait=False, cancel_futures=True)
+    summaries = []
+    for post, future in zip(posts, futures):
+        if future.done() and not future.cancelled() and future.exception() is None:
+            summaries.append(future.result())
+        else:
+            print(f"Skipping blog post {post['url']}")
+    if not summaries:
+        return scrape_blog_index(blog_url, max_length) if blog_url else ""
+
+    header = f"# {len(summaries)} most recent blog posts ({blog_url or _site_root(website)}, found via {source})"
+    return truncate_markdown("\n\n".join([header] + summaries), max_length)
+
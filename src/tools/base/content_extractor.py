@@ -0,0 +1,118 @@
+import re
+
+# Thresholds of the boilerplate filter applied to scraped markdown
+CONTENT_EXTRACTION_CONFIG = {
+    "max_link_density": 0.5,  # blocks whose text is mostly link anchors are menus / link lists
+    "boilerplate_max_words": 40,  # longer blocks are kept even if they mention cookies, newsletters...
+    "dedupe_min_chars": 4,  # shorter lines (bullets, separators) are never considered duplicates
+    "short_block_words": 3,  # blocks this short, several in a row, are menu titles / button labels
+    "short_block_run": 3,
+}
+
+# Cookie banners, consent & newsletter prompts, legal footers
+BOILERPLATE_PATTERNS = re.compile(
+    r"\b(cookies?|consent|privacy (policy|settings|preferences)|terms (of use|of service|and conditions)"
+    r"|all rights reserved|subscribe|newsletter|sign up|log ?in|accept all|reject all|skip to (main )?content)",
+    re.IGNORECASE,
+)
+
+MARKDOWN_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+LIST_MARKER = re.compile(r"^\s*([*+-]|\d+\.)\s+")
+NON_WORD = re.compile(r"\W+")
+MARKUP_OR_SPACE = re.compile(r"[\s*#>_`|-]")
+SPACE = re.compile(r"\s")
+
+
+def configure_content_extraction(**settings):
+    """
+    Update the boilerplate filter thresholds.
+
+    @param settings: Any of max_link_density, boilerplate_max_words, dedupe_min_chars, short_block_words, short_block_run.
+    """
+    unknown = set(settings) - set(CONTENT_EXTRACTION_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown content extraction settings: {', '.join(sorted(unknown))}")
+    CONTENT_EXTRACTION_CONFIG.update(settings)
+
+
+def link_density(block):
+    """Share of a markdown block's visible text that sits inside links."""
+    visible = MARKDOWN_LINK.sub(r"\1", block)
+    text_chars = len(MARKUP_OR_SPACE.sub("", visible))
+    if not text_chars:
+        return 0.0
+    link_chars = sum(len(SPACE.sub("", m.group(1))) for m in MARKDOWN_LINK.finditer(block))
+    return link_chars / text_chars
+
+
+def is_boilerplate(block):
+    """Menus & link lists (high link density), cookie/consent/newsletter blurbs and legal notices."""
+    if link_density(block) > CONTENT_EXTRACTION_CONFIG["max_link_density"]:
+        return True
+    words = len(MARKDOWN_LINK.sub(r"\1", block).split())
+    return words <= CONTENT_EXTRACTION_CONFIG["boilerplate_max_words"] and bool(BOILERPLATE_PATTERNS.search(block))
+
+
+def _normalize_line(line):
+    line = LIST_MARKER.sub("", MARKDOWN_LINK.sub(r"\1", line))
+    return NON_WORD.sub(" ", line).strip().lower()
+
+
+def dedupe_lines(markdown_content):
+    """
+    Drop every line already seen earlier in the document (repeated calls to action,
+    cards, footers repeated on every crawled page...). Headings are always kept.
+    """
+    seen = set()
+    lines = []
+    for line in markdown_content.split("\n"):
+        key = _normalize_line(line)
+        if line.lstrip().startswith("#") or len(key) < CONTENT_EXTRACTION_CONFIG["dedupe_min_chars"]:
+            lines.append(line)
+        elif key not in seen:
+            seen.add(key)
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _drop_short_block_runs(blocks):
+    """Remove runs of very short blocks (what's left of menus once their links are gone)."""
+    max_words, min_run = CONTENT_EXTRACTION_CONFIG["short_block_words"], CONTENT_EXTRACTION_CONFIG["short_block_run"]
+    is_short = [
+        not block.lstrip().startswith("#") and len(MARKDOWN_LINK.sub(r"\1", block).split()) <= max_words
+        for block in blocks
+    ]
+    kept, start = [], 0
+    while start < len(blocks):
+        end = start
+        while end < len(blocks) and is_short[end]:
+            end += 1
+        if end - start >= min_run:
+            start = end  # drop the whole run
+            continue
+        kept.extend(blocks[start:end + 1])
+        start = end + 1
+    return kept
+
+
+def strip_boilerplate(markdown_content):
+    """
+    Keep the main content of scraped markdown: link-dense & boilerplate blocks, repeated
+    lines and runs of menu labels are removed, then the headings left without content.
+    """
+    blocks = [block for block in re.split(r"\n\s*\n", dedupe_lines(markdown_content)) if block.strip()]
+    blocks = _drop_short_block_runs([block for block in blocks if block.lstrip().startswith("#") or not is_boilerplate(block)])
+    kept = []
+    for block in blocks:
+        is_heading = block.lstrip().startswith("#") and "\n" not in block.strip()
+        if is_heading:
+            # A heading directly followed by a heading of the same or higher level is empty
+            level = len(block.lstrip()) - len(block.lstrip().lstrip("#"))
+            while kept and kept[-1][0] is not None and kept[-1][0] >= level:
+                kept.pop()
+            kept.append((level, block))
+        else:
+            kept.append((None, block))
+    while kept and kept[-1][0] is not None:
+        kept.pop()
+    return "\n\n".join(block for _, block in kept)
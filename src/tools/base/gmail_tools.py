@@ -1,12 +1,15 @@
 import base64
-from googleapiclient.discovery import build
 from email.mime.text import MIMEText
-from src.utils import get_google_credentials
+from src.instrumentation import traced
+from .google_services import get_google_service
 
 class GmailTools:
-    def __init__(self):
-        self.service = build('gmail', 'v1', credentials=get_google_credentials())
+    @property
+    def service(self):
+        # Memoized, creating a GmailTools per lead costs nothing
+        return get_google_service('gmail', 'v1')
 
+    @traced("gmail.create_draft_email", kind="google_api")
     def create_draft_email(self, recipient, subject, email_content):
         try:
             message = self._create_message(recipient, subject, email_content)
@@ -21,6 +24,7 @@ class GmailTools:
             print(f"An error occurred while creating draft: {error}")
             return None
         
+    @traced("gmail.send_email", kind="google_api")
     def send_email(self, recipient, subject, email_content):
         try:
             print(f"DEBUG: Attempting to send email to {recipient}")
@@ -0,0 +1,161 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from src.utils import GOOGLE_TOKEN_FILE, get_google_credentials
+
+# Settings of the shared Google API clients (Docs, Drive, Gmail, Sheets, YouTube)
+GOOGLE_SERVICES_CONFIG = {
+    "static_discovery": True,  # use the discovery documents bundled with google-api-python-client
+    "background_refresh": True,  # refresh the OAuth token in a daemon thread before it expires
+    "refresh_margin": 300,  # seconds before expiry at which the token is refreshed
+    "refresh_check_interval": 60,  # seconds between two expiry checks of the refresh thread
+    "timeout": 60,  # socket timeout of the HTTP transport, in seconds
+}
+
+_credentials = None
+_services = {}
+_lock = threading.RLock()
+_thread_local = threading.local()
+_refresher = None
+_stop_refresher = threading.Event()
+
+
+def configure_google_services(**settings):
+    """
+    Update the Google API client settings.
+    Already built services are dropped so the new settings apply on next use.
+
+    @param settings: Any of static_discovery, background_refresh, refresh_margin, refresh_check_interval, timeout.
+    """
+    unknown = set(settings) - set(GOOGLE_SERVICES_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown Google services settings: {', '.join(sorted(unknown))}")
+    with _lock:
+        GOOGLE_SERVICES_CONFIG.update(settings)
+    close_google_services()
+
+
+def get_shared_google_credentials():
+    """
+    Return the process-wide OAuth credentials: `token.json` (or the consent flow)
+    is only read once, then the token is kept fresh by the refresh thread.
+    """
+    global _credentials
+    if _credentials is None:
+        with _lock:
+            if _credentials is None:
+                _credentials = get_google_credentials()
+                if GOOGLE_SERVICES_CONFIG["background_refresh"]:
+                    _start_refresher()
+    return _credentials
+
+
+def _refresh_if_expiring(force=False):
+    """
+    Refresh the shared token when it expires within `refresh_margin` seconds.
+    A token without expiry is only refreshed once it is no longer valid.
+    """
+    from google.auth.transport.requests import Request
+
+    with _lock:
+        creds = _credentials
+        if creds is None or not creds.refresh_token:
+            return False
+        # google-auth stores the expiry as a naive UTC datetime
+        margin = timedelta(seconds=GOOGLE_SERVICES_CONFIG["refresh_margin"])
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if not force:
+            if creds.expiry is None and creds.valid:
+                return False
+            if creds.expiry is not None and creds.expiry - now > margin:
+                return False
+        creds.refresh(Request())
+        with open(GOOGLE_TOKEN_FILE, 'w') as token:
+            token.write(creds.to_json())
+        return True
+
+
+def _refresh_loop():
+    while not _stop_refresher.wait(GOOGLE_SERVICES_CONFIG["refresh_check_interval"]):
+        try:
+            _refresh_if_expiring()
+        except Exception as e:
+            # The next request refreshes the token itself if this keeps failing
+            print(f"Google token refresh failed: {e}")
+
+
+def _start_refresher():
+    global _refresher
+    if _refresher is None or not _refresher.is_alive():
+        _stop_refresher.clear()
+        _refresher = threading.Thread(target=_refresh_loop, name="google-token-refresh", daemon=True)
+        _refresher.start()
+
+
+def _thread_http(authorized):
+    """
+    HTTP transport of the calling thread. httplib2 connections aren't thread-safe,
+    so every thread keeps its own pooled (keep-alive) transport, shared by all services.
+    """
+    import httplib2
+
+    key = "authorized" if authorized else "anonymous"
+    credentials = get_shared_google_credentials() if authorized else None
+    cached = getattr(_thread_local, key, None)
+    if cached is None or cached[0] is not credentials:
+        http = httplib2.Http(timeout=GOOGLE_SERVICES_CONFIG["timeout"])
+        if authorized:
+            from google_auth_httplib2 import AuthorizedHttp
+            http = AuthorizedHttp(credentials, http=http)
+        cached = (credentials, http)
+        setattr(_thread_local, key, cached)
+    return cached[1]
+
+
+def get_google_service(service_name, version, developer_key=None):
+    """
+    Return a memoized Google API service object, safe to share between threads.
+    Services authenticate with the shared OAuth credentials, or with `developer_key`
+    (API key) when given, and send each request over the calling thread's transport.
+    """
+    key = (service_name, version, developer_key)
+    service = _services.get(key)
+    if service is None:
+        with _lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = _build_service(service_name, version, developer_key)
+    return service
+
+
+def _build_service(service_name, version, developer_key):
+    from googleapiclient.discovery import build
+    from googleapiclient.errors import UnknownApiNameOrVersion
+    from googleapiclient.http import HttpRequest
+
+    authorized = developer_key is None
+
+    def request_builder(http, *args, **kwargs):
+        return HttpRequest(_thread_http(authorized), *args, **kwargs)
+
+    options = {
+        "http": _thread_http(authorized),
+        "requestBuilder": request_builder,
+        "developerKey": developer_key,
+        "cache_discovery": False,
+    }
+    if GOOGLE_SERVICES_CONFIG["static_discovery"]:
+        try:
+            return build(service_name, version, static_discovery=True, **options)
+        except UnknownApiNameOrVersion:
+            pass  # Not bundled with this client version, fetch the discovery document
+    return build(service_name, version, static_discovery=False, **options)
+
+
+def close_google_services():
+    """Drop the memoized services & credentials and stop the refresh thread."""
+    global _credentials, _refresher
+    with _lock:
+        _stop_refresher.set()
+        _services.clear()
+        _credentials = None
+        _refresher = None
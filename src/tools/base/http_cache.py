@@ -0,0 +1,113 @@
+import os
+import threading
+from urllib.parse import urlsplit
+from src.cache import CACHE_DIR, get_shared_cache, make_cache_key, env_flag
+from src.instrumentation import record
+from .http_session import read_text
+
+# On by default, disable with HTTP_CACHE_ENABLED=0 or configure_http_cache(enabled=False)
+HTTP_CACHE_CONFIG = {
+    "enabled": None,  # None = read HTTP_CACHE_ENABLED from the environment
+    "path": os.path.join(CACHE_DIR, "http_cache.sqlite"),
+    "ttl_seconds": 30 * 24 * 3600,  # pages not seen for this long are dropped, not revalidated
+    "max_bytes": 200 * 2 ** 20,  # least recently used pages are evicted above this size
+}
+
+_domain_stats = {}
+_domain_stats_lock = threading.Lock()
+
+
+def configure_http_cache(**settings):
+    """
+    Configure the conditional-GET cache of scraped web pages.
+
+    @param settings: Any of enabled, path, ttl_seconds, max_bytes.
+    """
+    unknown = set(settings) - set(HTTP_CACHE_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown HTTP cache settings: {', '.join(sorted(unknown))}")
+    HTTP_CACHE_CONFIG.update(settings)
+
+
+def get_http_cache():
+    """Return the shared web page cache, or None when it is disabled."""
+    enabled = HTTP_CACHE_CONFIG["enabled"]
+    if enabled is None:
+        enabled = env_flag("HTTP_CACHE_ENABLED", default=True)
+    if not enabled:
+        return None
+    return get_shared_cache(
+        HTTP_CACHE_CONFIG["path"],
+        ttl_seconds=HTTP_CACHE_CONFIG["ttl_seconds"],
+        max_bytes=HTTP_CACHE_CONFIG["max_bytes"],
+    )
+
+
+def _count(url, **counters):
+    domain = urlsplit(url).netloc.lower()
+    with _domain_stats_lock:
+        stats = _domain_stats.setdefault(domain, {"requests": 0, "not_modified": 0, "downloaded_bytes": 0, "saved_bytes": 0})
+        for name, value in counters.items():
+            stats[name] += value
+
+
+def get_http_cache_stats():
+    """Cache size & hit counters, plus requests, 304s and bytes downloaded/saved per domain."""
+    cache = get_http_cache()
+    with _domain_stats_lock:
+        domains = {domain: dict(stats) for domain, stats in _domain_stats.items()}
+    return {**(cache.stats() if cache else {"enabled": False}), "domains": domains}
+
+
+def conditional_get(session, url, headers=None, timeout=30, max_bytes=None):
+    """
+    GET `url`, revalidating a cached copy with If-None-Match / If-Modified-Since.
+    The body is streamed and reading stops after `max_bytes`.
+
+    @return: (response, page, downloaded bytes). `page` ({"url", "html", "etag", "last_modified",
+             "derived"}) is the cached copy when the server answered 304, otherwise the page
+             just read (None unless the status is 200). Pages without an ETag or
+             Last-Modified header can't be revalidated and aren't cached ("url" is None).
+    """
+    cache = get_http_cache()
+    key = make_cache_key("http_get", url)
+    page = cache.get(key) if cache else None
+
+    request_headers = dict(headers or {})
+    if page:
+        if page.get("etag"):
+            request_headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            request_headers["If-Modified-Since"] = page["last_modified"]
+
+    response = session.get(url, headers=request_headers, timeout=timeout, stream=True)
+    if page and response.status_code == 304:
+        response.close()
+        record(cache_hits=1)
+        _count(url, requests=1, not_modified=1, saved_bytes=len(page["html"].encode("utf-8")))
+        return response, page, 0
+
+    html, size = read_text(response, max_bytes)
+    _count(url, requests=1, downloaded_bytes=size)
+    if response.status_code != 200:
+        return response, None, size
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    cacheable = cache is not None and bool(etag or last_modified)
+    page = {"url": url if cacheable else None, "html": html, "etag": etag, "last_modified": last_modified, "derived": {}}
+    if cacheable:
+        cache.set(key, page)
+    return response, page, size
+
+
+def cached_derivation(page, name, compute):
+    """
+    Return `compute(page["html"])` (e.g. the page's markdown), computed once per page
+    version: stored with the cached page so a 304 skips HTML parsing altogether.
+    """
+    if name not in page["derived"]:
+        page["derived"][name] = compute(page["html"])
+        cache = get_http_cache()
+        # Pages without validators aren't cached (see `conditional_get`)
+        if cache and page.get("url"):
+            cache.set(make_cache_key("http_get", page["url"]), page)
+    return page["derived"][name]
@@ -0,0 +1,68 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connection pool settings of the shared HTTP session
+HTTP_POOL_CONFIG = {
+    "pool_connections": 20,  # number of hosts kept in the pool
+    "pool_maxsize": 20,  # keep-alive connections per host
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Return the process-wide `requests.Session`: connections (and TLS handshakes)
+    are reused between calls to the same host instead of being opened on every request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONFIG["pool_connections"],
+                    pool_maxsize=HTTP_POOL_CONFIG["pool_maxsize"],
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def close_http_session():
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def read_text(response, max_bytes=None, chunk_size=64 * 1024):
+    """
+    Read the body of a streamed response (`stream=True`), stopping after `max_bytes`:
+    the rest of a huge page is never downloaded.
+
+    @return: (decoded text, number of bytes read)
+    """
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(chunk_size):
+            chunks.append(chunk)
+            size += len(chunk)
+            if max_bytes and size >= max_bytes:
+                break
+    finally:
+        response.close()
+    body = b"".join(chunks)
+    if max_bytes:
+        body = body[:max_bytes]
+    # Without an explicit charset requests assumes ISO-8859-1, most pages are UTF-8
+    charset = "charset" in response.headers.get("Content-Type", "").lower()
+    try:
+        return body.decode(response.encoding if charset and response.encoding else "utf-8", errors="replace"), size
+    except LookupError:  # unknown charset name
+        return body.decode("utf-8", errors="replace"), size
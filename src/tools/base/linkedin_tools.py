@@ -1,7 +1,18 @@
 import os
+import re
+import time
+import random
+import threading
+import contextvars
+import unicodedata
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, unquote
 from src.utils import invoke_llm
-import webbrowser
+from src.cache import CACHE_DIR, get_shared_cache, make_cache_key, env_flag
+from src.instrumentation import traced, record
+from .http_session import get_http_session
+from .rate_limiter import TokenBucket
 
 def extract_linkedin_url_base(search_results):
     """
@@ -13,32 +24,229 @@ def extract_linkedin_url_base(search_results):
     return ""
 
 
-def extract_linkedin_url(search_results):
-    EXTRACT_LINKEDIN_URL_PROMPT = """
-    **Role:**  
-    You are an expert in extracting LinkedIn URLs from Google search results, specializing in finding the correct personal LinkedIn URL.
+# RapidAPI LinkedIn profile API settings, match `requests_per_second`/`burst` to your plan
+LINKEDIN_API_CONFIG = {
+    "requests_per_second": 1.0,
+    "burst": 3,
+    "timeout": 30,
+    "max_retries": 3,  # retries on 429, 5xx & network errors
+    "backoff_seconds": 2.0,
+    "max_workers": 4,  # concurrent fetches in `scrape_linkedin_many`
+    "cache_enabled": None,  # None = read LINKEDIN_CACHE_ENABLED from the environment (default on)
+    "cache_path": os.path.join(CACHE_DIR, "linkedin_cache.sqlite"),
+    "cache_ttl_seconds": 30 * 24 * 3600,
+}
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
-    **Objective:**  
-    From the provided search results, find the LinkedIn URL of a specific person working at a specific company.
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
 
-    **Instructions:**  
-    1. Output **only** the correct LinkedIn URL if found, nothing else.  
-    2. If no valid URL exists, output **only** an empty string.  
-    3. Only consider URLs with `"/in"`. Ignore those with `"/posts"` or `"/company"`.  
+# Local ranking of /in/ profile candidates: the LLM is only asked when the best
+# candidate scores below LINKEDIN_MIN_CONFIDENCE or the runner-up is within LINKEDIN_RANK_MARGIN
+LINKEDIN_MIN_CONFIDENCE = 0.5
+LINKEDIN_RANK_MARGIN = 0.15
+# Candidates sent to the LLM when the ranking is ambiguous
+LINKEDIN_LLM_CANDIDATES = 5
+
+_linkedin_url_stats = {"lookups": 0, "resolved_locally": 0, "llm_fallbacks": 0, "not_found": 0}
+_linkedin_url_stats_lock = threading.Lock()
+
+EXTRACT_LINKEDIN_URL_PROMPT = """
+**Role:**  
+You are an expert in extracting LinkedIn URLs from Google search results, specializing in finding the correct personal LinkedIn URL.
+
+**Objective:**  
+From the provided search results, find the LinkedIn URL of a specific person working at a specific company.
+
+**Instructions:**  
+1. Output **only** the correct LinkedIn URL if found, nothing else.  
+2. If no valid URL exists, output **only** an empty string.  
+3. Only consider URLs with `"/in"`. Ignore those with `"/posts"` or `"/company"`.  
+"""
+
+
+def _tokens(text):
+    return set(re.findall(r"[a-z0-9]+", unicodedata.normalize("NFKD", str(text).lower()).encode("ascii", "ignore").decode()))
+
+
+def _company_tokens(company):
+    """Significant tokens of a company name or email domain (`mail.acme-labs.co.uk` -> acme, labs)."""
+    company = str(company or "").lower()
+    if "." in company and " " not in company:
+        labels = [label for label in company.split(".") if label not in ("www", "mail", "com", "co", "io", "ai", "net", "org", "uk")]
+        company = labels[-1] if labels else ""
+    return {token for token in _tokens(company) if len(token) > 2}
+
+
+def rank_linkedin_candidates(search_results, lead_name="", company=""):
     """
-    
+    Score every personal profile (/in/) link of the search results against the lead name,
+    the company (name or email domain) and the title/snippet, best candidate first.
+
+    @return: List of (score between 0 and 1, url) tuples.
+    """
+    name_tokens = {token for token in _tokens(lead_name) if len(token) > 1}
+    company_tokens = _company_tokens(company)
+    candidates = {}
+    for position, result in enumerate(search_results):
+        link = result.get('link', '')
+        if 'linkedin.com/in/' not in link:
+            continue
+        slug_tokens = _tokens(link.split('linkedin.com/in/')[1])
+        title_tokens = _tokens(result.get('title', ''))
+        text_tokens = title_tokens | _tokens(result.get('snippet', ''))
+
+        score = 0.0
+        if name_tokens:
+            score += 0.45 * len(name_tokens & title_tokens) / len(name_tokens)
+            score += 0.25 * len(name_tokens & slug_tokens) / len(name_tokens)
+        if company_tokens:
+            score += 0.2 * len(company_tokens & (text_tokens | slug_tokens)) / len(company_tokens)
+        # Search engines rank the best match first
+        score += 0.1 / (position + 1)
+        candidates[link] = max(score, candidates.get(link, 0.0))
+    return sorted(((score, link) for link, score in candidates.items()), reverse=True)
+
+
+def _count_lookup(outcome):
+    with _linkedin_url_stats_lock:
+        _linkedin_url_stats["lookups"] += 1
+        _linkedin_url_stats[outcome] += 1
+        return dict(_linkedin_url_stats)
+
+
+def get_linkedin_url_stats():
+    """How many LinkedIn URL lookups were resolved locally vs. with the LLM fallback."""
+    with _linkedin_url_stats_lock:
+        return dict(_linkedin_url_stats)
+
+
+def extract_linkedin_url(search_results, lead_name="", company=""):
+    """
+    Pick the lead's personal LinkedIn URL from Google search results.
+    Candidates are ranked locally, the LLM only decides between the top candidates
+    when the ranking is not confident enough.
+
+    @param lead_name: Name of the lead.
+    @param company: Company name or domain of the lead's email.
+    @return: The LinkedIn URL, or an empty string if none was found.
+    """
+    ranked = rank_linkedin_candidates(search_results, lead_name, company)
+    if not ranked:
+        _count_lookup("not_found")
+        return ""
+
+    best_score, best_url = ranked[0]
+    runner_up_score = ranked[1][0] if len(ranked) > 1 else 0.0
+    if best_score >= LINKEDIN_MIN_CONFIDENCE and best_score - runner_up_score >= LINKEDIN_RANK_MARGIN:
+        _count_lookup("resolved_locally")
+        return best_url
+
+    stats = _count_lookup("llm_fallbacks")
+    print(f"LinkedIn URL ranking ambiguous for {lead_name} ({best_score:.2f} vs {runner_up_score:.2f}), "
+          f"asking the LLM ({stats['llm_fallbacks']}/{stats['lookups']} lookups so far)")
+    candidate_urls = {url for _, url in ranked[:LINKEDIN_LLM_CANDIDATES]}
+    candidates = [result for result in search_results if result.get('link') in candidate_urls]
     result = invoke_llm(
         system_prompt=EXTRACT_LINKEDIN_URL_PROMPT, 
-        user_message=str(search_results),
+        user_message=f"# Person: {lead_name}\n# Company: {company}\n\n# Search results:\n{candidates}",
         model="gpt-3.5-turbo",  # Changed to OpenAI model
         llm_provider="openai"    # Explicitly set provider
     )
-    return result
+    return result.strip()
     
     
+def canonicalize_linkedin_url(linkedin_url):
+    """
+    Canonical form of a LinkedIn profile/company URL, so the same page always maps
+    to the same cache entry (`http://uk.linkedin.com/in/Jane-Doe/?trk=x` -> `https://www.linkedin.com/in/jane-doe`).
+    """
+    url = str(linkedin_url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlsplit(url)
+    host = parsed.netloc.lower()
+    if host == "linkedin.com" or host.endswith(".linkedin.com"):
+        host = "www.linkedin.com"
+    path = unquote(parsed.path).rstrip("/").lower()
+    return f"https://{host}{path}"
+
+
+def get_linkedin_cache():
+    """Return the LinkedIn profile cache, or None when it is disabled."""
+    enabled = LINKEDIN_API_CONFIG["cache_enabled"]
+    if enabled is None:
+        enabled = env_flag("LINKEDIN_CACHE_ENABLED", default=True)
+    if not enabled:
+        return None
+    return get_shared_cache(LINKEDIN_API_CONFIG["cache_path"], ttl_seconds=LINKEDIN_API_CONFIG["cache_ttl_seconds"])
+
+
+def configure_linkedin_api(**settings):
+    """
+    Update the LinkedIn API settings (see `LINKEDIN_API_CONFIG`), e.g. to match another RapidAPI plan.
+    """
+    global _rate_limiter
+    unknown = set(settings) - set(LINKEDIN_API_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown LinkedIn API settings: {', '.join(sorted(unknown))}")
+    with _rate_limiter_lock:
+        LINKEDIN_API_CONFIG.update(settings)
+        _rate_limiter = None
+
+
+def _get_rate_limiter():
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = TokenBucket(LINKEDIN_API_CONFIG["requests_per_second"], LINKEDIN_API_CONFIG["burst"])
+    return _rate_limiter
+
+
+def _retry_delay(response, attempt):
+    """Wait time before retrying: the Retry-After header if given, else exponential backoff with jitter."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return LINKEDIN_API_CONFIG["backoff_seconds"] * (2 ** attempt) * random.uniform(0.75, 1.25)
+
+
+def _fetch_linkedin(url, querystring):
+    """GET the RapidAPI endpoint within the rate limit, retrying 429s, 5xx and network errors."""
+    headers = {
+      "x-rapidapi-key": os.getenv("RAPIDAPI_KEY"),
+      "x-rapidapi-host": "fresh-linkedin-profile-data.p.rapidapi.com"
+    }
+    max_retries = LINKEDIN_API_CONFIG["max_retries"]
+    for attempt in range(max_retries + 1):
+        _get_rate_limiter().acquire()
+        response = None
+        try:
+            response = get_http_session().get(url, headers=headers, params=querystring, timeout=LINKEDIN_API_CONFIG["timeout"])
+            record(bytes_fetched=len(response.content))
+        except requests.RequestException as e:
+            print(f"LinkedIn request failed: {e}")
+        if response is not None and response.status_code not in RETRY_STATUS_CODES:
+            return response
+        if attempt < max_retries:
+            delay = _retry_delay(response, attempt)
+            status = response.status_code if response is not None else "network error"
+            print(f"LinkedIn request got {status}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+    return response
+
+
+@traced("scrape_linkedin")
 def scrape_linkedin(linkedin_url, is_company=False):
     """
     Scrapes LinkedIn profile data based on the provided LinkedIn URL.
+    Responses are cached on disk by canonical URL and requests stay within the RapidAPI rate limit.
     
     @param linkedin_url: The LinkedIn URL to scrape.
     @param is_company: Boolean indicating whether to scrape a company profile or a person profile.
@@ -49,26 +257,59 @@ def scrape_linkedin(linkedin_url, is_company=False):
     else:
         url = "https://fresh-linkedin-profile-data.p.rapidapi.com/get-linkedin-profile"
 
-    querystring = {"linkedin_url": linkedin_url}
-    headers = {
-      "x-rapidapi-key": os.getenv("RAPIDAPI_KEY"),
-      "x-rapidapi-host": "fresh-linkedin-profile-data.p.rapidapi.com"
-    }
+    canonical_url = canonicalize_linkedin_url(linkedin_url)
+    if not canonical_url:
+        # Nothing to look up, don't spend API quota on it
+        return None
+    cache = get_linkedin_cache()
+    cache_key = make_cache_key("linkedin", is_company, canonical_url)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            record(cache_hits=1)
+            return cached
 
-    response = requests.get(url, headers=headers, params=querystring)
-    if response.status_code == 200:
+    querystring = {"linkedin_url": canonical_url}
+    response = _fetch_linkedin(url, querystring)
+    if response is not None and response.status_code == 200:
         data = response.json()
+        if cache is not None:
+            cache.set(cache_key, data)
         return data
     else:
-        print(f"Request failed with status code: {response.status_code}")
+        print(f"Request failed with status code: {response.status_code if response is not None else 'no response'}")
 
-# Assume you have the LinkedIn URL and the message
-linkedin_url = "https://www.linkedin.com/in/ideal-person/"
-message = "Hi [Name], I came across your profile and..."
 
-# Open the LinkedIn profile in the default browser
-webbrowser.open(linkedin_url)
+def scrape_linkedin_many(linkedin_urls, is_company=False, max_workers=None):
+    """
+    Scrapes several LinkedIn profiles concurrently, within the RapidAPI rate limit.
+    
+    @param linkedin_urls: LinkedIn URLs, or (url, is_company) pairs to mix people and companies.
+    @param is_company: Default profile type for plain URLs.
+    @return: The scraped data of every URL (None when it failed), in the same order.
+    """
+    items = [item if isinstance(item, tuple) else (item, is_company) for item in linkedin_urls]
+    # Duplicates (after canonicalization) are only fetched once
+    unique = list(dict.fromkeys((canonicalize_linkedin_url(url), flag) for url, flag in items))
+    max_workers = max_workers or LINKEDIN_API_CONFIG["max_workers"]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique) or 1))) as executor:
+        # Keep the caller's instrumentation span (lead & node) in the worker threads
+        futures = {
+            key: executor.submit(contextvars.copy_context().run, scrape_linkedin, key[0], key[1])
+            for key in unique
+        }
+        results = {key: future.result() for key, future in futures.items()}
+    return [results[(canonicalize_linkedin_url(url), flag)] for url, flag in items]
+
+
+def open_linkedin_profile(linkedin_url, message):
+    """
+    Open a LinkedIn profile in the default browser and print the message to paste
+    (manual outreach helper, nothing runs at import time).
+    """
+    import webbrowser
 
-# Print or copy the message for the user to paste
-print("Copy and paste this message:")
-print(message)
\ No newline at end of file
+    webbrowser.open(linkedin_url)
+    # Print or copy the message for the user to paste
+    print("Copy and paste this message:")
+    print(message)
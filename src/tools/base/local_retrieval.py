@@ -0,0 +1,145 @@
+import re
+import math
+import zlib
+import threading
+from collections import Counter, OrderedDict
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from src.cache import make_cache_key
+
+TOKEN = re.compile(r"[a-z0-9]+(?:[.+#-][a-z0-9]+)*")
+
+# Too frequent to tell documents apart
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to was we were with "
+    "will you your".split()
+)
+
+
+def tokenize(text):
+    """Lowercase word tokens of `text`, stop words removed."""
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local CPU embeddings: word & word-pair counts hashed into a fixed size vector
+    (signed feature hashing, sublinear term frequency, L2 normalized).
+    No model, no network, no fitting: a document's vector never changes, so
+    case studies can be indexed incrementally.
+    """
+
+    def __init__(self, dimensions=1024):
+        self.dimensions = dimensions
+
+    def _vector(self, text):
+        tokens = tokenize(text)
+        features = Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+        if not features:
+            return [0.0] * self.dimensions
+        hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.uint32, count=len(features))
+        weights = 1.0 + np.log(np.fromiter(features.values(), dtype=np.float64, count=len(features)))
+        # The top bit picks the sign, so colliding features tend to cancel out rather than add up
+        signs = np.where(hashes >> 31, -1.0, 1.0)
+        vector = np.bincount(hashes % self.dimensions, weights=signs * weights, minlength=self.dimensions)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Wrap an embeddings backend so repeated queries aren't embedded twice: in memory
+    (least recently used first out), then in an optional persistent `SQLiteCache`.
+    """
+
+    def __init__(self, embeddings, max_entries=512, cache=None, namespace=""):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.cache = cache
+        self.namespace = namespace
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        key = make_cache_key("query_embedding", self.namespace, text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+        vector = self.cache.get(key) if self.cache else None
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            if self.cache:
+                self.cache.set(key, vector)
+        with self._lock:
+            self.misses += 1
+            self._memory[key] = vector
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return vector
+
+
+class BM25Index:
+    """Okapi BM25 keyword index over a fixed list of texts."""
+
+    def __init__(self, texts, k1=1.5, b=0.75):
+        self.k1, self.b = k1, b
+        documents = [Counter(tokenize(text)) for text in texts]
+        self.size = len(documents)
+        lengths = np.array([sum(counts.values()) for counts in documents], dtype=np.float64)
+        average_length = lengths.mean() if self.size and lengths.mean() else 1.0
+        # Per document length normalization of the term frequency
+        self._norms = k1 * (1 - b + b * lengths / average_length)
+
+        postings = {}
+        for index, counts in enumerate(documents):
+            for term, count in counts.items():
+                postings.setdefault(term, ([], []))
+                postings[term][0].append(index)
+                postings[term][1].append(count)
+        self._postings = {
+            term: (np.array(indexes), np.array(counts, dtype=np.float64), self._idf(len(indexes)))
+            for term, (indexes, counts) in postings.items()
+        }
+
+    def _idf(self, document_frequency):
+        return math.log(1 + (self.size - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def scores(self, query):
+        scores = np.zeros(self.size)
+        for term in set(tokenize(query)):
+            if term in self._postings:
+                indexes, counts, idf = self._postings[term]
+                scores[indexes] += idf * counts * (self.k1 + 1) / (counts + self._norms[indexes])
+        return scores
+
+    def search(self, query, k):
+        """Indexes of the `k` best matching texts (texts without any query term excluded)."""
+        scores = self.scores(query)
+        best = np.argsort(-scores, kind="stable")[:k]
+        return [int(index) for index in best if scores[index] > 0]
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """
+    Merge ranked lists of ids: each id scores sum(1 / (k + rank)) over the lists.
+
+    @return: Ids, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
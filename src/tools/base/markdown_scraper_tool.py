@@ -3,93 +3,234 @@ import html2text
 import requests
 from bs4 import BeautifulSoup
 import time
+from src.cache import make_cache_key
+from src.instrumentation import traced, record
+from .http_session import get_http_session
+from .http_cache import conditional_get, cached_derivation
+from .content_extractor import CONTENT_EXTRACTION_CONFIG, strip_boilerplate
 
+# Browser-like headers, some sites block the default python-requests user agent
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+
+SCRAPER_CONFIG = {
+    "max_bytes": 2_000_000,  # stop reading a page after this many bytes
+    "parser": "auto",  # "selectolax", "lxml", "html.parser" or "auto" (fastest one installed)
+    "max_markdown_chars": 60000,  # markdown conversion stops once this much text is produced
+    "conversion_chunk_chars": 16384,  # HTML fed to the converter between two length checks
+    "strip_boilerplate": True,  # drop menus, link lists, cookie banners & repeated lines (see content_extractor.py)
+    "min_main_content_share": 0.25,  # a main content match holding less of the body's text is ignored
+}
+
+# Tags never worth converting, and the containers holding a page's main content (by priority)
+REMOVED_TAGS = ["script", "style", "nav", "footer", "header"]
+MAIN_SELECTORS = ['main', '[role="main"]', '.main-content', '.content', '#content', '#main', 'article', '.article']
+
+_resolved_parser = None
+
+def configure_scraper(**settings):
+    """
+    Update the page fetching & conversion settings.
+
+    @param settings: Any of max_bytes, parser, max_markdown_chars, conversion_chunk_chars,
+                     strip_boilerplate, min_main_content_share.
+    """
+    global _resolved_parser
+    unknown = set(settings) - set(SCRAPER_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown scraper settings: {', '.join(sorted(unknown))}")
+    SCRAPER_CONFIG.update(settings)
+    _resolved_parser = None
+
+def get_html_parser():
+    """Name of the HTML parser in use, "auto" picks selectolax, then lxml, then the pure-Python html.parser."""
+    global _resolved_parser
+    if _resolved_parser is None:
+        parser = SCRAPER_CONFIG["parser"]
+        if parser == "auto":
+            parser = "html.parser"
+            for name, module in (("selectolax", "selectolax.lexbor"), ("lxml", "lxml")):
+                try:
+                    __import__(module)
+                    parser = name
+                    break
+                except ImportError:
+                    continue
+        _resolved_parser = parser
+    return _resolved_parser
+
+@traced("scrape_website_to_markdown")
 def scrape_website_to_markdown(url: str, max_length: int = 50000) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-    }
-
-    # Make the HTTP request
+    page, _ = fetch_page(url)
+    return page_to_markdown(page, max_length)
+
+def fetch_page(url: str, timeout: float = 30):
+    """
+    GET a web page over the shared pooled session, reading at most `SCRAPER_CONFIG["max_bytes"]`.
+    A cached copy is revalidated with a conditional request and reused when the server
+    answers 304 (see http_cache.py).
+    Raises an exception with a readable message when the page can't be fetched.
+
+    @return: (page, downloaded bytes), page being a dictionary with the "html" & its cached "derived" data.
+    """
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response, page, size = conditional_get(
+            get_http_session(), url, headers=DEFAULT_HEADERS, timeout=timeout, max_bytes=SCRAPER_CONFIG["max_bytes"]
+        )
     except requests.RequestException as e:
         raise Exception(f"Request failed: {e}")
+    record(bytes_fetched=size)
 
     if response.status_code == 403:
         raise Exception(f"Access forbidden (HTTP 403) when fetching the URL. The website may be blocking automated requests. Try accessing the site manually or using a different network/user-agent.")
-    elif response.status_code != 200:
+    elif page is None:
         raise Exception(f"Failed to fetch the URL. Status code: {response.status_code}")
+    return page, size
 
-    # Parse the HTML
-    soup = BeautifulSoup(response.text, "html.parser")
-    
-    # Remove script and style elements to reduce content
-    for script in soup(["script", "style", "nav", "footer", "header"]):
-        script.decompose()
-    
-    # Extract main content areas (prioritize main content over navigation/footer)
-    main_content = ""
-    
-    # Look for main content areas
-    main_selectors = [
-        'main',
-        '[role="main"]',
-        '.main-content',
-        '.content',
-        '#content',
-        '#main',
-        'article',
-        '.article'
+def page_to_markdown(page, max_length: int = 50000) -> str:
+    """
+    Markdown of a fetched page, converted once per version of the page. When the conversion
+    stopped at its length budget, the truncation notice reports the length of the page's HTML.
+    """
+    max_chars = SCRAPER_CONFIG["max_markdown_chars"]
+    if max_length > max_chars:
+        max_chars = max_length
+        markdown_content = convert_html_to_markdown(page["html"], max_chars)
+    else:
+        markdown_content = cached_derivation(page, _markdown_derivation_name(), convert_html_to_markdown)
+    # Conversion stopped at the budget: the full markdown length is unknown
+    html_length = len(page["html"]) if max_chars and len(markdown_content) >= max_chars else None
+    return truncate_markdown(markdown_content, max_length, html_length)
+
+def _markdown_derivation_name():
+    """Name of a page's cached markdown, changing with every setting the conversion depends on."""
+    settings = [
+        get_html_parser(), SCRAPER_CONFIG["max_markdown_chars"], SCRAPER_CONFIG["min_main_content_share"],
+        CONTENT_EXTRACTION_CONFIG if SCRAPER_CONFIG["strip_boilerplate"] else None,
     ]
-    
-    for selector in main_selectors:
-        elements = soup.select(selector)
-        if elements:
-            main_content = str(elements[0])
-            break
-    
-    # If no main content found, use body but filter out navigation/footer
-    if not main_content:
-        body = soup.find('body')
-        if body:
-            # Remove navigation and footer elements
-            for element in body.find_all(['nav', 'footer', 'header', 'aside']):
-                element.decompose()
-            main_content = str(body)
-        else:
-            main_content = soup.prettify()
-    
-    # Convert HTML to markdown
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-    h.ignore_images = True
-    h.ignore_tables = True
-    h.body_width = 0  # Don't wrap text
-    markdown_content = h.handle(main_content)
+    return "markdown:" + make_cache_key(*settings)[:16]
+
+def _text_length(text):
+    return len(re.sub(r"\s+", "", text or ""))
+
+def extract_main_content(html: str, parser: str = None) -> str:
+    """
+    HTML of the main content area of a page, without scripts, styles, navigation & footers.
+    A `MAIN_SELECTORS` match is only trusted when it holds a fair share of the page's text
+    (a `.content` banner or sidebar isn't the main content), otherwise the body is used.
+    """
+    parser = parser or get_html_parser()
+    min_share = SCRAPER_CONFIG["min_main_content_share"]
+    if parser == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(html)
+        for node in tree.css(", ".join(REMOVED_TAGS)):
+            node.decompose()
+        page_text = _text_length(tree.body.text() if tree.body is not None else tree.text())
+        for selector in MAIN_SELECTORS:
+            node = tree.css_first(selector)
+            if node is not None and _text_length(node.text()) >= min_share * page_text:
+                return node.html
+        # If no main content found, use body but filter out asides
+        if tree.body is not None:
+            for node in tree.body.css("aside"):
+                node.decompose()
+            return tree.body.html
+        return tree.html or ""
+
+    soup = BeautifulSoup(html, parser)
+    for element in soup(REMOVED_TAGS):
+        element.decompose()
+    page_text = _text_length(soup.get_text())
+    for selector in MAIN_SELECTORS:
+        element = soup.select_one(selector)
+        if element is not None and _text_length(element.get_text()) >= min_share * page_text:
+            return str(element)
+    body = soup.find('body')
+    if body:
+        for element in body.find_all('aside'):
+            element.decompose()
+        return str(body)
+    return str(soup)
 
+def _clean_markdown(markdown_content: str) -> str:
     # Clean up excess newlines and whitespace
     markdown_content = re.sub(r"\n{3,}", "\n\n", markdown_content)
     markdown_content = re.sub(r" +", " ", markdown_content)
     markdown_content = markdown_content.strip()
+    if SCRAPER_CONFIG["strip_boilerplate"]:
+        markdown_content = strip_boilerplate(markdown_content)
+    return markdown_content
+
+class _MeasuredHTML2Text(html2text.HTML2Text):
+    """HTML2Text keeping the text it has produced so far, to stop converting once it is long enough."""
+
+    def __init__(self):
+        super().__init__()
+        self.produced = []
+
+    def outtextf(self, s: str) -> None:
+        self.produced.append(s)
+        super().outtextf(s)
+
+def convert_html_to_markdown(html: str, max_chars: int = None, parser: str = None) -> str:
+    """
+    Convert the main content of an HTML page to markdown. The HTML is fed to the converter
+    in chunks and conversion stops once `max_chars` characters of markdown are produced
+    (`SCRAPER_CONFIG["max_markdown_chars"]` by default, 0 = convert everything).
+    The result is cut at `max_chars`: parsers serialize the HTML differently, so conversion
+    stops in a different chunk with each of them, but the text before the cut is the same.
+    """
+    max_chars = SCRAPER_CONFIG["max_markdown_chars"] if max_chars is None else max_chars
+    chunk_chars = SCRAPER_CONFIG["conversion_chunk_chars"]
+    main_content = extract_main_content(html, parser)
+
+    h = _MeasuredHTML2Text()
+    h.ignore_links = False
+    h.ignore_images = True
+    h.ignore_tables = True
+    h.body_width = 0  # Don't wrap text
+    for start in range(0, len(main_content), chunk_chars):
+        h.feed(main_content[start:start + chunk_chars])
+        # Whitespace & boilerplate are removed afterwards, only measure once the raw output is long enough
+        if max_chars and sum(map(len, h.produced)) > max_chars:
+            if len(_clean_markdown("".join(h.produced))) > max_chars:
+                break
+    h.feed("")
+    markdown_content = _clean_markdown(h.finish())
+    return markdown_content[:max_chars] if max_chars else markdown_content
+
+def truncate_markdown(markdown_content: str, max_length: int, html_length: int = None) -> str:
+    """
+    Truncate markdown to `max_length` characters, at a sentence boundary when possible.
+
+    @param html_length: Length of the page's HTML when the markdown was already cut short
+                        during conversion, reported instead of the markdown's length.
+    """
+    if len(markdown_content) <= max_length and html_length is None:
+        return markdown_content
+    original_length = len(markdown_content)
+
+    # Try to truncate at a sentence boundary
+    truncated = markdown_content[:max_length]
+    last_period = truncated.rfind('.')
+    last_exclamation = truncated.rfind('!')
+    last_question = truncated.rfind('?')
+    
+    last_sentence_end = max(last_period, last_exclamation, last_question)
+    
+    if last_sentence_end > max_length * 0.8:
+        markdown_content = truncated[:last_sentence_end + 1]
+    else:
+        markdown_content = truncated
     
-    # Truncate if content is too long
-    if len(markdown_content) > max_length:
-        # Try to truncate at a sentence boundary
-        truncated = markdown_content[:max_length]
-        last_period = truncated.rfind('.')
-        last_exclamation = truncated.rfind('!')
-        last_question = truncated.rfind('?')
-        
-        last_sentence_end = max(last_period, last_exclamation, last_question)
-        
-        if last_sentence_end > max_length * 0.8:
-            markdown_content = truncated[:last_sentence_end + 1]
-        else:
-            markdown_content = truncated
-        
-        markdown_content += f"\n\n[Content truncated due to length. Original was {len(markdown_content)} characters.]"
-
-    return markdown_content
\ No newline at end of file
+    if html_length is None:
+        markdown_content += f"\n\n[Content truncated due to length. Original was {original_length} characters.]"
+    else:
+        markdown_content += f"\n\n[Content truncated due to length. Original page was {html_length} characters of HTML.]"
+    return markdown_content
@@ -1,56 +1,182 @@
 import os
 import json
 import requests
+from src.cache import CACHE_DIR, get_shared_cache, make_cache_key, env_flag
+from src.instrumentation import traced, record
+from .http_session import get_http_session
 
-def google_search(query):
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+SERPER_NEWS_URL = "https://google.serper.dev/news"
+# Maximum number of queries sent in one batched Serper request
+SERPER_BATCH_SIZE = 100
+
+# Disk cache of Serper responses, keyed by the normalized query payload.
+# Disable with SEARCH_CACHE_ENABLED=0 in your .env
+SEARCH_CACHE_CONFIG = {
+    "enabled": None,  # None = read SEARCH_CACHE_ENABLED from the environment (default on)
+    "path": os.path.join(CACHE_DIR, "serper_cache.sqlite"),
+    "search_ttl_seconds": 7 * 24 * 3600,
+    "news_ttl_seconds": 6 * 3600,  # news get stale much faster than organic results
+    "max_entries": 20000,
+}
+
+
+class SerperError(Exception):
+    """A Serper request that failed: network error (`status_code` None) or non-200 answer."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_search_cache():
+    """Return the Serper response cache, or None when it is disabled."""
+    enabled = SEARCH_CACHE_CONFIG["enabled"]
+    if enabled is None:
+        enabled = env_flag("SEARCH_CACHE_ENABLED", default=True)
+    if not enabled:
+        return None
+    return get_shared_cache(SEARCH_CACHE_CONFIG["path"], max_entries=SEARCH_CACHE_CONFIG["max_entries"])
+
+
+def _normalize_payload(payload):
+    """Queries differing only by case or whitespace share a cache entry."""
+    normalized = dict(payload)
+    if isinstance(normalized.get("q"), str):
+        normalized["q"] = " ".join(normalized["q"].lower().split())
+    return normalized
+
+
+def _cache_key(url, payload):
+    return make_cache_key("serper", url, _normalize_payload(payload))
+
+
+def _serper_post(url, body):
     """
-    Performs a Google search using the provided query.
+    POST a query (or a list of queries) to Serper through the shared session.
+
+    @return: The JSON response.
+    Raises a `SerperError` (with the HTTP status code, if any) when the request failed.
     """
-    url = "https://google.serper.dev/search"
-    payload = json.dumps({"q": query})
     headers = {
-        'X-API-KEY': os.environ['SERPER_API_KEY'],
-        'content-type': 'application/json'
+        'X-API-KEY': os.getenv("SERPER_API_KEY"),
+        'Content-Type': 'application/json'
     }
-    response = requests.request("POST", url, headers=headers, data=payload)
-    results = response.json().get('organic', [])
+    try:
+        response = get_http_session().post(url, headers=headers, data=json.dumps(body), timeout=30)
+    except requests.RequestException as e:
+        raise SerperError(f"Serper request failed: {e}")
+    record(bytes_fetched=len(response.content))
+    if response.status_code != 200:
+        raise SerperError(f"Serper request failed with status code: {response.status_code}", response.status_code)
+    return response.json()
+
+
+def _serper_request(url, payload, ttl_seconds):
+    """
+    POST a query to Serper, serving it from the disk cache when possible.
+    """
+    cache = get_search_cache()
+    cache_key = _cache_key(url, payload)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            record(cache_hits=1)
+            return cached
+
+    data = _serper_post(url, payload)
+    if cache is not None:
+        cache.set(cache_key, data, ttl_seconds=ttl_seconds)
+    return data
+
+
+@traced("google_search")
+def google_search(query, page=1):
+    """
+    Performs a Google search using the provided query.
+    
+    @param page: Result page to fetch (10 results per page).
+    @return: The organic results, or None when the search failed (Serper error, missing key...),
+             so callers can tell an outage apart from a query without results.
+    """
+    payload = {"q": query}
+    if page > 1:
+        payload["page"] = page
+    try:
+        data = _serper_request(SERPER_SEARCH_URL, payload, SEARCH_CACHE_CONFIG["search_ttl_seconds"])
+    except SerperError as e:
+        print(e)
+        return None
+    return data.get('organic', [])
+
+
+@traced("google_search_many")
+def google_search_many(queries, batch_size=SERPER_BATCH_SIZE):
+    """
+    Performs several Google searches with as few Serper round-trips as possible:
+    cached queries are served from disk, duplicates are sent once and the rest
+    go out as batches of up to `batch_size` queries in a single POST.
+
+    @param queries: List of search queries.
+    @return: The organic results of every query, in the same order as `queries`.
+    """
+    cache = get_search_cache()
+    results = [[] for _ in queries]
+    pending = {}  # cache key -> (payload, indexes of the queries sharing it)
+    for index, query in enumerate(queries):
+        payload = {"q": query}
+        cache_key = _cache_key(SERPER_SEARCH_URL, payload)
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            record(cache_hits=1)
+            results[index] = cached.get('organic', [])
+        else:
+            pending.setdefault(cache_key, (payload, []))[1].append(index)
+
+    pending = list(pending.items())
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        try:
+            responses = _serper_post(SERPER_SEARCH_URL, [payload for _, (payload, _) in batch])
+        except SerperError as e:
+            print(e)
+            responses = None
+        if not isinstance(responses, list) or len(responses) != len(batch):
+            # Failed batch: those queries get no results, like a failed `google_search`
+            continue
+        for (cache_key, (payload, indexes)), data in zip(batch, responses):
+            if cache is not None:
+                cache.set(cache_key, data, ttl_seconds=SEARCH_CACHE_CONFIG["search_ttl_seconds"])
+            for index in indexes:
+                results[index] = data.get('organic', [])
     return results
 
+
+@traced("google_search.news")
 def get_recent_news(company: str) -> str:
-    url = "https://google.serper.dev/news"
-    
     # Define the payload for the request
-    payload = json.dumps({
+    payload = {
         "q": company,
         "num": 20,
         "tbs": "qdr:y"
-    })
-    
-    # Set the headers
-    headers = {
-        'X-API-KEY': os.getenv("SERPER_API_KEY"),
-        'Content-Type': 'application/json'
     }
+    try:
+        data = _serper_request(SERPER_NEWS_URL, payload, SEARCH_CACHE_CONFIG["news_ttl_seconds"])
+    except SerperError as e:
+        return f"Error fetching news: {e.status_code or e}"
+
+    news = list(data.get("news", []))
     
-    # Make the POST request to the API
-    response = requests.post(url, headers=headers, data=payload)
+    # Prepare the string to return
+    news_string = ""
+    news.reverse()  # Reverse the list to get the most recent news first
     
-    # Check if the response is successful
-    if response.status_code == 200:
-        news = response.json().get("news", [])
-        
-        # Prepare the string to return
-        news_string = ""
-        news.reverse()  # Reverse the list to get the most recent news first
+    for item in news:
+        title = item.get('title')
+        snippet = item.get('snippet')
+        date = item.get('date')
+        link = item.get('link')
         
-        for item in news:
-            title = item.get('title')
-            snippet = item.get('snippet')
-            date = item.get('date')
-            link = item.get('link')
-            
-            news_string += f"Title: {title}\nSnippet: {snippet}\nDate: {date}\nURL: {link}\n\n"
-        
-        return news_string
-    else:
-        return f"Error fetching news: {response.status_code}"
\ No newline at end of file
+        news_string += f"Title: {title}\nSnippet: {snippet}\nDate: {date}\nURL: {link}\n\n"
+    
+    return news_string
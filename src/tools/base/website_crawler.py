@@ -0,0 +1,182 @@
+import time
+import threading
+import weakref
+import contextvars
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor, wait
+from bs4 import BeautifulSoup
+from src.instrumentation import traced
+from .markdown_scraper_tool import SCRAPER_CONFIG, fetch_page, page_to_markdown, truncate_markdown
+from .content_extractor import dedupe_lines
+from .http_cache import cached_derivation
+
+# Limits of a single website crawl (homepage + the most relevant same-domain pages)
+WEBSITE_CRAWL_CONFIG = {
+    "max_pages": 5,  # homepage included
+    "max_workers": 4,  # pages fetched at the same time by one crawl
+    "per_domain_concurrency": 2,  # requests in flight to the same domain, across all crawls
+    "max_total_bytes": 3_000_000,  # no new page is fetched once a crawl downloaded this much
+    "deadline_seconds": 20,  # wall-clock limit of a crawl, slower pages are dropped
+    "page_timeout": 10,  # connect/read timeout of a single page
+}
+
+# Pages that tell the most about a company, by priority: one page per group is picked first
+CRAWL_PAGE_KEYWORDS = [
+    ("about", "about-us", "company", "who-we-are"),
+    ("products", "product", "platform"),
+    ("solutions", "solution", "services", "industries"),
+    ("blog", "news", "insights", "resources"),
+    ("careers", "jobs", "join-us"),
+]
+
+# Links to files rather than pages
+SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".zip", ".mp4", ".doc", ".docx", ".xls", ".xlsx")
+
+# Only kept while a crawl of the domain holds its semaphore
+_domain_semaphores = weakref.WeakValueDictionary()
+_domain_semaphores_lock = threading.Lock()
+
+
+def configure_website_crawler(**settings):
+    """
+    Update the website crawl limits.
+
+    @param settings: Any of max_pages, max_workers, per_domain_concurrency, max_total_bytes, deadline_seconds, page_timeout.
+    """
+    unknown = set(settings) - set(WEBSITE_CRAWL_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown website crawler settings: {', '.join(sorted(unknown))}")
+    WEBSITE_CRAWL_CONFIG.update(settings)
+    with _domain_semaphores_lock:
+        _domain_semaphores.clear()
+
+
+def _domain(url):
+    netloc = urlsplit(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _domain_semaphore(domain):
+    with _domain_semaphores_lock:
+        semaphore = _domain_semaphores.get(domain)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(WEBSITE_CRAWL_CONFIG["per_domain_concurrency"])
+            _domain_semaphores[domain] = semaphore
+        return semaphore
+
+
+def extract_anchors(html):
+    """[href, text] of every link of a page."""
+    return [
+        [anchor["href"], anchor.get_text(" ", strip=True)]
+        for anchor in BeautifulSoup(html, "html.parser").find_all("a", href=True)
+    ]
+
+
+def select_crawl_links(anchors, base_url, limit):
+    """
+    Pick up to `limit` same-domain links of a homepage (see `extract_anchors`), about/products/
+    solutions/blog/careers pages first (one per group, shortest path wins), then the runners-up.
+
+    @return: List of (label, url) pairs.
+    """
+    domain = _domain(base_url)
+    home_path = urlsplit(base_url).path.rstrip("/")
+    candidates = {}
+    for href, text in anchors:
+        parts = urlsplit(urljoin(base_url, href))
+        path = parts.path.rstrip("/")
+        if (
+            parts.scheme not in ("http", "https")
+            or _domain(parts.geturl()) != domain
+            or path == home_path
+            or path.lower().endswith(SKIPPED_EXTENSIONS)
+        ):
+            continue
+        # Fragments & tracking parameters don't change the page
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+        candidates.setdefault(url, (path.lower(), text.lower()))
+
+    ranked = [[] for _ in CRAWL_PAGE_KEYWORDS]
+    for url, (path, text) in candidates.items():
+        segments = path.strip("/").split("/")
+        for group, keywords in enumerate(CRAWL_PAGE_KEYWORDS):
+            if any(keyword in segments for keyword in keywords) or text.replace(" ", "-") in keywords:
+                ranked[group].append((len(segments), len(path), url))
+                break
+
+    ranked = [sorted(urls) for urls in ranked]
+    selected = []
+    # Breadth first: the best page of every group, then the second best, ...
+    for rank in range(max((len(urls) for urls in ranked), default=0)):
+        for group, urls in enumerate(ranked):
+            if rank < len(urls) and len(selected) < limit:
+                selected.append((CRAWL_PAGE_KEYWORDS[group][0].capitalize(), urls[rank][2]))
+    return selected
+
+
+@traced("crawl_website_to_markdown")
+def crawl_website_to_markdown(url: str, max_length: int = 50000, max_pages: int = None) -> str:
+    """
+    Fetch a company homepage and its most relevant same-domain pages (about, products,
+    solutions, blog, careers) concurrently, and merge them into one markdown document.
+    A crawl is bounded by `WEBSITE_CRAWL_CONFIG`: page count, per-domain concurrency,
+    total downloaded bytes and a wall-clock deadline. Only a failed homepage raises.
+    """
+    config = WEBSITE_CRAWL_CONFIG
+    max_pages = max_pages or config["max_pages"]
+    deadline = time.monotonic() + config["deadline_seconds"]
+    semaphore = _domain_semaphore(_domain(url))
+    downloaded = {"bytes": 0}
+    budget_lock = threading.Lock()
+
+    def fetch(page_url):
+        with budget_lock:
+            if deadline <= time.monotonic() or downloaded["bytes"] >= config["max_total_bytes"]:
+                return None
+        with semaphore:
+            # Other requests to the domain may have held the semaphore past the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            page, size = fetch_page(page_url, timeout=min(config["page_timeout"], max(remaining, 1)))
+        with budget_lock:
+            downloaded["bytes"] += size
+        return page
+
+    homepage = fetch(url)
+    if homepage is None:
+        raise Exception(f"Crawl deadline of {config['deadline_seconds']}s reached before fetching {url}")
+    links = []
+    if max_pages > 1:
+        # Unchanged (304) homepages reuse their parsed links
+        links = select_crawl_links(cached_derivation(homepage, "anchors", extract_anchors), url, max_pages - 1)
+
+    pages = {}
+    if links:
+        executor = ThreadPoolExecutor(max_workers=max(1, min(config["max_workers"], len(links))))
+        # Keep the caller's instrumentation span (lead & node) in the worker threads
+        futures = {executor.submit(contextvars.copy_context().run, fetch, link): link for _, link in links}
+        done, _ = wait(futures, timeout=max(0, deadline - time.monotonic()))
+        # Pages still loading at the deadline are dropped (not waited for)
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in done:
+            try:
+                page = future.result()
+            except Exception as e:
+                print(f"Skipping {futures[future]}: {e}")
+                continue
+            if page:
+                pages[futures[future]] = page
+
+    # The homepage gets half of the length budget, the other pages share the rest
+    crawled = [(label, link) for label, link in links if link in pages]
+    page_length = (max_length // 2) // max(1, len(crawled))
+    sections = [f"# Home ({url})\n\n" + page_to_markdown(homepage, max_length // 2 if crawled else max_length)]
+    for label, link in crawled:
+        sections.append(f"# {label} ({link})\n\n" + page_to_markdown(pages[link], page_length))
+    markdown_content = "\n\n".join(sections)
+    if SCRAPER_CONFIG["strip_boilerplate"]:
+        # Headers, footers & calls to action repeated on every page are only kept once
+        markdown_content = dedupe_lines(markdown_content)
+    return truncate_markdown(markdown_content, max_length)
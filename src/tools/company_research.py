@@ -26,7 +26,10 @@ This profile provides context for engaging with a prospect who works at the comp
 
 def research_lead_company(linkedin_url):
     # Scrape company LinkedIn profile
-    company_page_content = scrape_linkedin(linkedin_url, True)
+    return structure_company_profile(scrape_linkedin(linkedin_url, True))
+
+def structure_company_profile(company_page_content):
+    """Keep the relevant fields of a scraped company LinkedIn page."""
     if not company_page_content or not isinstance(company_page_content, dict) or "data" not in company_page_content or not company_page_content["data"]:
         return "LinkedIn profile not found"
 
@@ -1,15 +1,16 @@
 # Add this new file: src/tools/existing_clients_loader.py
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from src.utils import get_google_credentials
+from src.instrumentation import traced
+from .base.google_services import get_google_service
 
 class ExistingClientsLoader:
     def __init__(self, spreadsheet_id, sheet_name="Existing Clients"):  # Default to Sheet1
-        self.sheet_service = build("sheets", "v4", credentials=get_google_credentials())
+        self.sheet_service = get_google_service("sheets", "v4")
         self.spreadsheet_id = spreadsheet_id
         self.sheet_name = sheet_name
     
+    @traced("google_sheets.get_existing_clients", kind="google_api")
     def get_existing_clients(self):
         """
         Fetches the list of existing client company names from Google Sheets.
@@ -49,6 +50,7 @@ class ExistingClientsLoader:
             # Return default list if sheet is not accessible
             return ["Genetec", "Nokia", "Siemens", "Google", "Palentir", "Emerson"]
     
+    @traced("google_sheets.add_new_client", kind="google_api")
     def add_new_client(self, company_name):
         """
         Adds a new client to the existing clients sheet in column B.
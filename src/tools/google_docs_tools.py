@@ -1,57 +1,164 @@
-import os, re
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from src.utils import get_google_credentials
+import os, re, io
+import time
+import random
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from src.cache import CACHE_DIR, get_shared_cache, make_cache_key
+from src.instrumentation import traced
+from .base.google_services import get_google_service
+
+GOOGLE_DOCS_CONFIG = {
+    "folder_cache_path": os.path.join(CACHE_DIR, "drive_folders.sqlite"),  # folder name -> ID, kept across runs
+    "folder_cache_ttl_seconds": 90 * 24 * 3600,
+    "folder_revalidate_seconds": 600,  # older cached folders are checked (deleted/trashed) before use
+    "max_workers": 6,  # documents uploaded at the same time, across all leads
+    "batch_size": 100,  # Drive batch requests hold at most 100 calls
+    "num_retries": 5,  # retries (exponential backoff) of rate limited (403/429) & 5xx requests
+}
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+DOCUMENT_MIME_TYPE = "application/vnd.google-apps.document"
+ANYONE_READER = {"type": "anyone", "role": "reader"}
+
+# Drive errors worth retrying: rate limits & transient server errors
+RETRIED_STATUSES = (429, 500, 502, 503, 504)
+
+_folders = {}
+_folder_locks = {}
+_folders_lock = threading.Lock()  # guards the two dicts above, never held during API calls
+_upload_executor = None
+_upload_executor_lock = threading.Lock()
+
+
+def configure_google_docs(**settings):
+    """
+    Update the Google Docs manager settings.
+
+    @param settings: Any of folder_cache_path, folder_cache_ttl_seconds, folder_revalidate_seconds,
+                     max_workers, batch_size, num_retries.
+    """
+    global _upload_executor
+    unknown = set(settings) - set(GOOGLE_DOCS_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown Google Docs settings: {', '.join(sorted(unknown))}")
+    GOOGLE_DOCS_CONFIG.update(settings)
+    with _folders_lock:
+        _folders.clear()
+    with _upload_executor_lock:
+        if _upload_executor is not None:
+            _upload_executor.shutdown(wait=False)
+        _upload_executor = None
+
+
+def _folder_cache():
+    return get_shared_cache(GOOGLE_DOCS_CONFIG["folder_cache_path"], ttl_seconds=GOOGLE_DOCS_CONFIG["folder_cache_ttl_seconds"])
+
+
+def _status(error):
+    return getattr(getattr(error, "resp", None), "status", None)
+
+
+def _is_not_found(error):
+    return _status(error) == 404
+
+
+def _is_retryable(error):
+    # Drive answers 403 both to rate limits and to missing permissions
+    if _status(error) == 403:
+        return b"ratelimitexceeded" in (getattr(error, "content", None) or b"").lower()
+    return _status(error) in RETRIED_STATUSES
+
+
+def _folder_lock(folder_name):
+    with _folders_lock:
+        return _folder_locks.setdefault(folder_name, threading.Lock())
+
+
+def _get_upload_executor():
+    """
+    Thread pool shared by every upload: its threads keep their pooled Drive connection
+    (see `_thread_http` in google_services.py) and bound the concurrent writes of all leads.
+    """
+    global _upload_executor
+    if _upload_executor is None:
+        with _upload_executor_lock:
+            if _upload_executor is None:
+                _upload_executor = ThreadPoolExecutor(
+                    max_workers=GOOGLE_DOCS_CONFIG["max_workers"], thread_name_prefix="google-docs-upload"
+                )
+    return _upload_executor
+
 
 class GoogleDocsManager:
-    def __init__(self):
-        self.docs_service = build('docs', 'v1', credentials=get_google_credentials())
-        self.drive_service = build('drive', 'v3', credentials=get_google_credentials())
+    # Services are built on first use and shared by every manager & thread
+    @property
+    def docs_service(self):
+        return get_google_service('docs', 'v1')
+
+    @property
+    def drive_service(self):
+        return get_google_service('drive', 'v3')
 
+    @traced("google_docs.add_document", kind="google_api")
     def add_document(self, content, doc_title, folder_name, make_shareable=False, folder_shareable=False, markdown=False):
         """
         Create a Google Document and save it in the specified folder.
         """
+        results = self.add_documents(
+            [{"content": content, "title": doc_title, "markdown": markdown}],
+            folder_name, make_shareable=make_shareable, folder_shareable=folder_shareable,
+        )
+        return results[0]
+
+    @traced("google_docs.add_documents", kind="google_api")
+    def add_documents(self, documents, folder_name, make_shareable=False, folder_shareable=False):
+        """
+        Create several Google Documents in the specified folder, in a couple of round-trips:
+        the folder ID comes from the folder cache, documents are uploaded concurrently straight
+        into the folder (no move), then all permissions are created in one batch request.
+
+        @param documents: List of {"content", "title", "markdown"} dictionaries.
+        @return: One {"document_url", "shareable_url", "folder_url"} dictionary per document (None if it failed).
+        """
         try:
-            # Ensure the folder exists
-            folder_id, folder_url = self._get_or_create_folder(folder_name, make_shareable=folder_shareable)
-            if not folder_id:
+            folder = self._get_or_create_folder(folder_name)
+            if not folder:
                 raise ValueError("Failed to get or create the folder.")
+            try:
+                created = self._upload_documents(documents, folder["id"])
+            except Exception as e:
+                if not _is_not_found(e):
+                    raise
+                # The cached folder was deleted in Drive: look it up (or create it) again
+                self._forget_folder(folder_name)
+                folder = self._get_or_create_folder(folder_name)
+                created = self._upload_documents(documents, folder["id"])
+
+            shares = [file["id"] for file in created if file and make_shareable]
+            if folder_shareable and not folder.get("shared"):
+                shares.append(folder["id"])
+            failed_shares = self._share_files(shares)
+            if folder_shareable and folder["id"] not in failed_shares and not folder.get("shared"):
+                self._remember_folder(folder_name, {**folder, "shared": True})
 
-            if markdown:
-                # Convert Markdown to Google Doc
-                doc_id = self._convert_markdown_to_google_doc(content, doc_title)
-            else:
-                # Create a new Google Document and add content
-                doc = self.docs_service.documents().create(body={"title": doc_title}).execute()
-                doc_id = doc.get('documentId')
-
-                # Add content to the document
-                requests = [{"insertText": {"location": {"index": 1}, "text": content}}]
-                self.docs_service.documents().batchUpdate(documentId=doc_id, body={"requests": requests}).execute()
-
-            # Move the document to the folder
-            self.drive_service.files().update(
-                fileId=doc_id,
-                addParents=folder_id,
-                removeParents="root",
-                fields="id, parents"
-            ).execute()
-
-            shareable_url = None
-            if make_shareable:
-                shareable_url = self._make_document_shareable(doc_id)
-
-            document_url = f"https://docs.google.com/document/d/{doc_id}"
-            return {
-                "document_url": document_url,  
-                "shareable_url": shareable_url,
-                "folder_url": folder_url
-            }
+            results = []
+            for file in created:
+                if not file:
+                    results.append(None)
+                    continue
+                shared = make_shareable and file["id"] not in failed_shares
+                results.append({
+                    "document_url": f"https://docs.google.com/document/d/{file['id']}",
+                    "shareable_url": file.get("webViewLink") if shared else None,
+                    "folder_url": folder.get("link"),
+                })
+            return results
         except Exception as e:
             print(f"An error occurred: {e}")
-            return None
+            return [None] * len(documents)
 
+    @traced("google_docs.get_document", kind="google_api")
     def get_document(self, doc_url):
         """
         Retrieve the content of a Google Document by its URL.
@@ -76,75 +183,165 @@ class GoogleDocsManager:
             print(f"An error occurred: {e}")
             return None
         
-    def _get_or_create_folder(self, folder_name, make_shareable=False):
+    def _get_or_create_folder(self, folder_name):
         """
         Get the ID and link of an existing folder with the specified name, or create one if it doesn't exist.
+        Folders are remembered in memory and on disk, so a known folder costs no API call. Entries
+        older than `folder_revalidate_seconds` are checked first: Drive accepts trashed folders
+        as parents, so documents would silently land in the trash.
+
+        @return: {"id", "link", "shared", "checked_at"} or None.
         """
+        key = make_cache_key("drive_folder", folder_name)
         try:
-            # Search for the folder
-            query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
-            results = self.drive_service.files().list(q=query, spaces='drive', fields="files(id, name, webViewLink)").execute()
-            files = results.get('files', [])
-            
-            if files:
-                # Folder exists
-                folder = files[0]
-                folder_id = folder['id']
-                folder_link = folder.get('webViewLink')
-            else:
-                # Folder doesn't exist, create it
-                file_metadata = {
-                    'name': folder_name,
-                    'mimeType': 'application/vnd.google-apps.folder'
-                }
-                folder = self.drive_service.files().create(body=file_metadata, fields='id, webViewLink').execute()
-                folder_id = folder['id']
-                folder_link = folder.get('webViewLink')
-
-            # Make the folder shareable if required
-            if make_shareable:
-                self.drive_service.permissions().create(
-                    fileId=folder_id,
-                    body={"type": "anyone", "role": "reader"},
-                    fields="id"
-                ).execute()
-
-            return folder_id, folder_link
+            # One lock per folder name: lookups of other folders never wait for this one's API calls
+            with _folder_lock(folder_name):
+                with _folders_lock:
+                    folder = _folders.get(folder_name)
+                if folder is None:
+                    folder = _folder_cache().get(key)
+                if folder and not self._is_folder_usable(folder):
+                    folder = None
+                if folder is None:
+                    folder = self._find_or_create_folder(folder_name)
+                    _folder_cache().set(key, folder)
+                with _folders_lock:
+                    _folders[folder_name] = folder
+                return folder
         except Exception as e:
             print(f"An error occurred while retrieving or creating the folder: {e}")
-            return None, None
+            return None
 
-    def _make_document_shareable(self, doc_id):
-        """Make a document shareable with anyone who has the link."""
+    def _is_folder_usable(self, folder):
+        """False when a cached folder was deleted or trashed since it was last checked."""
+        if time.time() - folder.get("checked_at", 0) < GOOGLE_DOCS_CONFIG["folder_revalidate_seconds"]:
+            return True
         try:
-            self.drive_service.permissions().create(
-                fileId=doc_id,
-                body={"type": "anyone", "role": "reader"},
-                fields="id"
-            ).execute()
-            file_info = self.drive_service.files().get(fileId=doc_id, fields="webViewLink").execute()
-            return file_info.get("webViewLink")
+            found = self.drive_service.files().get(fileId=folder["id"], fields="id, trashed").execute(
+                num_retries=GOOGLE_DOCS_CONFIG["num_retries"]
+            )
         except Exception as e:
-            print(f"Failed to make document shareable: {e}")
-            return None
+            if _is_not_found(e):
+                return False
+            raise
+        if found.get("trashed"):
+            return False
+        folder["checked_at"] = time.time()
+        return True
 
-    def _convert_markdown_to_google_doc(self, markdown_content, title):
-        """Convert Markdown content to a Google Document."""
-        try:
-            # Save the Markdown content as a temporary file
-            temp_file_path = "temp_markdown.md"
-            with open(temp_file_path, "w") as file:
-                file.write(markdown_content)
+    def _find_or_create_folder(self, folder_name):
+        num_retries = GOOGLE_DOCS_CONFIG["num_retries"]
+        # Search for the folder
+        escaped_name = folder_name.replace("\\", "\\\\").replace("'", "\\'")
+        query = f"mimeType='{FOLDER_MIME_TYPE}' and name='{escaped_name}' and trashed=false"
+        results = self.drive_service.files().list(q=query, spaces='drive', fields="files(id, name, webViewLink)").execute(
+            num_retries=num_retries
+        )
+        files = results.get('files', [])
+        if files:
+            # Folder exists
+            found = files[0]
+        else:
+            # Folder doesn't exist, create it
+            file_metadata = {'name': folder_name, 'mimeType': FOLDER_MIME_TYPE}
+            found = self.drive_service.files().create(body=file_metadata, fields='id, webViewLink').execute(
+                num_retries=num_retries
+            )
+        return {"id": found['id'], "link": found.get('webViewLink'), "shared": False, "checked_at": time.time()}
 
-            # Upload the Markdown file to Google Drive
-            file_metadata = {"name": title, "mimeType": "application/vnd.google-apps.document"}
-            media = MediaFileUpload(temp_file_path, mimetype="text/markdown")
-            file = self.drive_service.files().create(body=file_metadata, media_body=media, fields="id").execute()
+    def _remember_folder(self, folder_name, folder):
+        with _folders_lock:
+            _folders[folder_name] = folder
+        _folder_cache().set(make_cache_key("drive_folder", folder_name), folder)
 
-            # Cleanup the temporary file
-            os.remove(temp_file_path)
+    def _forget_folder(self, folder_name):
+        with _folders_lock:
+            _folders.pop(folder_name, None)
+        _folder_cache().delete(make_cache_key("drive_folder", folder_name))
 
-            return file.get("id")
-        except Exception as e:
-            print(f"Failed to convert Markdown to Google Doc: {e}")
-            return None
+    def _upload_documents(self, documents, folder_id):
+        """
+        Upload documents as Google Docs directly inside `folder_id`, concurrently.
+        Drive batch requests can't carry media uploads, so each document is one multipart request.
+
+        @return: One {"id", "webViewLink"} dictionary per document (None if it failed).
+        Raises the error of a missing folder (404), so the caller can refresh its ID.
+        """
+        def upload(document):
+            try:
+                return self._convert_markdown_to_google_doc(
+                    document["content"], document["title"], folder_id, markdown=document.get("markdown", False)
+                )
+            except Exception as e:
+                if _is_not_found(e):
+                    raise
+                print(f"Failed to create Google Doc {document['title']}: {e}")
+                return None
+
+        if len(documents) == 1:
+            return [upload(documents[0])]
+        # Keep the caller's instrumentation span (lead & node) in the worker threads
+        futures = [_get_upload_executor().submit(contextvars.copy_context().run, upload, document) for document in documents]
+        return [future.result() for future in futures]
+
+    def _share_files(self, file_ids):
+        """
+        Make files shareable with anyone who has the link, in batch requests.
+        Calls of a batch that were rate limited (or hit a 5xx) are retried in a new batch.
+
+        @return: IDs of the files that couldn't be shared.
+        """
+        failed = set()
+        pending = list(file_ids)
+        for attempt in range(GOOGLE_DOCS_CONFIG["num_retries"] + 1):
+            if not pending:
+                break
+            if attempt:
+                time.sleep(min(2 ** attempt, 32) * random.uniform(0.5, 1))
+            retried = []
+
+            def callback(request_id, response, exception):
+                if exception is None:
+                    return
+                if _is_retryable(exception):
+                    retried.append(request_id)
+                else:
+                    print(f"Failed to make {request_id} shareable: {exception}")
+                    failed.add(request_id)
+
+            batch_size = GOOGLE_DOCS_CONFIG["batch_size"]
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                batch = self.drive_service.new_batch_http_request(callback=callback)
+                for file_id in chunk:
+                    batch.add(self.drive_service.permissions().create(fileId=file_id, body=ANYONE_READER, fields="id"), request_id=file_id)
+                try:
+                    batch.execute()
+                except Exception as e:
+                    print(f"Failed to make documents shareable: {e}")
+                    if _is_retryable(e):
+                        retried.extend(chunk)
+                    else:
+                        failed.update(chunk)
+            pending = retried
+        if pending:
+            print(f"Failed to make {len(pending)} documents shareable: rate limited")
+            failed.update(pending)
+        return failed
+
+    def _convert_markdown_to_google_doc(self, content, title, folder_id=None, markdown=True):
+        """
+        Upload Markdown (or plain text) content as a Google Document, inside `folder_id` when given.
+
+        @return: {"id", "webViewLink"} of the new document.
+        """
+        from googleapiclient.http import MediaIoBaseUpload
+
+        file_metadata = {"name": title, "mimeType": DOCUMENT_MIME_TYPE}
+        if folder_id:
+            file_metadata["parents"] = [folder_id]
+        # Uploaded from memory: no temporary file shared between concurrent uploads
+        media = MediaIoBaseUpload(io.BytesIO(content.encode("utf-8")), mimetype="text/markdown" if markdown else "text/plain")
+        return self.drive_service.files().create(body=file_metadata, media_body=media, fields="id, webViewLink").execute(
+            num_retries=GOOGLE_DOCS_CONFIG["num_retries"]
+        )
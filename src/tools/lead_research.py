@@ -1,5 +1,5 @@
 from src.utils import invoke_llm
-from .base.search_tools import google_search
+from .base.search_tools import google_search, google_search_many, get_search_cache
 from .base.linkedin_tools import extract_linkedin_url, scrape_linkedin
 
 
@@ -32,6 +32,20 @@ def extract_company_name(email):
     except IndexError:
         return "Company not found"
 
+def linkedin_search_query(lead_name, lead_email):
+    """Google query used to find the lead's LinkedIn profile."""
+    return f"LinkedIn {lead_name} {extract_company_name(lead_email)}"
+
+def prefetch_linkedin_searches(leads):
+    """
+    Runs the LinkedIn profile searches of many leads in batched Serper requests.
+    The results land in the search cache, where `research_lead_on_linkedin` picks them up.
+    Does nothing when the search cache is disabled.
+    """
+    if get_search_cache() is None or len(leads) < 2:
+        return
+    google_search_many([linkedin_search_query(lead.name, lead.email) for lead in leads])
+
 def research_lead_on_linkedin(lead_name, lead_email):
     """
     Searches for the lead's LinkedIn profile based on the lead name and company name.
@@ -39,13 +53,11 @@ def research_lead_on_linkedin(lead_name, lead_email):
     @param lead_name: The name of the lead to search for.
     @return: A dictionary containing the lead profile data or an error message if not found.
     """
-    # extract company name from pro email
-    company_name = extract_company_name(lead_email)
-        
     # Find lead LinkedIn URL by searching on Google 'LinkedIn {{lead name}} {{company name}}'
-    query = f"LinkedIn {lead_name} {company_name}"
-    search_results = google_search(query)
-    lead_linkedin_url = extract_linkedin_url(search_results)
+    # (company name extracted from the pro email)
+    query = linkedin_search_query(lead_name, lead_email)
+    search_results = google_search(query) or []
+    lead_linkedin_url = extract_linkedin_url(search_results, lead_name, extract_company_name(lead_email))
     if not lead_linkedin_url:
         return "Lead LinkedIn URL not found."
 
@@ -1,15 +1,16 @@
 from googleapiclient.errors import HttpError
-from googleapiclient.discovery import build
 from .lead_loader_base import LeadLoaderBase
-from src.utils import get_google_credentials
+from src.instrumentation import traced
+from ..base.google_services import get_google_service
 
 
 class GoogleSheetLeadLoader(LeadLoaderBase):
     def __init__(self, spreadsheet_id, sheet_name=None):
-        self.sheet_service = build("sheets", "v4", credentials=get_google_credentials())
+        self.sheet_service = get_google_service("sheets", "v4")
         self.spreadsheet_id = spreadsheet_id
         self.sheet_name = sheet_name or self._get_sheet_name_from_id()
         
+    @traced("google_sheets.fetch_records", kind="google_api")
     def fetch_records(self, lead_ids=None, status_filter="NEW"):
         """
         Fetches leads from Google Sheets. If lead IDs are provided, fetch those specific records.
@@ -40,6 +41,7 @@ class GoogleSheetLeadLoader(LeadLoaderBase):
             print(f"Error fetching records from Google Sheets: {e}")
             return []
 
+    @traced("google_sheets.update_record", kind="google_api")
     def update_record(self, id, fields_to_update):
         try:
             # Fetch the header row to identify column indices
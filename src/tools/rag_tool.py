@@ -1,27 +1,242 @@
 import os
-from langchain_community.document_loaders import DirectoryLoader
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_chroma import Chroma
+import json
+import hashlib
+import threading
+from src.cache import CACHE_DIR, get_shared_cache
+
+RAG_CONFIG = {
+    "database_path": "database",  # Chroma persist directory
+    "case_studies_dir": os.path.join("data", "case_studies"),
+    "embedding_backend": None,  # "google" or "local"; None = read RAG_EMBEDDING_BACKEND (default google)
+    "embedding_model": "models/text-embedding-004",  # google backend
+    "local_dimensions": 1024,  # local backend vector size
+    "k": 1,  # case studies returned per query
+    "hybrid": True,  # fuse the vector search with a BM25 keyword search
+    "candidates": 20,  # results of each search passed to the rank fusion
+    "rrf_k": 60,  # reciprocal rank fusion constant, higher flattens the rank differences
+    "query_cache_size": 512,  # query embeddings kept in memory
+    "query_cache_path": os.path.join(CACHE_DIR, "query_embeddings.sqlite"),  # remote backends only
+}
+
+# Chroma collection of each embedding backend (their vectors aren't comparable)
+COLLECTIONS = {"google": "langchain", "local": "case_studies_local"}
+
+# Read directly instead of through unstructured (which needs NLP models for plain text)
+TEXT_EXTENSIONS = (".txt", ".md")
+
+_vector_store = None
+_keyword_index = None
+_vector_store_lock = threading.Lock()
+
+
+def configure_rag(**settings):
+    """
+    Update the case study retrieval settings. The vector store is reopened on next use.
+
+    @param settings: Any of the `RAG_CONFIG` keys.
+    """
+    global _vector_store, _keyword_index
+    unknown = set(settings) - set(RAG_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown RAG settings: {', '.join(sorted(unknown))}")
+    with _vector_store_lock:
+        RAG_CONFIG.update(settings)
+        _vector_store = _keyword_index = None
+
+
+def get_embedding_backend():
+    backend = RAG_CONFIG["embedding_backend"] or os.getenv("RAG_EMBEDDING_BACKEND") or "google"
+    if backend not in COLLECTIONS:
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(COLLECTIONS)})")
+    return backend
+
+
+def get_embeddings():
+    """Embeddings of the configured backend, with cached query embeddings."""
+    from .base.local_retrieval import HashingEmbeddings, CachedQueryEmbeddings
+
+    backend = get_embedding_backend()
+    if backend == "local":
+        return CachedQueryEmbeddings(
+            HashingEmbeddings(RAG_CONFIG["local_dimensions"]), RAG_CONFIG["query_cache_size"],
+            namespace=f"local:{RAG_CONFIG['local_dimensions']}",
+        )
+    # The embeddings client takes seconds to import, only load it when needed
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    # Remote query embeddings are also kept on disk: a known query costs no API call
+    return CachedQueryEmbeddings(
+        GoogleGenerativeAIEmbeddings(model=RAG_CONFIG["embedding_model"]), RAG_CONFIG["query_cache_size"],
+        cache=get_shared_cache(RAG_CONFIG["query_cache_path"], max_entries=20000),
+        namespace=f"google:{RAG_CONFIG['embedding_model']}",
+    )
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_path():
+    """Case study file -> content hash & chunk ids, one manifest per embedding backend."""
+    backend = get_embedding_backend()
+    suffix = "" if backend == "google" else f"_{backend}"
+    return os.path.join(RAG_CONFIG["database_path"], f"case_studies_manifest{suffix}.json")
+
+
+def _load_manifest():
+    try:
+        with open(_manifest_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_manifest(manifest):
+    os.makedirs(RAG_CONFIG["database_path"], exist_ok=True)
+    temporary_path = _manifest_path() + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temporary_path, _manifest_path())
+
+
+def _case_study_files():
+    """Relative path -> absolute path of every case study file."""
+    folder = RAG_CONFIG["case_studies_dir"]
+    files = {}
+    for directory, _, filenames in os.walk(folder):
+        for filename in filenames:
+            if not filename.startswith("."):
+                path = os.path.join(directory, filename)
+                files[os.path.relpath(path, folder).replace(os.sep, "/")] = path
+    return files
+
+
+def _load_case_study(path):
+    from langchain_community.document_loaders import TextLoader, UnstructuredFileLoader
+
+    if path.lower().endswith(TEXT_EXTENSIONS):
+        return TextLoader(path, encoding="utf-8").load()
+    return UnstructuredFileLoader(path).load()
+
+
+def index_case_studies(vectorstore):
+    """
+    Bring the vector store in line with the case study folder: only new or changed files
+    are embedded, the chunks of changed & deleted files are removed.
+
+    @return: Number of files added, updated, removed and unchanged.
+    """
+    manifest = _load_manifest()
+    if manifest is None:
+        # Stores built before the manifest existed have unknown chunk ids: start over
+        vectorstore.reset_collection()
+        manifest = {}
+
+    stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    files = _case_study_files()
+    for name in sorted(set(manifest) - set(files)):
+        vectorstore.delete(ids=manifest.pop(name)["ids"])
+        stats["removed"] += 1
+        _save_manifest(manifest)
+
+    for name, path in sorted(files.items()):
+        file_hash = _file_hash(path)
+        entry = manifest.get(name)
+        if entry and entry["sha256"] == file_hash:
+            stats["unchanged"] += 1
+            continue
+        if entry:
+            vectorstore.delete(ids=entry["ids"])
+        docs = _load_case_study(path)
+        ids = [f"{name}#{number}" for number in range(len(docs))]
+        if docs:
+            vectorstore.add_documents(docs, ids=ids)
+        manifest[name] = {"sha256": file_hash, "ids": ids}
+        stats["updated" if entry else "added"] += 1
+        # Saved after every file: an interrupted indexing resumes where it stopped
+        _save_manifest(manifest)
+
+    if not manifest:
+        _save_manifest(manifest)
+    return stats
+
 
 def get_vector_store():
-    """Get or create the vector store."""
-    database_path = "database"
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/text-embedding-004")
-    
-    if os.path.exists(database_path) and os.listdir(database_path):
-        # Use the existing vector store
-        vectorstore = Chroma(persist_directory=database_path, embedding_function=embeddings)
-    else:
-        # Load documents and create a new vector store
-        loader = DirectoryLoader("./data/case_studies")
-        docs = loader.load()
-        vectorstore = Chroma.from_documents(docs, embeddings, persist_directory=database_path)
-    
-    return vectorstore
-
-def fetch_similar_case_study(description):
-    """Fetch the most similar case study to the given description."""
+    """
+    Return the process-wide case study vector store, opened (and incrementally
+    indexed, see `index_case_studies`) on first use.
+    """
+    global _vector_store
+    if _vector_store is None:
+        with _vector_store_lock:
+            if _vector_store is None:
+                # Chroma takes seconds to import, only load it when needed
+                from langchain_chroma import Chroma
+
+                vectorstore = Chroma(
+                    collection_name=COLLECTIONS[get_embedding_backend()],
+                    persist_directory=RAG_CONFIG["database_path"],
+                    embedding_function=get_embeddings(),
+                )
+                stats = index_case_studies(vectorstore)
+                if stats["added"] or stats["updated"] or stats["removed"]:
+                    print(
+                        f"Case study index: {stats['added']} added, {stats['updated']} updated, "
+                        f"{stats['removed']} removed, {stats['unchanged']} unchanged"
+                    )
+                _vector_store = vectorstore
+    return _vector_store
+
+
+def get_keyword_index():
+    """
+    BM25 index of the case study chunks, built once from the vector store's content.
+
+    @return: (BM25Index, chunk Documents in index order)
+    """
+    global _keyword_index
     vectorstore = get_vector_store()
-    vectorstore_retreiver = vectorstore.as_retriever(search_kwargs={"k": 1})
-    docs = vectorstore_retreiver.invoke(description)
-    return docs[0].page_content
\ No newline at end of file
+    if _keyword_index is None:
+        with _vector_store_lock:
+            if _keyword_index is None:
+                from langchain_core.documents import Document
+                from .base.local_retrieval import BM25Index
+
+                content = vectorstore.get(include=["documents", "metadatas"])
+                docs = [
+                    Document(page_content=text, metadata=metadata or {}, id=doc_id)
+                    for doc_id, text, metadata in zip(content["ids"], content["documents"], content["metadatas"])
+                ]
+                _keyword_index = (BM25Index([doc.page_content for doc in docs]), docs)
+    return _keyword_index
+
+
+def search_case_studies(description, k=None):
+    """
+    Case study chunks most similar to `description`: vector search fused with BM25
+    keyword search (reciprocal rank fusion) unless `RAG_CONFIG["hybrid"]` is off.
+    """
+    from .base.local_retrieval import reciprocal_rank_fusion
+
+    k = k or RAG_CONFIG["k"]
+    vectorstore = get_vector_store()
+    if not RAG_CONFIG["hybrid"]:
+        return vectorstore.similarity_search(description, k=k)
+
+    keyword_index, docs = get_keyword_index()
+    candidates = max(k, RAG_CONFIG["candidates"])
+    vector_ids = [doc.id for doc in vectorstore.similarity_search(description, k=min(candidates, len(docs)))] if docs else []
+    keyword_ids = [docs[index].id for index in keyword_index.search(description, candidates)]
+    docs_by_id = {doc.id: doc for doc in docs}
+    fused = reciprocal_rank_fusion([vector_ids, keyword_ids], RAG_CONFIG["rrf_k"])
+    return [docs_by_id[doc_id] for doc_id in fused[:k] if doc_id in docs_by_id]
+
+
+def fetch_similar_case_study(description, k=None):
+    """Fetch the most similar case studies (`RAG_CONFIG["k"]` by default) to the given description."""
+    docs = search_case_studies(description, k)
+    return "\n\n---\n\n".join(doc.page_content for doc in docs)
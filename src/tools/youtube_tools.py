@@ -1,5 +1,6 @@
 import re, os
-import googleapiclient.discovery
+from src.instrumentation import traced
+from .base.google_services import get_google_service
 
 def extract_channel_name(url):
     # Regular expression to extract the channel name after '@'
@@ -13,7 +14,7 @@ def get_channel_id_by_name(channel_name):
     """
     Get the channel ID from the channel name.
     """
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+    youtube = get_google_service("youtube", "v3", developer_key=os.getenv("YOUTUBE_API_KEY"))
     request = youtube.search().list(
         part="snippet",
         q=channel_name,
@@ -31,7 +32,7 @@ def get_channel_videos_stats(channel_id):
     Get total videos count, details of the last 15 videos, 
     and average views and likes for all videos.
     """
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=os.getenv("YOUTUBE_API_KEY"))
+    youtube = get_google_service("youtube", "v3", developer_key=os.getenv("YOUTUBE_API_KEY"))
     
     # Fetch channel statistics for the total video count
     channel_request = youtube.channels().list(
@@ -114,6 +115,7 @@ def get_channel_videos_stats(channel_id):
         "average_likes": avg_likes
     }
     
+@traced("youtube.get_youtube_stats", kind="google_api")
 def get_youtube_stats(channel_url):
     channel_name = extract_channel_name(channel_url)
     channel_id = get_channel_id_by_name(channel_name)
@@ -3,12 +3,11 @@ import json
 from datetime import datetime
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google.generativeai import GenerativeModel
-import tiktoken
+from . import token_budget
+from .token_budget import fit_to_token_budget
+from .llm_clients import get_llm_client
+from .cache import get_llm_cache, make_cache_key
+from .instrumentation import traced, record, record_llm_usage
 
 # Set the scopes for Google API
 SCOPES = [
@@ -22,21 +21,37 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive"
 ]
 
+# Cached OAuth token of the Google APIs (created by the consent flow on first run)
+GOOGLE_TOKEN_FILE = 'token.json'
+
+
+# Sampling temperature used for every LLM call
+LLM_TEMPERATURE = 0.1
+
 
 def get_current_date():
     return datetime.now().strftime("%Y-%m-%d")
 
 def get_google_credentials():
+    """
+    Load the OAuth credentials from `token.json`, refreshing or running the consent flow when needed.
+    Prefer `get_shared_google_credentials` (tools/base/google_services.py), which only does this once.
+    """
+    # Google auth libraries are only loaded by the workers that actually call Google APIs
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
     creds = None
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+    if os.path.exists(GOOGLE_TOKEN_FILE):
+        creds = Credentials.from_authorized_user_file(GOOGLE_TOKEN_FILE, SCOPES)
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
             flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
             creds = flow.run_local_server(port=0)
-        with open('token.json', 'w') as token:
+        with open(GOOGLE_TOKEN_FILE, 'w') as token:
             token.write(creds.to_json())
     return creds
     
@@ -63,120 +78,133 @@ def save_reports_locally(reports):
         with open(file_path, "w", encoding="utf-8") as file:
             file.write(report.content)
 
-def get_llm_by_provider(llm_provider, model):
-    # Find provider
-    if llm_provider == "openai":
-        from langchain_openai import ChatOpenAI
-        llm = ChatOpenAI(model=model, temperature=0.1)
-    elif llm_provider == "anthropic":
-        # Skip anthropic for now if it's causing issues
-        raise ValueError("Anthropic provider not configured for this version")
-    elif llm_provider == "google":
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        from google.generativeai import GenerativeModel
-
-        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-        client = GenerativeModel(model_name=model)
-        llm = ChatGoogleGenerativeAI(
-            client=client,
-            model=model,
-            temperature=0.1
-        )
-    else:
-        raise ValueError(f"Unsupported LLM provider: {llm_provider}")
-    return llm
+def get_llm_by_provider(llm_provider, model, temperature=LLM_TEMPERATURE):
+    # Reuse a pooled client instead of building a new one on every call
+    return get_llm_client(llm_provider, model, temperature)
 
 def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
     """
     Count the number of tokens in a text string.
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
-    except Exception:
-        # Fallback: rough estimation (1 token ≈ 4 characters)
-        return len(text) // 4
+    return token_budget.count_tokens(text, model)
 
 def truncate_content_to_fit_tokens(content: str, max_tokens: int = 12000, model: str = "gpt-3.5-turbo") -> str:
     """
     Truncate content to fit within token limits, preserving important information.
     """
-    current_tokens = count_tokens(content, model)
-    
-    if current_tokens <= max_tokens:
-        return content
-    
-    # Calculate how much we need to reduce
-    reduction_ratio = max_tokens / current_tokens
-    target_length = int(len(content) * reduction_ratio * 0.9)  # 10% buffer
-    
-    # Try to truncate intelligently by finding sentence boundaries
-    truncated = content[:target_length]
-    
-    # Find the last complete sentence
-    last_period = truncated.rfind('.')
-    last_exclamation = truncated.rfind('!')
-    last_question = truncated.rfind('?')
-    
-    last_sentence_end = max(last_period, last_exclamation, last_question)
-    
-    if last_sentence_end > target_length * 0.8:  # If we found a sentence end in the last 20%
-        truncated = truncated[:last_sentence_end + 1]
-    
-    # Add truncation notice
-    truncated += f"\n\n[Content truncated due to length. Original had {current_tokens} tokens, truncated to {count_tokens(truncated, model)} tokens.]"
-    
-    return truncated
+    return fit_to_token_budget(content, max_tokens, model).content
 
+@traced("invoke_llm", kind="llm")
 def invoke_llm(
     system_prompt,
     user_message,
     model="gpt-3.5-turbo",
     llm_provider="openai",
     response_format=None,
-    max_tokens=12000
+    max_tokens=12000,
+    use_cache=True
+):
+    messages, cache, cache_key = _prepare_llm_call(
+        system_prompt, user_message, model, llm_provider, response_format, max_tokens, use_cache
+    )
+    if cache is not None:
+        cached_output = cache.get(cache_key)
+        if cached_output is not None:
+            record(cache_hits=1)
+            return cached_output
+    
+    chain = _build_llm_chain(llm_provider, model, response_format)
+    output = _parse_llm_output(chain.invoke(messages), model, messages, response_format)
+    if cache is not None:
+        cache.set(cache_key, output)
+    return output
+
+@traced("invoke_llm", kind="llm")
+async def ainvoke_llm(
+    system_prompt,
+    user_message,
+    model="gpt-3.5-turbo",
+    llm_provider="openai",
+    response_format=None,
+    max_tokens=12000,
+    use_cache=True
 ):
+    """
+    Async version of `invoke_llm`, awaits the model with `ainvoke` so concurrent
+    graph branches can overlap their network waits.
+    """
+    messages, cache, cache_key = _prepare_llm_call(
+        system_prompt, user_message, model, llm_provider, response_format, max_tokens, use_cache
+    )
+    if cache is not None:
+        cached_output = cache.get(cache_key)
+        if cached_output is not None:
+            record(cache_hits=1)
+            return cached_output
+    
+    chain = _build_llm_chain(llm_provider, model, response_format)
+    output = _parse_llm_output(await chain.ainvoke(messages), model, messages, response_format)
+    if cache is not None:
+        cache.set(cache_key, output)
+    return output
+
+def _prepare_llm_call(system_prompt, user_message, model, llm_provider, response_format, max_tokens, use_cache):
     # Truncate user message if it's too long
     if isinstance(user_message, str):
-        user_message = truncate_content_to_fit_tokens(user_message, max_tokens, model)
+        user_message = fit_to_token_budget(user_message, max_tokens, model).content
     
     messages = [
         SystemMessage(content=system_prompt),
         HumanMessage(content=user_message),
-    ]  
+    ]
     
+    # Serve identical requests from the response cache when it is enabled
+    cache = get_llm_cache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = make_cache_key(
+            llm_provider,
+            model,
+            LLM_TEMPERATURE,
+            response_format.model_json_schema() if response_format else None,
+            system_prompt,
+            user_message
+        )
+    return messages, cache, cache_key
+
+def _build_llm_chain(llm_provider, model, response_format):
     # Get base llm
     llm = get_llm_by_provider(llm_provider, model)
     
-    # For older versions, we'll skip structured output
     if response_format:
-        # Just return the raw output for now
-        output = llm.invoke(messages)
-        # Try to parse it as the expected format
-        if hasattr(output, 'content'):
-            content = output.content
-        else:
-            content = str(output)
-        
-        # Create a mock structured response
-        if response_format.__name__ == "WebsiteData":
-            return {
-                "summary": content[:500] if len(content) > 500 else content,
-                "blog_url": "",
-                "facebook": "",
-                "twitter": "",
-                "youtube": ""
-            }
-        elif response_format.__name__ == "EmailResponse":
-            return {
-                "subject": "Outreach Opportunity",
-                "email": content
-            }
-        else:
-            return content
+        # Schema-constrained output, validated into the Pydantic model in one round-trip
+        structured_kwargs = {"include_raw": True}
+        if llm_provider == "openai":
+            # gpt-3.5-turbo has no native JSON schema mode, use function calling
+            structured_kwargs["method"] = "function_calling"
+        return llm.with_structured_output(response_format, **structured_kwargs)
+    else:
+        # Raw message, parsed to a string once its token usage is recorded
+        return llm
+
+def _parse_llm_output(output, model, messages, response_format):
+    raw_message = output["raw"] if response_format else output
+    _record_usage(raw_message, model, messages)
+    if not response_format:
+        return StrOutputParser().invoke(output)
+    parsed = output.get("parsed")
+    if parsed is None:
+        raise ValueError(
+            f"Structured output parsing failed for {response_format.__name__}: {output.get('parsing_error')}"
+        )
+    return parsed.model_dump() if hasattr(parsed, "model_dump") else parsed
+
+def _record_usage(message, model, messages):
+    """Record the token usage reported by the provider, or an estimate when it is missing."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        prompt_tokens, completion_tokens = usage.get("input_tokens", 0), usage.get("output_tokens", 0)
     else:
-        # Use string output parser
-        parser = StrOutputParser()
-        chain = llm | parser
-        output = chain.invoke(messages)
-        return output
\ No newline at end of file
+        prompt_tokens = sum(token_budget.count_tokens(str(m.content), model) for m in messages)
+        completion_tokens = token_budget.count_tokens(str(getattr(message, "content", "") or ""), model)
+    record_llm_usage(model, prompt_tokens, completion_tokens)
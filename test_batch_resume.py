@@ -0,0 +1,72 @@
+"""
+Batch mode checkpointing: a lead interrupted mid-run resumes from its last
+finished node, and the leads that finished are not researched again.
+"""
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src import nodes
+from src.graph import OutReachAutomation, get_sqlite_checkpointer
+from src.instrumentation import get_spans, reset_instrumentation
+from benchmarks.fakes import FakeServices, SyntheticLeadLoader, InjectedFailure
+
+INPUTS = {"leads_ids": [], "leads_data": [], "number_leads": 0}
+
+
+def run_batch(interrupt):
+    """
+    Research 3 leads in batch mode, one at a time so the interruption doesn't cut other
+    leads mid-node; with `interrupt`, the first case study lookup (generate_custom_outreach_report)
+    fails once and the run is resumed.
+
+    @return: (fake service calls, IDs of the leads finished before the interruption,
+              node spans of the resumed run as (lead id, node) pairs)
+    """
+    services = FakeServices(latency_scale=0)
+    fetch_similar_case_study = services.fetch_similar_case_study
+    failures = [InjectedFailure("interrupted")] if interrupt else []
+
+    def interrupted_case_study(description):
+        if failures:
+            raise failures.pop()
+        return fetch_similar_case_study(description)
+
+    services.fetch_similar_case_study = interrupted_case_study
+    loader = SyntheticLeadLoader(3, seed=0)
+    finished, resumed = [], []
+    with services.install(), redirect_stdout(io.StringIO()):
+        automation = OutReachAutomation(loader, batch_mode=True, max_concurrency=1, checkpointer=get_sqlite_checkpointer(":memory:"))
+        try:
+            automation.run(INPUTS, run_id="run-1")
+        except InjectedFailure:
+            finished = list(loader.updates)
+            reset_instrumentation()
+            automation.resume("run-1")
+            resumed = [(span["lead_id"], span["name"]) for span in get_spans() if span["kind"] == "node"]
+    assert len(loader.updates) == 3
+    return services.stats()["calls"], finished, resumed
+
+
+def test_resume_does_not_repeat_finished_nodes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ("INDUSTRY_RESEARCH_MODE", "STOP_AFTER_FIRST_QUALIFIED", "PREQUALIFY_LEADS"):
+        monkeypatch.setattr(nodes, name, False)
+
+    expected_calls, _, _ = run_batch(interrupt=False)
+    calls, finished, resumed = run_batch(interrupt=True)
+
+    # Interrupted + resumed runs make exactly the calls of an uninterrupted run
+    assert calls == expected_calls
+    assert "get_new_leads" not in {name for _, name in resumed}
+    assert not {lead_id for lead_id, _ in resumed} & set(finished)
+    # The interrupted lead restarts at the failed node, leads not started yet run from the beginning
+    restarted = {}
+    for lead_id, name in resumed:
+        restarted.setdefault(lead_id, set()).add(name)
+    interrupted = [nodes_run for nodes_run in restarted.values() if "fetch_linkedin_profile_data" not in nodes_run]
+    assert len(interrupted) == 1
+    assert "generate_custom_outreach_report" in interrupted[0]
+    assert not interrupted[0] & {"review_company_website", "analyze_blog_content", "score_lead"}
@@ -0,0 +1,148 @@
+"""
+Blog discovery: feed and sitemap parsers, feed probing order and the shared deadline.
+"""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tools.base import blog_discovery
+from src.tools.base.blog_discovery import (
+    parse_date, sitemaps_from_robots, parse_sitemap, parse_feed, extract_feed_links, is_blog_post_url
+)
+
+ROOT = "https://example.com/"
+
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Acme blog</title>
+  <link href="https://example.com/blog"/>
+  <entry>
+    <title>Scaling inspection</title>
+    <link rel="alternate" href="https://example.com/blog/scaling-inspection"/>
+    <updated>2026-03-02T10:00:00Z</updated>
+    <content type="html">&lt;p&gt;Full post&lt;/p&gt;</content>
+  </entry>
+</feed>"""
+
+
+def test_parse_date():
+    expected = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc)
+
+    assert parse_date("Mon, 02 Mar 2026 10:00:00 GMT") == expected
+    assert parse_date("2026-03-02T10:00:00Z") == expected
+    assert parse_date("2026-03-02") == datetime(2026, 3, 2, tzinfo=timezone.utc)  # naive dates are UTC
+    assert parse_date("last week") is None
+    assert parse_date("") is None
+
+
+def test_sitemaps_from_robots():
+    robots = "User-agent: *\nDisallow: /admin\nSitemap: https://example.com/sitemap.xml\nsitemap: /blog-sitemap.xml\n"
+
+    assert sitemaps_from_robots(robots, ROOT) == [ROOT + "sitemap.xml", ROOT + "blog-sitemap.xml"]
+
+
+def test_parse_sitemap_index_and_urlset():
+    ns = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    index = f"<sitemapindex {ns}><sitemap><loc>{ROOT}post-sitemap.xml</loc></sitemap></sitemapindex>"
+    urlset = (
+        f"<urlset {ns}><url><loc>{ROOT}blog/a</loc><lastmod>2026-03-02</lastmod></url>"
+        f"<url><loc>{ROOT}blog/b</loc></url><url><lastmod>2026-03-02</lastmod></url></urlset>"
+    )
+
+    assert parse_sitemap(index) == ([(ROOT + "post-sitemap.xml", None)], [])
+    assert parse_sitemap(urlset) == ([], [
+        (ROOT + "blog/a", datetime(2026, 3, 2, tzinfo=timezone.utc)),
+        (ROOT + "blog/b", None),
+    ])
+    assert parse_sitemap("<html>not a sitemap") == ([], [])
+
+
+def test_parse_rss_feed():
+    feed = f"""\ufeff<?xml version="1.0"?>
+<rss xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+  <item><title>Edge AI</title><link>{ROOT}blog/edge-ai</link><pubDate>Mon, 02 Mar 2026 10:00:00 GMT</pubDate>
+    <description>Teaser</description><content:encoded><![CDATA[<p>Full post</p>]]></content:encoded></item>
+  <item><title>Podcast</title><guid>{ROOT}blog/podcast</guid><description>Teaser only</description></item>
+  <item><title>Relative link</title><link>/blog/relative</link></item>
+</channel></rss>"""
+
+    assert parse_feed(feed) == [
+        {"url": ROOT + "blog/edge-ai", "title": "Edge AI",
+         "date": datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc), "content": "<p>Full post</p>"},
+        {"url": ROOT + "blog/podcast", "title": "Podcast", "date": None, "content": "Teaser only"},
+    ]
+
+
+def test_parse_atom_feed():
+    assert parse_feed(ATOM) == [{
+        "url": ROOT + "blog/scaling-inspection", "title": "Scaling inspection",
+        "date": datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc), "content": "<p>Full post</p>",
+    }]
+    assert parse_feed("not xml") == []
+
+
+def test_extract_feed_links():
+    html = """<head>
+      <link rel="alternate" type="application/rss+xml" href="/feed">
+      <link rel="alternate" type="application/atom+xml" href="https://example.com/atom.xml">
+      <link rel="alternate" hreflang="fr" href="/fr/">
+      <link rel="stylesheet" type="text/css" href="/style.css">
+    </head>"""
+
+    assert extract_feed_links(html) == ["/feed", "https://example.com/atom.xml"]
+
+
+def test_is_blog_post_url():
+    assert is_blog_post_url(ROOT + "blog/edge-ai")
+    assert is_blog_post_url(ROOT + "en/insights/2026/edge-ai")
+    assert not is_blog_post_url(ROOT + "blog/")  # the folder itself
+    assert not is_blog_post_url(ROOT + "products/edge-ai")
+    assert is_blog_post_url(ROOT + "company/updates/edge-ai", blog_path="/company/updates")
+    assert not is_blog_post_url(ROOT + "company/updates", blog_path="/company/updates")
+    assert not is_blog_post_url(ROOT + "blog/edge-ai", blog_path="/company/updates")
+
+def rss(*urls):
+    items = "".join(f"<item><title>{url}</title><link>{url}</link></item>" for url in urls)
+    return f"<?xml version='1.0'?><rss><channel>{items}</channel></rss>"
+
+
+def fake_site(monkeypatch, pages, delays=None):
+    """Serve `pages` (url -> html) with optional per-URL delays; return the list of fetched URLs."""
+    fetched = []
+
+    def fetch_page(url, timeout=30):
+        fetched.append(url)
+        time.sleep(min((delays or {}).get(url, 0), timeout))
+        if url not in pages:
+            raise Exception("Failed to fetch the URL. Status code: 404")
+        return {"html": pages[url], "derived": {}}, len(pages[url])
+
+    monkeypatch.setattr(blog_discovery, "fetch_page", fetch_page)
+    return fetched
+
+
+def test_first_feed_candidate_wins_over_faster_ones(monkeypatch):
+    fake_site(
+        monkeypatch,
+        {ROOT + "feed": rss(ROOT + "blog/slow-feed"), ROOT + "rss.xml": rss(ROOT + "blog/fast-feed")},
+        delays={ROOT + "feed": 0.2},
+    )
+
+    feed_url, posts = blog_discovery._posts_from_feeds([], ROOT)
+
+    assert feed_url == ROOT + "feed"
+    assert [post["url"] for post in posts] == [ROOT + "blog/slow-feed"]
+
+
+def test_discovery_stops_at_the_deadline(monkeypatch):
+    fetched = fake_site(monkeypatch, {}, delays={ROOT: 5})
+
+    start = time.monotonic()
+    result = blog_discovery.discover_blog_posts(ROOT, deadline=time.monotonic() + 0.3)
+
+    assert result == (None, [], None)
+    assert time.monotonic() - start < 2
+    assert fetched == [ROOT]  # nothing is probed once the deadline has passed
@@ -0,0 +1,72 @@
+"""
+SQLite cache: TTL expiry and least recently used eviction (entries & bytes).
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src import cache as cache_module
+from src.cache import SQLiteCache
+
+
+class Clock:
+    """Stand-in for the `time` module of src.cache, moved forward by hand."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl_seconds=60)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl_seconds=10)
+    cache.set("forever", 3, ttl_seconds=0)  # 0 / None = no expiry
+
+    clock.now += 30
+    assert (cache.get("default"), cache.get("short"), cache.get("forever")) == (1, None, 3)
+    clock.now += 31
+    assert (cache.get("default"), cache.get("forever")) == (None, 3)
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_by_count(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    clock.now += 1
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_bytes=250)
+    for key in "abc":
+        cache.set(key, "x" * 98)  # 100 bytes once JSON encoded
+        clock.now += 1
+
+    assert cache.get("a") is None
+    assert cache.get("b") and cache.get("c")
+    assert cache.stats()["bytes"] <= 250
+
+
+def test_values_survive_a_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteCache(path).set("key", {"nested": [1, 2]})
+    assert SQLiteCache(path).get("key") == {"nested": [1, 2]}
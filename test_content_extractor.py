@@ -0,0 +1,67 @@
+"""
+Boilerplate filter of scraped markdown: link density, boilerplate blocks,
+repeated lines and runs of menu labels.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src.tools.base.content_extractor import (
+    link_density, is_boilerplate, dedupe_lines, _drop_short_block_runs, strip_boilerplate
+)
+
+ARTICLE = (
+    "Acme builds vision systems that inspect parts on production lines, "
+    "with models trained on the customer's own defect images."
+)
+
+
+def test_link_density():
+    assert link_density("[Home](/) [Products](/p) [About](/a)") == pytest.approx(1.0)
+    assert link_density(f"{ARTICLE} See [pricing](/pricing).") < 0.1
+    assert link_density("") == 0.0
+
+
+def test_is_boilerplate():
+    assert is_boilerplate("* [Home](/)\n* [Products](/products)\n* [Contact](/contact)")
+    assert is_boilerplate("We use cookies to improve your experience. Accept all")
+    assert is_boilerplate("© 2026 Acme. All rights reserved.")
+    assert not is_boilerplate(ARTICLE)
+    # Long blocks are content even when they mention a boilerplate word
+    assert not is_boilerplate(" ".join([ARTICLE] * 3) + " Subscribe to updates.")
+
+
+def test_dedupe_lines_keeps_headings_and_short_lines():
+    markdown = "## Contact us\nTalk to sales today\n---\n## Contact us\n* Talk to [sales](/sales) today\n---"
+
+    assert dedupe_lines(markdown) == "## Contact us\nTalk to sales today\n---\n## Contact us\n---"
+
+
+def test_drop_short_block_runs():
+    blocks = ["Home", "Products", "Careers", ARTICLE, "Read more", ARTICLE, "# Title"]
+
+    # Three short blocks in a row are a menu; a single short block or a heading stays
+    assert _drop_short_block_runs(blocks) == [ARTICLE, "Read more", ARTICLE, "# Title"]
+
+
+def test_strip_boilerplate():
+    markdown = "\n\n".join([
+        "[Home](/) [Products](/products) [Blog](/blog)",
+        "# Acme vision",
+        ARTICLE,
+        "## Newsletter",
+        "Subscribe to our newsletter",
+        "## Customers",
+        "Three automotive plants run Acme in production since 2024, across 40 lines.",
+        ARTICLE,
+        "We use cookies. Accept all",
+    ])
+
+    assert strip_boilerplate(markdown) == "\n\n".join([
+        "# Acme vision",
+        ARTICLE,
+        "## Customers",
+        "Three automotive plants run Acme in production since 2024, across 40 lines.",
+    ])
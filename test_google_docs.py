@@ -0,0 +1,163 @@
+"""
+Google Docs manager against recorded Drive responses: cached folder IDs,
+batch sharing and the folder "shared" flag.
+"""
+import os
+import sys
+import json
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+
+import src.tools.google_docs_tools as google_docs_tools
+from src.tools.google_docs_tools import GoogleDocsManager
+
+FOLDER = "Lead_42"
+
+
+class RecordingHttp(HttpMockSequence):
+    """HttpMockSequence that remembers the requests it answered (and can be used by several threads)."""
+
+    def __init__(self, iterable):
+        super().__init__(iterable)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        with self._lock:
+            self.requests.append((method, uri, body))
+            return super().request(uri, method, body, headers, **kwargs)
+
+
+def json_response(body, status=200):
+    return ({"status": str(status)}, json.dumps(body))
+
+
+def error_response(status, reason):
+    return json_response({"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}}, status)
+
+
+def batch_response(*parts):
+    """Multipart answer of a batch request: (request_id, status, body) per call."""
+    content = ""
+    for request_id, status, body in parts:
+        content += (
+            "--batch_test\r\nContent-Type: application/http\r\n"
+            f"Content-ID: <response-test + {request_id}>\r\n\r\n"
+            f"HTTP/1.1 {status} Status\r\nContent-Type: application/json\r\n\r\n{json.dumps(body)}\r\n"
+        )
+    content += "--batch_test--"
+    return ({"status": "200", "content-type": "multipart/mixed; boundary=batch_test"}, content.encode("utf-8"))
+
+
+def document(doc_id):
+    return json_response({"id": doc_id, "webViewLink": f"https://docs.google.com/document/d/{doc_id}/edit"})
+
+
+@pytest.fixture
+def drive(tmp_path, monkeypatch):
+    """Install a Drive service answering with the given responses; return its recording transport."""
+    monkeypatch.setitem(google_docs_tools.GOOGLE_DOCS_CONFIG, "folder_cache_path", str(tmp_path / "folders.sqlite"))
+    monkeypatch.setattr(google_docs_tools, "_folders", {})
+    monkeypatch.setattr(google_docs_tools.time, "sleep", lambda seconds: None)
+
+    def install(*responses):
+        http = RecordingHttp(list(responses))
+        service = build("drive", "v3", http=http, static_discovery=True)
+        monkeypatch.setattr(google_docs_tools, "get_google_service", lambda name, version: service)
+        return http
+
+    return install
+
+
+def upload(manager, **sharing):
+    return manager.add_documents([{"content": "# Report", "title": "Report", "markdown": True}], FOLDER, **sharing)
+
+
+def test_deleted_folder_is_looked_up_again(drive, monkeypatch):
+    monkeypatch.setitem(google_docs_tools.GOOGLE_DOCS_CONFIG, "folder_revalidate_seconds", 10 ** 12)  # trust the cache
+    manager = GoogleDocsManager()
+    manager._remember_folder(FOLDER, {"id": "old", "link": "old-link", "shared": False, "checked_at": 0})
+    http = drive(
+        error_response(404, "notFound"),  # upload into the deleted folder
+        json_response({"files": []}),  # folder lookup
+        json_response({"id": "new", "webViewLink": "new-link"}),  # folder creation
+        document("doc1"),
+    )
+
+    results = upload(manager)
+
+    assert results == [{"document_url": "https://docs.google.com/document/d/doc1", "shareable_url": None, "folder_url": "new-link"}]
+    assert len(http.requests) == 4
+    assert b'"parents": ["new"]' in http.requests[-1][2]
+    google_docs_tools._folders.clear()
+    assert manager._get_or_create_folder(FOLDER)["id"] == "new"  # from the disk cache
+
+
+def test_trashed_folder_is_replaced(drive):
+    manager = GoogleDocsManager()
+    manager._remember_folder(FOLDER, {"id": "old", "link": "old-link", "shared": True, "checked_at": 0})
+    http = drive(
+        json_response({"id": "old", "trashed": True}),  # revalidation of the stale entry
+        json_response({"files": [{"id": "other", "webViewLink": "other-link"}]}),
+        document("doc1"),
+    )
+
+    results = upload(manager)
+
+    assert results[0]["folder_url"] == "other-link"
+    assert http.requests[0][0] == "GET" and "/files/old" in http.requests[0][1]
+    assert b'"parents": ["other"]' in http.requests[-1][2]
+
+
+def test_failed_shares(drive):
+    manager = GoogleDocsManager()
+    http = drive(
+        json_response({"files": [{"id": "folder", "webViewLink": "folder-link"}]}),
+        document("doc1"),
+        batch_response(("doc1", 200, {"id": "permission"}), ("folder", 403, {"error": {"code": 403, "message": "insufficientFilePermissions"}})),
+    )
+
+    results = upload(manager, make_shareable=True, folder_shareable=True)
+
+    assert results[0]["shareable_url"] == "https://docs.google.com/document/d/doc1/edit"
+    assert "batch" in http.requests[-1][1]
+    assert google_docs_tools._folders[FOLDER]["shared"] is False
+
+
+def test_rate_limited_share_is_retried(drive):
+    manager = GoogleDocsManager()
+    rate_limited = {"error": {"code": 403, "message": "Rate limit", "errors": [{"reason": "userRateLimitExceeded"}]}}
+    http = drive(
+        json_response({"files": [{"id": "folder", "webViewLink": "folder-link"}]}),
+        document("doc1"),
+        batch_response(("doc1", 403, rate_limited)),
+        batch_response(("doc1", 200, {"id": "permission"})),
+    )
+
+    results = upload(manager, make_shareable=True)
+
+    assert results[0]["shareable_url"]
+    assert len(http.requests) == 4
+
+
+def test_shared_flag_persists(drive):
+    manager = GoogleDocsManager()
+    http = drive(
+        json_response({"files": [{"id": "folder", "webViewLink": "folder-link"}]}),
+        document("doc1"),
+        batch_response(("folder", 200, {"id": "permission"})),
+        document("doc2"),
+    )
+
+    upload(manager, folder_shareable=True)
+    google_docs_tools._folders.clear()  # a new process: only the disk cache is left
+    results = upload(manager, folder_shareable=True)
+
+    assert results[0]["document_url"].endswith("doc2")
+    # Second lead: no folder lookup and no permission request, just the upload
+    assert len(http.requests) == 4
+    assert "batch" not in http.requests[-1][1]
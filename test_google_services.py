@@ -0,0 +1,58 @@
+"""
+Background refresh of the shared Google OAuth token.
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+from src.tools.base import google_services
+
+
+class RecordingCredentials(Credentials):
+    refreshes = 0
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = "refreshed"
+
+
+@pytest.fixture
+def credentials(tmp_path, monkeypatch):
+    """Install shared credentials expiring at `expiry` (naive UTC, as google-auth stores it)."""
+    monkeypatch.setattr(google_services, "GOOGLE_TOKEN_FILE", str(tmp_path / "token.json"))
+
+    def install(token, expiry):
+        creds = RecordingCredentials(token, refresh_token="refresh", client_id="id", client_secret="secret", expiry=expiry)
+        monkeypatch.setattr(google_services, "_credentials", creds)
+        return creds
+    return install
+
+
+def in_minutes(minutes):
+    return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=minutes)
+
+
+def test_token_expiring_within_the_margin_is_refreshed(credentials):
+    creds = credentials("token", in_minutes(60))
+    assert not google_services._refresh_if_expiring()
+
+    creds = credentials("token", in_minutes(2))
+
+    assert google_services._refresh_if_expiring()
+    assert creds.refreshes == 1 and os.path.exists(google_services.GOOGLE_TOKEN_FILE)
+
+
+def test_token_without_expiry_is_only_refreshed_when_invalid(credentials):
+    creds = credentials("token", None)
+    for _ in range(3):
+        assert not google_services._refresh_if_expiring()
+    assert creds.refreshes == 0
+
+    assert google_services._refresh_if_expiring(force=True)
+    creds = credentials(None, None)  # no access token: not valid
+    assert google_services._refresh_if_expiring()
+    assert creds.refreshes == 1
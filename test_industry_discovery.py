@@ -0,0 +1,43 @@
+"""
+Industry discovery: a failed search must not move the discovery cursor
+nor mark the industry as exhausted.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import src.nodes as nodes_module
+from src.nodes import OutReachAutomationNodes
+from src.state import LeadData, CompanyData
+
+
+def make_nodes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return OutReachAutomationNodes(loader=None)
+
+
+def industry_state(industry):
+    lead = LeadData(id=f"industry_{industry}", name="", address="", email="", phone="", profile=industry)
+    return {"current_lead": lead, "company_data": CompanyData()}
+
+
+def test_failed_search_keeps_cursor_and_industry(tmp_path, monkeypatch):
+    nodes = make_nodes(tmp_path, monkeypatch)
+    nodes.discovery_cursors["Robotics"] = {"query": 1, "page": 2, "offset": 3}
+    monkeypatch.setattr(nodes_module, "google_search", lambda query, page=1: None)
+
+    nodes._fetch_industry_company_data(industry_state("Robotics"))
+
+    assert nodes.discovery_cursors["Robotics"] == {"query": 1, "page": 2, "offset": 3}
+    assert not os.path.exists(tmp_path / nodes_module.DISCOVERY_CURSORS_FILE)
+    assert not nodes._is_company_processed("INDUSTRY_EXHAUSTED_Robotics")
+
+
+def test_empty_results_exhaust_industry(tmp_path, monkeypatch):
+    nodes = make_nodes(tmp_path, monkeypatch)
+    monkeypatch.setattr(nodes_module, "google_search", lambda query, page=1: [])
+
+    nodes._fetch_industry_company_data(industry_state("Robotics"))
+
+    assert nodes.discovery_cursors["Robotics"]["query"] == len(nodes_module.INDUSTRY_DISCOVERY_QUERIES)
+    assert nodes._is_company_processed("INDUSTRY_EXHAUSTED_Robotics")
@@ -0,0 +1,75 @@
+"""
+Instrumentation: the spans kept for the run summary are bounded, nested spans are
+not counted twice in the totals.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import time
+
+import pytest
+
+from src import instrumentation
+from src.instrumentation import span, record, get_spans, reset_instrumentation, summarize_spans, configure_instrumentation
+
+
+@pytest.fixture(autouse=True)
+def small_span_buffer():
+    configure_instrumentation(max_spans=3)
+    reset_instrumentation()
+    yield
+    configure_instrumentation(max_spans=50_000)
+    reset_instrumentation()
+
+
+def test_only_the_last_spans_are_kept():
+    for number in range(5):
+        with span(f"call_{number}"):
+            record(bytes_fetched=10)
+
+    assert [s["name"] for s in get_spans()] == ["call_2", "call_3", "call_4"]
+    summary = summarize_spans()
+    assert summary["dropped_spans"] == 2
+    assert summary["totals"]["bytes_fetched"] == 30
+    assert "2 older spans were dropped" in instrumentation.format_run_table(summary)
+
+    reset_instrumentation()
+    assert get_spans() == [] and summarize_spans()["dropped_spans"] == 0
+
+
+def test_lowering_the_limit_keeps_the_most_recent_spans():
+    configure_instrumentation(max_spans=10)
+    for number in range(4):
+        with span(f"call_{number}"):
+            pass
+
+    configure_instrumentation(max_spans=2)
+
+    assert [s["name"] for s in get_spans()] == ["call_2", "call_3"]
+    assert summarize_spans()["dropped_spans"] == 2
+
+
+def test_unknown_setting():
+    with pytest.raises(ValueError):
+        configure_instrumentation(max_span=10)
+
+
+def test_nested_spans_are_not_counted_twice_in_the_totals():
+    configure_instrumentation(max_spans=10)
+    with span("node", kind="node"):
+        with span("google_docs.add_documents"):
+            for _ in range(2):
+                with span("google_docs.add_document"):
+                    time.sleep(0.05)
+                    record(bytes_fetched=10)
+
+    summary = summarize_spans()
+    [outer] = [s for s in get_spans() if s["name"] == "google_docs.add_documents"]
+    inner = summary["per_call"]["google_docs.add_document"]
+
+    assert not outer["nested"]
+    assert summary["totals"]["wall_time"] == round(outer["wall_time"], 3)
+    assert inner["count"] == 2 and inner["wall_time"] >= 0.1
+    assert summary["per_call"]["google_docs.add_documents"]["wall_time"] >= inner["wall_time"]
+    assert summary["totals"]["bytes_fetched"] == 20
@@ -0,0 +1,103 @@
+"""
+Local ranking of LinkedIn profile candidates, and when the LLM is asked instead.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src.tools.base import linkedin_tools
+from src.tools.base.linkedin_tools import rank_linkedin_candidates, extract_linkedin_url, get_linkedin_url_stats
+
+
+def result(title, slug, snippet="", kind="in"):
+    return {"title": f"{title} | LinkedIn", "link": f"https://www.linkedin.com/{kind}/{slug}", "snippet": snippet}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Record the LLM fallbacks; the LLM always answers with the same URL."""
+    calls = []
+
+    def invoke_llm(system_prompt, user_message, **kwargs):
+        calls.append(user_message)
+        return " https://www.linkedin.com/in/picked-by-llm \n"
+
+    monkeypatch.setattr(linkedin_tools, "invoke_llm", invoke_llm)
+    return calls
+
+
+def fallbacks_since(before):
+    return get_linkedin_url_stats()["llm_fallbacks"] - before["llm_fallbacks"]
+
+
+def test_confident_match_is_resolved_locally(llm):
+    before = get_linkedin_url_stats()
+    results = [
+        result("Company page", "acme", kind="company"),
+        result("Jane Doe - Engineer - Acme", "jane-doe-123"),
+        result("John Smith", "john-smith"),
+    ]
+
+    assert extract_linkedin_url(results, "Jane Doe", "acme.com") == "https://www.linkedin.com/in/jane-doe-123"
+    assert llm == []
+    assert fallbacks_since(before) == 0
+
+
+def test_low_confidence_asks_the_llm(llm):
+    before = get_linkedin_url_stats()
+    # Half of the name and no company: below the 0.5 minimum confidence, even without a runner-up
+    results = [result("Jane Roe", "jane-roe")]
+    [(score, _)] = rank_linkedin_candidates(results, "Jane Doe", "acme.com")
+    assert score < linkedin_tools.LINKEDIN_MIN_CONFIDENCE
+
+    assert extract_linkedin_url(results, "Jane Doe", "acme.com") == "https://www.linkedin.com/in/picked-by-llm"
+    assert len(llm) == 1
+    assert fallbacks_since(before) == 1
+
+
+def test_close_runner_up_asks_the_llm_with_the_top_candidates(llm):
+    # Two profiles of the same name at the same company: within the 0.15 margin
+    results = [result("Jane Doe - Acme", "jane-doe-1"), result("Jane Doe - Acme", "jane-doe-2")]
+    results += [result(f"Other Person {number}", f"other-person-{number}") for number in range(10)]
+    (best, _), (runner_up, _) = rank_linkedin_candidates(results, "Jane Doe", "Acme")[:2]
+    assert best >= linkedin_tools.LINKEDIN_MIN_CONFIDENCE
+    assert best - runner_up < linkedin_tools.LINKEDIN_RANK_MARGIN
+
+    extract_linkedin_url(results, "Jane Doe", "Acme")
+
+    assert len(llm) == 1
+    assert "jane-doe-1" in llm[0] and "jane-doe-2" in llm[0]
+    assert llm[0].count("linkedin.com/in/") == linkedin_tools.LINKEDIN_LLM_CANDIDATES
+
+
+def test_name_mismatch_ranks_below_the_lead(llm):
+    results = [result("John Smith - Acme", "john-smith"), result("Jane Doe", "jane-doe")]
+
+    ranked = rank_linkedin_candidates(results, "Jane Doe", "Acme")
+
+    assert ranked[0][1].endswith("/in/jane-doe")
+    assert extract_linkedin_url(results, "Jane Doe", "Acme").endswith("/in/jane-doe")
+    assert llm == []
+
+
+def test_company_mismatch_ranks_below_the_lead(llm):
+    results = [
+        result("Jane Doe - Globex", "jane-doe", "Sales at Globex"),
+        result("Jane Doe - Acme Labs", "jane-doe-acme", "Engineer at Acme Labs"),
+    ]
+
+    ranked = rank_linkedin_candidates(results, "Jane Doe", "mail.acme-labs.co.uk")
+
+    assert [url.rsplit("/", 1)[1] for _, url in ranked] == ["jane-doe-acme", "jane-doe"]
+
+
+def test_no_profile_link(llm):
+    before = get_linkedin_url_stats()
+    results = [result("Acme", "acme", kind="company"), {"title": "Acme", "link": "https://acme.com", "snippet": ""}]
+
+    assert rank_linkedin_candidates(results, "Jane Doe", "Acme") == []
+    assert extract_linkedin_url(results, "Jane Doe", "Acme") == ""
+    assert llm == []
+    assert get_linkedin_url_stats()["not_found"] == before["not_found"] + 1
@@ -0,0 +1,61 @@
+"""
+Pooled LLM clients: one async HTTP client per event loop, closed with its loop.
+"""
+import os
+import sys
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src import llm_clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    llm_clients.close_llm_clients()
+    yield
+    llm_clients.close_llm_clients()
+
+
+async def loop_client():
+    llm = llm_clients.get_llm_client("openai", "gpt-3.5-turbo")
+    assert llm is llm_clients.get_llm_client("openai", "gpt-3.5-turbo")
+    return llm, llm_clients._loop_clients[asyncio.get_running_loop()]["http"]
+
+
+def test_each_event_loop_gets_its_own_async_client():
+    sync_llm = llm_clients.get_llm_client("openai", "gpt-3.5-turbo")
+    loop = asyncio.new_event_loop()
+    try:
+        first_llm, first_http = loop.run_until_complete(loop_client())
+        assert loop.run_until_complete(loop_client()) == (first_llm, first_http)
+    finally:
+        loop.close()
+    second_llm, second_http = asyncio.run(loop_client())
+
+    assert first_llm is not second_llm and first_http is not second_http
+    assert sync_llm not in (first_llm, second_llm)
+
+
+def test_aclose_closes_the_running_loop_client():
+    async def run():
+        _, http = await loop_client()
+        await llm_clients.aclose_llm_clients()
+        return http
+
+    http = asyncio.run(run())
+
+    assert http.is_closed
+    assert not llm_clients._loop_clients
+
+
+def test_close_llm_clients_closes_idle_loop_clients():
+    loop = asyncio.new_event_loop()
+    try:
+        _, http = loop.run_until_complete(loop_client())
+        llm_clients.close_llm_clients()
+        assert http.is_closed
+    finally:
+        loop.close()
@@ -0,0 +1,75 @@
+"""
+Local retrieval building blocks: BM25 keyword search, reciprocal rank fusion
+and the query embedding cache.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.cache import SQLiteCache
+from src.tools.base.local_retrieval import BM25Index, CachedQueryEmbeddings, HashingEmbeddings, reciprocal_rank_fusion
+
+TEXTS = [
+    "Edge gateways run predictive maintenance for a manufacturing plant",
+    "A retail chain forecasts demand on PowerScale storage",
+    "Fraud detection models for a bank run on PowerEdge servers",
+    "Retail demand forecasting and retail fraud detection",
+]
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.queries = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return super().embed_query(text)
+
+
+def test_bm25_ranks_matching_texts_and_excludes_zero_scores():
+    index = BM25Index(TEXTS)
+
+    # Texts without any query term are left out, even when k asks for more
+    assert index.search("retail demand", k=10) == [3, 1]
+    assert index.search("bank fraud", k=1) == [2]
+    assert index.search("telecom", k=10) == []
+    assert index.search("the and of", k=10) == []  # stop words only
+
+
+def test_bm25_on_an_empty_corpus():
+    assert BM25Index([]).search("retail", k=3) == []
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+
+    # "b" is ranked in both lists, items ranked once keep their rank order
+    assert fused == ["b", "a", "d", "c"]
+    assert reciprocal_rank_fusion([]) == []
+
+
+def test_query_cache_evicts_the_least_recently_used_query():
+    backend = CountingEmbeddings()
+    embeddings = CachedQueryEmbeddings(backend, max_entries=2)
+
+    first = embeddings.embed_query("retail")
+    embeddings.embed_query("fraud")
+    assert embeddings.embed_query("retail") == first  # "retail" is now the most recently used
+    embeddings.embed_query("edge")  # evicts "fraud"
+    embeddings.embed_query("retail")
+    embeddings.embed_query("fraud")
+
+    assert backend.queries == ["retail", "fraud", "edge", "fraud"]
+    assert (embeddings.hits, embeddings.misses) == (2, 4)
+
+
+def test_query_cache_reads_the_persistent_cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "queries.sqlite"))
+    CachedQueryEmbeddings(CountingEmbeddings(), cache=cache, namespace="local").embed_query("retail")
+
+    backend = CountingEmbeddings()
+    vector = CachedQueryEmbeddings(backend, cache=cache, namespace="local").embed_query("retail")
+
+    assert backend.queries == []
+    assert vector == HashingEmbeddings(dimensions=64).embed_query("retail")
@@ -0,0 +1,68 @@
+"""
+HTML to markdown conversion: the length budget gives the same output with every parser,
+the truncation notice reports the real length of a page cut during conversion, and
+the cached markdown follows the conversion settings.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src.tools.base import markdown_scraper_tool
+from src.tools.base.content_extractor import CONTENT_EXTRACTION_CONFIG
+from src.tools.base.markdown_scraper_tool import convert_html_to_markdown, page_to_markdown
+from benchmarks.parser_benchmark import FIXTURES_DIR, available_parsers, load_fixtures
+
+
+@pytest.mark.parametrize("name", ["product_catalog", "blog_post"])
+def test_capped_conversion_is_the_same_with_every_parser(name):
+    html = load_fixtures(FIXTURES_DIR)[name]
+    full = convert_html_to_markdown(html, max_chars=0, parser="html.parser")
+
+    for parser in available_parsers():
+        markdown = convert_html_to_markdown(html, max_chars=20000, parser=parser)
+        assert markdown == full[:20000], parser
+
+
+def test_conversion_stops_early_and_reports_the_html_length(monkeypatch):
+    paragraphs = "".join(f"<p>Paragraph {number} about edge inference for factories.</p>" for number in range(2000))
+    html = f"<html><body><main>{paragraphs}</main></body></html>"
+    monkeypatch.setitem(markdown_scraper_tool.SCRAPER_CONFIG, "max_markdown_chars", 5000)
+    monkeypatch.setitem(markdown_scraper_tool.SCRAPER_CONFIG, "conversion_chunk_chars", 1024)
+    fed = []
+    feed = markdown_scraper_tool._MeasuredHTML2Text.feed
+    monkeypatch.setattr(markdown_scraper_tool._MeasuredHTML2Text, "feed", lambda self, data: fed.append(data) or feed(self, data))
+
+    markdown = page_to_markdown({"url": None, "html": html, "derived": {}}, max_length=3000)
+
+    assert sum(map(len, fed)) < len(html) / 5  # most of the page was never converted
+    assert markdown.endswith(f"[Content truncated due to length. Original page was {len(html)} characters of HTML.]")
+
+
+def test_short_page_reports_the_markdown_length():
+    html = "<main>" + "".join(f"<p>Edge inference for factory {number}.</p>" for number in range(20)) + "</main>"
+    full = convert_html_to_markdown(html, max_chars=0)
+
+    markdown = page_to_markdown({"url": None, "html": html, "derived": {}}, max_length=100)
+
+    assert markdown.endswith(f"[Content truncated due to length. Original was {len(full)} characters.]")
+
+
+def test_cached_markdown_is_rebuilt_after_a_settings_change(monkeypatch):
+    html = "<main>" + "".join(f"<p>Edge inference for factory {number}.</p>" for number in range(20)) + "</main>"
+    page = {"url": None, "html": html, "derived": {}}
+    conversions = []
+    convert = markdown_scraper_tool.convert_html_to_markdown
+    monkeypatch.setattr(markdown_scraper_tool, "convert_html_to_markdown", lambda html: conversions.append(html) or convert(html))
+
+    page_to_markdown(page)
+    page_to_markdown(page)
+    assert len(conversions) == 1
+
+    monkeypatch.setitem(markdown_scraper_tool.SCRAPER_CONFIG, "min_main_content_share", 0.5)
+    page_to_markdown(page)
+    monkeypatch.setitem(CONTENT_EXTRACTION_CONFIG, "dedupe_min_chars", 8)
+    page_to_markdown(page)
+
+    assert len(conversions) == 3
@@ -0,0 +1,28 @@
+"""
+Pre-qualification gate: leads rejected before research must reach the CRM
+without the report links of the lead processed before them.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.nodes import PREQUALIFICATION_THRESHOLD
+from benchmarks.fakes import SyntheticLeadLoader
+from benchmarks.run_benchmark import run_benchmark
+
+
+def test_rejected_lead_gets_no_report_links():
+    loader = SyntheticLeadLoader(16, seed=0)
+    result = run_benchmark(leads=16, sequential=True, latency_scale=0, prequalify=True, loader=loader)
+    assert result["error"] is None
+
+    updates = [loader.updates[record["id"]] for record in loader.records if record["id"] in loader.updates]
+    rejected = [update for update in updates if float(update["Score"]) < PREQUALIFICATION_THRESHOLD]
+    researched = [update for update in updates if float(update["Score"]) >= PREQUALIFICATION_THRESHOLD]
+    assert rejected and researched, "the fake data must exercise both paths"
+
+    for update in rejected:
+        assert update["Analysis Reports"] == ""
+        assert update["Outreach Report"] == ""
+    for update in researched:
+        assert update["Analysis Reports"]
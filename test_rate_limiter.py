@@ -0,0 +1,78 @@
+"""
+Token bucket of the LinkedIn API client: bursts, refill rate, waiting and invalid requests.
+"""
+import os
+import sys
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src.tools.base import rate_limiter
+from src.tools.base.rate_limiter import TokenBucket
+
+
+class Clock:
+    """Stand-in for the `time` module of the rate limiter: sleeping moves the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def test_burst_then_refill_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]  # the burst doesn't wait
+    assert bucket.acquire() == pytest.approx(0.5)  # then one token every 1 / rate seconds
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_idle_time_refills_up_to_the_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.acquire(2)
+
+    clock.now += 100
+    assert bucket.acquire(2) == 0
+    assert bucket.acquire() == pytest.approx(1)
+
+
+def test_concurrent_callers_share_the_rate():
+    bucket = TokenBucket(rate=200, capacity=1)
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One token right away, the 4 others at 200 per second
+    assert time.monotonic() - start >= 4 / 200 * 0.9
+
+
+def test_invalid_rate_and_oversized_requests(clock):
+    for rate in (0, -1):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=rate)
+
+    bucket = TokenBucket(rate=1, capacity=2)
+    with pytest.raises(ValueError):
+        bucket.acquire(3)  # would wait forever: the bucket never holds 3 tokens
+    assert clock.sleeps == []
+    assert bucket.acquire(2) == 0
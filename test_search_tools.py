@@ -0,0 +1,64 @@
+"""
+Serper search tools: failed requests are reported, not cached as empty results.
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+import requests
+
+from src.tools.base import search_tools
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.data = data
+        self.content = b"{}"
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def serper(tmp_path, monkeypatch):
+    monkeypatch.setitem(search_tools.SEARCH_CACHE_CONFIG, "enabled", True)
+    monkeypatch.setitem(search_tools.SEARCH_CACHE_CONFIG, "path", str(tmp_path / "serper.sqlite"))
+
+    def install(*responses):
+        monkeypatch.setattr(search_tools, "get_http_session", lambda: FakeSession(*responses))
+
+    return install
+
+
+def test_news_error_keeps_the_status_code(serper):
+    serper(FakeResponse(503))
+    assert search_tools.get_recent_news("Acme") == "Error fetching news: 503"
+
+
+def test_news_network_error(serper):
+    serper(requests.ConnectionError("connection refused"))
+    assert search_tools.get_recent_news("Acme").startswith("Error fetching news: Serper request failed: connection refused")
+
+
+def test_failed_search_is_not_cached(serper):
+    serper(FakeResponse(429))
+    assert search_tools.google_search("acme robotics") is None
+
+    serper(FakeResponse(200, {"organic": [{"link": "https://acme.example"}]}))
+    assert search_tools.google_search("acme robotics") == [{"link": "https://acme.example"}]
+    # Served from the cache now
+    serper()
+    assert search_tools.google_search("Acme  Robotics") == [{"link": "https://acme.example"}]
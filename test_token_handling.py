@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 print(sys.path) 
 from src.utils import count_tokens, truncate_content_to_fit_tokens
+from src.token_budget import fit_to_token_budget
 
 def test_token_counting():
     """Test token counting functionality"""
@@ -50,6 +51,29 @@ def test_content_truncation():
     
     print("Content truncation test completed.\n")
 
+def test_token_budget():
+    """Test single-pass token budgeting"""
+    print("Testing token budget...")
+    
+    long_text = "This is a sentence. " * 1000
+    budget = fit_to_token_budget(long_text, max_tokens=1000)
+    print(f"Original tokens: {budget.original_tokens}, kept tokens: {budget.tokens}")
+    
+    # Cut is made on token boundaries, within the budget, at a sentence end
+    kept_content = budget.content.split("\n\n[Content truncated")[0]
+    assert budget.truncated
+    assert budget.tokens <= 1000
+    assert budget.tokens == count_tokens(kept_content)
+    assert kept_content.endswith(".")
+    print("✓ Content was cut on a sentence end within the token budget")
+    
+    # Content already within budget is returned untouched
+    short_budget = fit_to_token_budget("Short text.", max_tokens=1000)
+    assert not short_budget.truncated
+    assert short_budget.content == "Short text."
+    
+    print("Token budget test completed.\n")
+
 def test_website_scraping():
     """Test website scraping with token limits"""
     print("Testing website scraping...")
@@ -80,6 +104,7 @@ if __name__ == "__main__":
     
     test_token_counting()
     test_content_truncation()
+    test_token_budget()
     test_website_scraping()
     
     print("All tests completed!") 
\ No newline at end of file
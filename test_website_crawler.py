@@ -0,0 +1,53 @@
+"""
+Website crawler: the deadline holds for pages waiting on the per-domain limit, and
+the per-domain semaphores are only kept while a crawl uses them.
+"""
+import gc
+import os
+import sys
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from src.tools.base import website_crawler
+
+ROOT = "https://example.com/"
+HOMEPAGE = '<main><p>Acme builds vision systems.</p><a href="/about">About</a><a href="/products">Products</a></main>'
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Serve the homepage and its linked pages; return the list of fetched URLs."""
+    urls = []
+
+    def fetch_page(url, timeout=30):
+        urls.append(url)
+        html = HOMEPAGE if url == ROOT else f"<main><p>Page {url}</p></main>"
+        return {"url": None, "html": html, "derived": {}}, len(html)
+
+    monkeypatch.setattr(website_crawler, "fetch_page", fetch_page)
+    yield urls
+    website_crawler.configure_website_crawler(per_domain_concurrency=2, deadline_seconds=20)
+
+
+def test_no_fetch_starts_after_waiting_past_the_deadline(fetched):
+    website_crawler.configure_website_crawler(per_domain_concurrency=1, deadline_seconds=0.2)
+    # Another crawl of the domain holds its only slot past the deadline
+    semaphore = website_crawler._domain_semaphore("example.com")
+    semaphore.acquire()
+    threading.Timer(0.4, semaphore.release).start()
+
+    with pytest.raises(Exception, match="deadline"):
+        website_crawler.crawl_website_to_markdown(ROOT)
+
+    assert fetched == []
+
+
+def test_domain_semaphores_are_released_with_the_crawl(fetched):
+    markdown = website_crawler.crawl_website_to_markdown(ROOT)
+    gc.collect()
+
+    assert "# About (https://example.com/about)" in markdown
+    assert sorted(fetched) == [ROOT, ROOT + "about", ROOT + "products"]
+    assert "example.com" not in website_crawler._domain_semaphores